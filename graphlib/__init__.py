@@ -1,20 +1,106 @@
-from graphlib.algorithms import floyd_warshall, dijkstra, dijkstra_all_pairs, reconstruct_path, construct_floyd_path, \
-    random_routing, flooding_routing, historical_routing
-from graphlib.io import save_graph, load_graph
-from graphlib.ui import on_left_click, on_right_click, show_vertex_menu, show_canvas_menu, animate_packet
+from graphlib.algorithms import HAS_NUMPY, floyd_warshall, floyd_warshall_numpy, dijkstra, build_adjacency, \
+    dijkstra_all_pairs, reconstruct_path, construct_floyd_path, random_routing, flooding_routing, \
+    historical_routing, \
+    shortest_path, reverse_adjacency, euclidean_scale, ShortestPathCache, path_cache, cached_dijkstra, \
+    cached_shortest_path, \
+    NegativeCycleError, bellman_ford, johnson_all_pairs, check_negative_cycle, has_negative_weights, \
+    graph_fingerprint, ContractionHierarchy, contraction_hierarchy, hierarchy_file, fresh_hierarchy, first_hops, \
+    multi_source_dijkstra
+from graphlib.animation import PacketAnimator
+from graphlib.blocked import blocked_floyd_warshall, open_blocked_result
+from graphlib.incremental import IncrementalAPSP
+from graphlib.jobs import BackgroundJob, JobCancelled
+from graphlib.io import save_graph, load_graph, read_graph, write_graph, export_packet_log
+from graphlib.model import GraphModel
+from graphlib.packet_log import PacketLog
+from graphlib.paths import AllPairsResult, all_pairs
+from graphlib.reachability import ReachabilityIndex
+from graphlib.routing import Flooder, FloodResult, RandomWalker, RandomWalkResult, BackwardLearningRouter, \
+    learning_curve
+from graphlib.simulation import Simulator, SimulationStats, RoutingStrategy, RandomStrategy, FloodingStrategy, \
+    ShortestPathStrategy, BackwardLearningStrategy, STRATEGIES, poisson_traffic, simulate, compare_transport, \
+    compare_congestion
+from graphlib.transport import Transport, Flow, UdpFlow, TcpFlow
+from graphlib.protocols import ConvergenceReport, RoutingProtocol, DistanceVector, LinkState, PROTOCOLS
+from graphlib.ui import on_left_click, on_right_click, show_vertex_menu, show_canvas_menu, animate_packet, \
+    display_packet_path, show_routing_tables, show_packet_log
 from graphlib.utils import get_vertex_at, add_vertex, delete_vertex, update_graph_matrix, update_matrix_display, \
-    add_edge, delete_edge, change_edge_weight, change_edge_direction
+    add_edge, delete_edge, change_edge_weight, change_edge_direction, change_edge_capacity
+from graphlib.virtual_table import TableModel, VirtualTable
 
 __all__ = [
     # Алгоритмы
+    "HAS_NUMPY",
     "floyd_warshall",
+    "floyd_warshall_numpy",
     "dijkstra",
+    "build_adjacency",
     "dijkstra_all_pairs",
+    "multi_source_dijkstra",
+    "first_hops",
     "reconstruct_path",
     "construct_floyd_path",
+    "shortest_path",
+    "reverse_adjacency",
+    "euclidean_scale",
+    "ShortestPathCache",
+    "path_cache",
+    "cached_dijkstra",
+    "cached_shortest_path",
+    "NegativeCycleError",
+    "bellman_ford",
+    "johnson_all_pairs",
+    "check_negative_cycle",
+    "has_negative_weights",
+    "graph_fingerprint",
+    "ContractionHierarchy",
+    "contraction_hierarchy",
+    "hierarchy_file",
     "random_routing",
     "flooding_routing",
     "historical_routing",
+    "fresh_hierarchy",
+    "Flooder",
+    "FloodResult",
+    "RandomWalker",
+    "RandomWalkResult",
+    "BackwardLearningRouter",
+    "learning_curve",
+
+    # Результаты поиска путей между всеми парами
+    "AllPairsResult",
+    "all_pairs",
+    "blocked_floyd_warshall",
+    "open_blocked_result",
+
+    # Динамические кратчайшие пути
+    "IncrementalAPSP",
+
+    # Моделирование передачи пакетов
+    "Simulator",
+    "SimulationStats",
+    "RoutingStrategy",
+    "RandomStrategy",
+    "FloodingStrategy",
+    "ShortestPathStrategy",
+    "BackwardLearningStrategy",
+    "STRATEGIES",
+    "poisson_traffic",
+    "simulate",
+    "compare_transport",
+    "compare_congestion",
+    "Transport",
+    "Flow",
+    "UdpFlow",
+    "TcpFlow",
+    "PacketLog",
+
+    # Протоколы маршрутизации
+    "ConvergenceReport",
+    "RoutingProtocol",
+    "DistanceVector",
+    "LinkState",
+    "PROTOCOLS",
 
     # Утилиты
     "get_vertex_at",
@@ -26,15 +112,33 @@ __all__ = [
     "delete_edge",
     "change_edge_weight",
     "change_edge_direction",
+    "change_edge_capacity",
+
+    # Модель графа
+    "GraphModel",
+    "ReachabilityIndex",
 
     # Сохранение и загрузка
     "save_graph",
     "load_graph",
+    "read_graph",
+    "write_graph",
+    "export_packet_log",
+
+    # Фоновые расчёты
+    "BackgroundJob",
+    "JobCancelled",
 
     # Интерфейс
     "on_left_click",
     "on_right_click",
     "show_vertex_menu",
     "show_canvas_menu",
-    "animate_packet"
+    "animate_packet",
+    "PacketAnimator",
+    "display_packet_path",
+    "show_routing_tables",
+    "show_packet_log",
+    "TableModel",
+    "VirtualTable",
 ]
@@ -1,16 +1,51 @@
-import random
+import hashlib
+import heapq
+import json
+import math
+import os
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from tkinter import messagebox
 
+from .reachability import ReachabilityIndex
+from .routing import BackwardLearningRouter, Flooder, RandomWalker
 from .ui import display_packet_path
 
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него доступны только списочные реализации
+    np = None
 
-def floyd_warshall(graph):
+HAS_NUMPY = np is not None
+
+FLOYD_DTYPES = ("float64", "float32", "int32")
+
+# Начиная с этого числа вершин «Запустить Дейкстру» использует пул процессов
+PARALLEL_MIN_VERTICES = 300
+
+POINT_TO_POINT_METHODS = ("dijkstra", "bidirectional", "astar", "ch")
+
+# Состояние рабочего процесса параллельного алгоритма Дейкстры
+_worker_state = {}
+
+
+class NegativeCycleError(ValueError):
+    """
+    Граф содержит цикл отрицательного веса, поэтому кратчайшие пути не определены.
+    """
+
+
+def floyd_warshall(graph, progress=None):
     """
     Реализует алгоритм Флойда-Уоршелла для нахождения кратчайших путей
     между всеми парами вершин в графе.
 
     Args:
         graph: Матрица смежности графа, где graph[i][j] - вес ребра от вершины i к j.
+        progress: Функция progress(done, total), вызываемая после каждой итерации по k.
+            Исключение из неё прерывает расчёт (так фоновый расчёт отменяется).
 
     Returns:
         dist: Матрица кратчайших расстояний между всеми парами вершин.
@@ -35,79 +70,1340 @@ def floyd_warshall(graph):
                 if dist[i][k] + dist[k][j] < dist[i][j]:
                     dist[i][j] = dist[i][k] + dist[k][j]
                     next_vertex[i][j] = next_vertex[i][k]
+        if progress is not None:
+            progress(k + 1, n)
+
+    return dist, next_vertex
+
+
+def floyd_warshall_numpy(graph, dtype=None, progress=None):
+    """
+    Векторизованная реализация алгоритма Флойда-Уоршелла на NumPy.
+
+    Каждая итерация по k выполняется одной широковещательной операцией над всей матрицей,
+    а next_vertex обновляется по маске улучшенных ячеек. Результаты совпадают с floyd_warshall.
+
+    Args:
+        graph: Матрица смежности графа, где graph[i][j] - вес ребра от вершины i к j.
+        dtype: Тип хранения расстояний: "float64", "float32" или "int32".
+            Если None, выбирается "int32" для целочисленных весов и "float64" в остальных случаях.
+        progress: Функция progress(done, total), вызываемая после каждой итерации по k (см. floyd_warshall).
+
+    Returns:
+        dist: Матрица кратчайших расстояний (numpy.ndarray, недостижимые пары - inf).
+        next_vertex: Матрица для восстановления путей (numpy.ndarray, отсутствие пути - -1).
+
+    Raises:
+        ImportError: Если NumPy не установлен.
+        ValueError: Если указан неподдерживаемый dtype.
+    """
+    if np is None:
+        raise ImportError("Для floyd_warshall_numpy требуется NumPy")
+
+    weights = np.asarray(graph, dtype=np.float64).reshape(len(graph), len(graph))
+    n = weights.shape[0]
+    edges = weights != 0
+
+    if dtype is None:
+        max_path = np.abs(weights).sum() if n else 0
+        is_integer = bool(np.all(weights == np.round(weights)))
+        dtype = "int32" if is_integer and max_path < np.iinfo(np.int32).max // 2 else "float64"
+
+    if dtype not in FLOYD_DTYPES:
+        raise ValueError(f"Неподдерживаемый тип данных: {dtype}")
+
+    is_int = dtype == "int32"
+    inf = np.iinfo(np.int32).max // 2 if is_int else np.inf
+
+    dist = np.full((n, n), inf, dtype=dtype)
+    dist[edges] = weights[edges]
+    next_vertex = np.where(edges, np.arange(n, dtype=np.int32), np.int32(-1)).astype(np.int32)
+    np.fill_diagonal(dist, 0)
+    np.fill_diagonal(next_vertex, np.arange(n, dtype=np.int32))
+
+    candidate = np.empty_like(dist)
+    improved = np.empty((n, n), dtype=bool)
+
+    for k in range(n):
+        column = dist[:, k:k + 1].copy()
+        row = dist[k:k + 1, :].copy()
+        np.add(column, row, out=candidate)
+        np.less(candidate, dist, out=improved)
+
+        if is_int:
+            # Сумма с «бесконечностью» не должна становиться конечным расстоянием
+            improved &= column < inf
+            improved &= row < inf
+
+        np.copyto(dist, candidate, where=improved)
+        np.copyto(next_vertex, next_vertex[:, k:k + 1].copy(), where=improved)
+        if progress is not None:
+            progress(k + 1, n)
+
+    if is_int:
+        result = dist.astype(np.float64)
+        result[dist >= inf] = np.inf
+        dist = result
 
     return dist, next_vertex
 
 
-def dijkstra(graph, start, end=None, return_parent=False):
+def build_adjacency(graph, allow_negative=False):
+    """
+    Строит списки смежности по матрице смежности.
+
+    Args:
+        graph: Матрица смежности графа, где graph[i][j] - вес ребра от вершины i к j.
+        allow_negative: Если True, в списки попадают все ненулевые рёбра,
+            иначе только рёбра с положительным весом (как в алгоритме Дейкстры).
+
+    Returns:
+        adjacency: Список, где adjacency[u] - список пар (v, вес ребра u -> v).
+    """
+    adjacency = []
+
+    for row in graph:
+        if allow_negative:
+            adjacency.append([(v, weight) for v, weight in enumerate(row) if weight != 0])
+        else:
+            adjacency.append([(v, weight) for v, weight in enumerate(row) if weight > 0])
+
+    return adjacency
+
+
+def dijkstra(graph, start, end=None, return_parent=False, stop_at_end=False, adjacency=None, reachability=None):
     """
     Реализует алгоритм Дейкстры для нахождения кратчайшего пути от одной вершины к другим.
 
+    Использует двоичную кучу и списки смежности, поэтому работает за O((V + E) log V).
+
     Args:
-        graph: Матрица смежности графа.
+        graph: Матрица смежности графа (может быть None, если передан adjacency).
         start: Индекс начальной вершины.
         end: Индекс конечной вершины (опционально).
         return_parent: Если True, возвращает массив родительских вершин.
+        stop_at_end: Если True и end указан, поиск прекращается, как только end извлечена из кучи.
+        adjacency: Заранее построенные списки смежности (см. build_adjacency).
+        reachability: Индекс достижимости (ReachabilityIndex). Если end недостижим, поиск не выполняется.
 
     Returns:
         Если end указан: Кортеж (расстояние до end, путь до end).
         Если end не указан: Кортеж (массив расстояний, массив родительских вершин или None).
     """
-    n = len(graph)
+    if end is not None and reachability is not None and not reachability.can_reach(start, end):
+        return float('inf'), []
+
+    if adjacency is None:
+        adjacency = build_adjacency(graph)
+
+    target = end if stop_at_end else None
+    dist, parent = _dijkstra_heap(adjacency, start, target)
+
+    if end is not None:
+        return dist[end], (reconstruct_path(parent, start, end) if return_parent else [])
+
+    return dist, (parent if return_parent else None)
+
+
+def _dijkstra_heap(adjacency, start, target=None, limit=None):
+    """
+    Ядро алгоритма Дейкстры на двоичной куче.
+
+    Args:
+        adjacency: Списки смежности с неотрицательными весами.
+        start: Индекс начальной вершины.
+        target: Вершина, после извлечения которой поиск прекращается (опционально).
+        limit: Число вершин, достижимых из start (см. search_limits): поиск прекращается,
+            как только все они извлечены из кучи.
+
+    Returns:
+        dist: Массив расстояний.
+        parent: Массив родительских вершин.
+    """
+    n = len(adjacency)
     dist = [float('inf')] * n
     dist[start] = 0
+    parent = [-1] * n
     visited = [False] * n
-    parent = [-1] * n if return_parent else None
+    heap = [(0, start)]
+    settled = 0
 
-    for _ in range(n):
-        min_dist = float('inf')
-        u = -1
-        for i in range(n):
-            if not visited[i] and dist[i] < min_dist:
-                min_dist = dist[i]
-                u = i
+    while heap:
+        d, u = heapq.heappop(heap)
+        if visited[u]:
+            continue
+        visited[u] = True
+        settled += 1
 
-        if u == -1:
+        if u == target or settled == limit:
             break
 
-        visited[u] = True
+        for v, weight in adjacency[u]:
+            if not visited[v]:
+                new_dist = d + weight
+                if new_dist < dist[v]:
+                    dist[v] = new_dist
+                    parent[v] = u
+                    heapq.heappush(heap, (new_dist, v))
+
+    return dist, parent
 
-        for v in range(n):
-            if graph[u][v] > 0 and not visited[v]:
-                if dist[u] + graph[u][v] < dist[v]:
-                    dist[v] = dist[u] + graph[u][v]
-                    if return_parent:
-                        parent[v] = u
 
-    if end is not None:
-        return dist[end], (reconstruct_path(parent, start, end) if return_parent else [])
+def search_limits(adjacency, sources=None, reachability=None):
+    """
+    Число вершин, достижимых из каждого источника, - граница поиска от него (см. _dijkstra_heap).
 
-    return dist, parent
+    Args:
+        adjacency: Списки смежности, по которым будет идти поиск.
+        sources: Источники (по умолчанию - все вершины).
+        reachability: Индекс достижимости, построенный по тем же спискам смежности
+            (по умолчанию строится здесь за O(V + E)).
+
+    Returns:
+        Список границ в порядке sources.
+    """
+    if reachability is None:
+        reachability = ReachabilityIndex(adjacency)
+    counts = reachability.reachable_counts()
+    return counts if sources is None else [counts[source] for source in sources]
+
+
+def reverse_adjacency(adjacency):
+    """
+    Строит списки смежности графа с обращёнными рёбрами.
+
+    Args:
+        adjacency: Списки смежности графа.
+
+    Returns:
+        reverse: Список, где reverse[v] - список пар (u, вес ребра u -> v).
+    """
+    reverse = [[] for _ in adjacency]
+
+    for u, edges in enumerate(adjacency):
+        for v, weight in edges:
+            reverse[v].append((u, weight))
+
+    return reverse
+
+
+def euclidean_scale(adjacency, coords):
+    """
+    Вычисляет коэффициент эвристики A*, при котором евклидово расстояние остаётся допустимой оценкой.
+
+    Коэффициент равен минимальному отношению веса ребра к его геометрической длине, поэтому
+    scale * |uv| никогда не превышает вес ребра и эвристика не переоценивает длину пути.
+
+    Args:
+        adjacency: Списки смежности графа с положительными весами.
+        coords: Координаты вершин (x, y).
+
+    Returns:
+        Коэффициент эвристики (0, если эвристику применить нельзя).
+    """
+    scale = float('inf')
+
+    for u, edges in enumerate(adjacency):
+        ux, uy = coords[u]
+        for v, weight in edges:
+            length = math.hypot(coords[v][0] - ux, coords[v][1] - uy)
+            if length > 0:
+                scale = min(scale, weight / length)
+
+    return scale if scale != float('inf') else 0
+
+
+def shortest_path(graph, start, end, method="bidirectional", coords=None, adjacency=None, reverse=None,
+                  scale=None, reachability=None, hierarchy=None):
+    """
+    Находит кратчайший путь между двумя вершинами, не обходя весь граф.
+
+    Методы:
+        "dijkstra" - алгоритм Дейкстры с остановкой на конечной вершине;
+        "bidirectional" - двунаправленный алгоритм Дейкстры;
+        "astar" - A* с евклидовой эвристикой по координатам вершин (без координат - как "dijkstra");
+        "ch" - запрос по заранее построенной иерархии сжатия (см. ContractionHierarchy).
+
+    Args:
+        graph: Матрица смежности графа (может быть None, если передан adjacency).
+        start: Индекс начальной вершины.
+        end: Индекс конечной вершины.
+        method: Метод поиска.
+        coords: Координаты вершин (x, y) для A*.
+        adjacency: Заранее построенные списки смежности (см. build_adjacency).
+        reverse: Заранее построенные обращённые списки смежности для двунаправленного поиска.
+        scale: Коэффициент эвристики A* (по умолчанию вычисляется через euclidean_scale).
+        reachability: Индекс достижимости (ReachabilityIndex). Если end недостижим, поиск не выполняется.
+        hierarchy: Иерархия сжатия этого графа для метода "ch".
+
+    Returns:
+        Кортеж (расстояние, путь, количество обработанных вершин).
+        Если путь не существует, расстояние равно inf, а путь пуст.
+
+    Raises:
+        ValueError: Если указан неизвестный метод или для метода "ch" не передана иерархия.
+    """
+    if method not in POINT_TO_POINT_METHODS:
+        raise ValueError(f"Неизвестный метод поиска: {method}")
+
+    if method == "ch":
+        if hierarchy is None:
+            raise ValueError("Для метода ch нужна иерархия сжатия графа")
+        return hierarchy.query(start, end, reachability)
+
+    if reachability is not None and not reachability.can_reach(start, end):
+        return float('inf'), [], 0
+
+    if adjacency is None:
+        adjacency = build_adjacency(graph)
+
+    if method == "bidirectional":
+        if reverse is None:
+            reverse = reverse_adjacency(adjacency)
+        return _bidirectional_dijkstra(adjacency, reverse, start, end)
+
+    heuristic = None
+    if method == "astar" and coords is not None:
+        if scale is None:
+            scale = euclidean_scale(adjacency, coords)
+        if scale > 0:
+            end_x, end_y = coords[end]
+
+            def heuristic(v):
+                return scale * math.hypot(coords[v][0] - end_x, coords[v][1] - end_y)
 
+    return _astar(adjacency, start, end, heuristic)
 
-def dijkstra_all_pairs(graph):
+
+def _astar(adjacency, start, end, heuristic=None):
+    """
+    Поиск A* (без эвристики - алгоритм Дейкстры с остановкой на конечной вершине).
+
+    Returns:
+        Кортеж (расстояние, путь, количество обработанных вершин).
+    """
+    dist = {start: 0}
+    parent = {start: -1}
+    settled = set()
+    heap = [(heuristic(start) if heuristic else 0, start)]
+
+    while heap:
+        _, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+
+        if u == end:
+            return dist[end], reconstruct_path(parent, start, end), len(settled)
+
+        d = dist[u]
+        for v, weight in adjacency[u]:
+            new_dist = d + weight
+            if v not in settled and new_dist < dist.get(v, float('inf')):
+                dist[v] = new_dist
+                parent[v] = u
+                heapq.heappush(heap, (new_dist + heuristic(v) if heuristic else new_dist, v))
+
+    return float('inf'), [], len(settled)
+
+
+def _bidirectional_dijkstra(adjacency, reverse, start, end):
+    """
+    Двунаправленный алгоритм Дейкстры: поиск ведётся одновременно от start по рёбрам
+    и от end по обращённым рёбрам, пока сумма минимумов двух очередей не превысит лучший путь.
+
+    Returns:
+        Кортеж (расстояние, путь, количество обработанных вершин).
+    """
+    if start == end:
+        return 0, [start], 1
+
+    dist = ({start: 0}, {end: 0})
+    parent = ({start: -1}, {end: -1})
+    settled = (set(), set())
+    heaps = ([(0, start)], [(0, end)])
+    graphs = (adjacency, reverse)
+    best = float('inf')
+    meet = -1
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        other = 1 - side
+        d, u = heapq.heappop(heaps[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+
+        for v, weight in graphs[side][u]:
+            new_dist = d + weight
+            if new_dist < dist[side].get(v, float('inf')):
+                dist[side][v] = new_dist
+                parent[side][v] = u
+                heapq.heappush(heaps[side], (new_dist, v))
+
+                if v in dist[other] and new_dist + dist[other][v] < best:
+                    best = new_dist + dist[other][v]
+                    meet = v
+
+    settled_count = len(settled[0]) + len(settled[1])
+
+    if meet == -1:
+        return float('inf'), [], settled_count
+
+    path = reconstruct_path(parent[0], start, meet)
+    current = parent[1][meet]
+    while current != -1:
+        path.append(current)
+        current = parent[1][current]
+
+    return best, path, settled_count
+
+
+class ShortestPathCache:
+    """
+    LRU-кэш результатов поиска кратчайших путей.
+
+    Деревья путей от одного источника хранятся под ключом (версия графа, источник, алгоритм)
+    в виде компактных массивов расстояний и родительских вершин, пути между парой вершин -
+    под ключом (версия графа, источник, метод, назначение). Любое изменение модели графа меняет
+    её версию, поэтому устаревшие записи никогда не возвращаются и со временем вытесняются.
+    Объём кэша ограничен max_bytes.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def entry_size(*entry):
+        """
+        Оценивает объём записи в байтах (массивы записи плюс постоянные накладные расходы).
+        """
+        return sum(item.itemsize * len(item) for item in entry if isinstance(item, array)) + 200
+
+    def _lookup(self, key):
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _store(self, key, entry):
+        if key in self.entries:
+            self.size -= self.entry_size(*self.entries.pop(key))
+
+        entry_size = self.entry_size(*entry)
+        if entry_size > self.max_bytes:
+            return entry
+
+        self.entries[key] = entry
+        self.size += entry_size
+
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= self.entry_size(*evicted)
+
+        return entry
+
+    def get(self, version, source, algorithm="dijkstra"):
+        """
+        Возвращает (dist, parent) из кэша или None. Учитывает попадания и промахи.
+        """
+        return self._lookup((version, source, algorithm))
+
+    def put(self, version, source, algorithm, dist, parent):
+        """
+        Сохраняет результат и вытесняет давно не использованные записи при превышении объёма.
+
+        Args:
+            version: Версия графа.
+            source: Индекс начальной вершины.
+            algorithm: Название алгоритма.
+            dist: Массив расстояний.
+            parent: Массив родительских вершин.
+
+        Returns:
+            Кортеж (dist, parent) в компактном виде (array).
+        """
+        return self._store((version, source, algorithm), (array("d", dist), array("i", parent)))
+
+    def get_or_compute(self, version, source, algorithm, compute):
+        """
+        Возвращает результат из кэша или вычисляет его функцией compute() -> (dist, parent).
+        """
+        entry = self.get(version, source, algorithm)
+        if entry is None:
+            entry = self.put(version, source, algorithm, *compute())
+        return entry
+
+    def path(self, version, source, target, method, compute):
+        """
+        Возвращает путь между парой вершин из кэша или вычисляет его функцией
+        compute() -> (расстояние, путь, количество обработанных вершин).
+
+        Returns:
+            Кортеж (расстояние, путь, количество обработанных вершин) в том виде, в каком его вернул compute.
+        """
+        key = (version, source, method, target)
+        entry = self._lookup(key)
+        if entry is None:
+            distance, path, settled = compute()
+            entry = self._store(key, (distance, array("i", path), settled))
+
+        distance, path, settled = entry
+        return distance, list(path), settled
+
+    def clear(self):
+        """
+        Очищает кэш и счётчики.
+        """
+        self.entries.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Возвращает статистику кэша: попадания, промахи, число записей и занятый объём.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "bytes": self.size}
+
+
+# Общий кэш кратчайших путей
+path_cache = ShortestPathCache()
+
+
+def cached_dijkstra(model, start, cache=None):
+    """
+    Алгоритм Дейкстры от одной вершины с кэшированием по версии модели графа.
+
+    Args:
+        model: Модель графа (GraphModel).
+        start: Индекс начальной вершины.
+        cache: Кэш (по умолчанию - общий path_cache).
+
+    Returns:
+        dist: Массив расстояний (array("d")).
+        parent: Массив родительских вершин (array("i")).
+    """
+    cache = path_cache if cache is None else cache
+    return cache.get_or_compute(
+        model.version, start, "dijkstra",
+        lambda: _dijkstra_heap(model.adjacency(), start)
+    )
+
+
+def cached_shortest_path(model, start, end, method="astar", cache=None):
+    """
+    Путь между двумя вершинами (см. shortest_path) с кэшированием по версии модели графа:
+    повторный запрос той же пары не выполняет поиск, пока граф не изменится. Для метода "ch"
+    используется иерархия, построенная для текущей версии графа (см. contraction_hierarchy
+    и fresh_hierarchy).
+
+    Args:
+        model: Модель графа (GraphModel).
+        start: Индекс начальной вершины.
+        end: Индекс конечной вершины.
+        method: Метод поиска (POINT_TO_POINT_METHODS).
+        cache: Кэш (по умолчанию - общий path_cache).
+
+    Returns:
+        Кортеж (расстояние, путь, количество обработанных вершин); для результата из кэша
+        количество обработанных вершин - то, что было при исходном поиске.
+
+    Raises:
+        ValueError: Если указан метод "ch", а иерархия для текущей версии графа не построена.
+    """
+    cache = path_cache if cache is None else cache
+    hierarchy = None
+    if method == "ch":
+        hierarchy = fresh_hierarchy(model)
+        if hierarchy is None:
+            raise ValueError("Иерархия сжатия для текущей версии графа не построена")
+
+    def compute():
+        return shortest_path(
+            None, start, end, method, coords=model.coords, adjacency=model.adjacency(),
+            reverse=model.adjacency(reverse=True) if method == "bidirectional" else None,
+            reachability=model.reachability(), hierarchy=hierarchy
+        )
+
+    return cache.path(model.version, start, end, method, compute)
+
+
+def graph_fingerprint(adjacency):
+    """
+    Контрольная сумма рёбер графа. По ней проверяется, что сохранённые на диск результаты
+    предварительной обработки относятся к тому же графу.
+    """
+    digest = hashlib.sha1()
+    for edges in adjacency:
+        digest.update(repr(edges).encode())
+        digest.update(b";")
+    return digest.hexdigest()
+
+
+class ContractionHierarchy:
+    """
+    Иерархия сжатия (contraction hierarchy) для быстрых запросов кратчайшего пути между двумя вершинами.
+
+    При построении вершины по очереди «сжимаются» в порядке важности (разница рёбер плюс число уже
+    сжатых соседей). При сжатии вершины v для каждой пары соседей u -> v -> x добавляется ребро-сокращение
+    u -> x, если без v между ними нет пути не длиннее (поиск «свидетеля»). Запрос - двунаправленный
+    поиск Дейкстры только вверх по рангу вершин, поэтому он затрагивает малую часть графа, а результат точен.
+    Подходит для графов с положительными весами, которые редко меняются.
+    """
+
+    # Ограничение числа вершин, обрабатываемых одним поиском свидетеля при сжатии и при оценке приоритета.
+    # Оценка лишь упорядочивает вершины, поэтому для неё достаточно более грубого поиска
+    WITNESS_SETTLE_LIMIT = 500
+    PRIORITY_SETTLE_LIMIT = 50
+
+    def __init__(self, n, rank, up, down, fingerprint=None):
+        """
+        Args:
+            n: Количество вершин.
+            rank: rank[v] - порядковый номер сжатия вершины v.
+            up: up[u] - список (x, вес, средняя вершина) рёбер u -> x с rank[x] > rank[u].
+            down: down[x] - список (u, вес, средняя вершина) рёбер u -> x с rank[u] > rank[x].
+            fingerprint: Контрольная сумма исходного графа (см. graph_fingerprint).
+        Средняя вершина равна -1 для исходных рёбер.
+        """
+        self.n = n
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.fingerprint = fingerprint
+        self._middle = None
+
+    @property
+    def shortcut_count(self):
+        """
+        Количество добавленных рёбер-сокращений.
+        """
+        return sum(1 for edges in (self.up, self.down) for row in edges for _, _, middle in row if middle != -1)
+
+    @classmethod
+    def build(cls, graph=None, adjacency=None):
+        """
+        Строит иерархию сжатия.
+
+        Args:
+            graph: Матрица смежности графа (может быть None, если передан adjacency).
+            adjacency: Списки смежности с положительными весами (см. build_adjacency).
+
+        Returns:
+            ContractionHierarchy.
+        """
+        if adjacency is None:
+            adjacency = build_adjacency(graph)
+
+        n = len(adjacency)
+        out_edges = [{} for _ in range(n)]
+        in_edges = [{} for _ in range(n)]
+        # edges[(u, x)] = (вес, средняя вершина) - все рёбра итоговой иерархии
+        edges = {}
+
+        for u, row in enumerate(adjacency):
+            for v, weight in row:
+                if u != v and weight < out_edges[u].get(v, float('inf')):
+                    out_edges[u][v] = weight
+                    in_edges[v][u] = weight
+                    edges[(u, v)] = (weight, -1)
+
+        contracted = [False] * n
+        deleted_neighbours = [0] * n
+        rank = [0] * n
+
+        def shortcuts(v, settle_limit):
+            # Рёбра-сокращения, необходимые при сжатии v
+            result = []
+            if not out_edges[v]:
+                return result
+            max_out = max(out_edges[v].values())
+
+            for u, w_in in in_edges[v].items():
+                targets = {x: w_in + w_out for x, w_out in out_edges[v].items() if x != u}
+                if not targets:
+                    continue
+                witness = cls._witness_search(out_edges, contracted, u, v, w_in + max_out, targets, settle_limit)
+                for x, via in targets.items():
+                    if witness.get(x, float('inf')) > via:
+                        result.append((u, x, via))
+            return result
+
+        def priority(v):
+            edge_difference = len(shortcuts(v, cls.PRIORITY_SETTLE_LIMIT)) - len(in_edges[v]) - len(out_edges[v])
+            return edge_difference + deleted_neighbours[v]
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+
+            # Ленивое обновление приоритета: если он вырос, вершина возвращается в очередь
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            for u, x, weight in shortcuts(v, cls.WITNESS_SETTLE_LIMIT):
+                if weight < out_edges[u].get(x, float('inf')):
+                    out_edges[u][x] = weight
+                    in_edges[x][u] = weight
+                    edges[(u, x)] = (weight, v)
+
+            contracted[v] = True
+            rank[v] = order
+            order += 1
+
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                deleted_neighbours[u] += 1
+            for x in out_edges[v]:
+                del in_edges[x][v]
+                deleted_neighbours[x] += 1
+            in_edges[v] = {}
+            out_edges[v] = {}
+
+        up = [[] for _ in range(n)]
+        down = [[] for _ in range(n)]
+        for (u, x), (weight, middle) in edges.items():
+            if rank[x] > rank[u]:
+                up[u].append((x, weight, middle))
+            else:
+                down[x].append((u, weight, middle))
+
+        return cls(n, rank, up, down, graph_fingerprint(adjacency))
+
+    @staticmethod
+    def _witness_search(out_edges, contracted, source, excluded, limit, targets, settle_limit):
+        """
+        Ограниченный поиск Дейкстры от source по несжатым вершинам без вершины excluded.
+
+        Returns:
+            Словарь найденных расстояний (для вершин, не превышающих limit).
+        """
+        dist = {source: 0}
+        heap = [(0, source)]
+        remaining = set(targets)
+        settled = 0
+
+        while heap and remaining and settled < settle_limit:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if d > limit:
+                break
+            settled += 1
+            remaining.discard(u)
+
+            for v, weight in out_edges[u].items():
+                if v == excluded or contracted[v]:
+                    continue
+                new_dist = d + weight
+                if new_dist <= limit and new_dist < dist.get(v, float('inf')):
+                    dist[v] = new_dist
+                    heapq.heappush(heap, (new_dist, v))
+
+        return dist
+
+    def query(self, start, end, reachability=None):
+        """
+        Находит кратчайший путь двунаправленным поиском вверх по иерархии.
+
+        Args:
+            start: Индекс начальной вершины.
+            end: Индекс конечной вершины.
+            reachability: Индекс достижимости (ReachabilityIndex). Если end недостижим, поиск не выполняется.
+
+        Returns:
+            Кортеж (расстояние, путь, количество обработанных вершин), как у shortest_path.
+            Если путь не существует, расстояние равно inf, а путь пуст.
+        """
+        if start == end:
+            return 0, [start], 1
+        if reachability is not None and not reachability.can_reach(start, end):
+            return float('inf'), [], 0
+
+        dist = ({start: 0}, {end: 0})
+        parent = ({start: -1}, {end: -1})
+        settled = (set(), set())
+        heaps = ([(0, start)], [(0, end)])
+        graphs = (self.up, self.down)
+        best = float('inf')
+        meet = -1
+
+        # В отличие от обычного двунаправленного поиска, стороны не останавливаются при встрече:
+        # каждая обрабатывает свой конус «вверх», пока её минимум не превысит лучший путь
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            d, u = heapq.heappop(heaps[side])
+            if d >= best:
+                heaps[side].clear()
+                continue
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best = d + other
+                meet = u
+
+            for v, weight, _ in graphs[side][u]:
+                new_dist = d + weight
+                if new_dist < dist[side].get(v, float('inf')):
+                    dist[side][v] = new_dist
+                    parent[side][v] = u
+                    heapq.heappush(heaps[side], (new_dist, v))
+
+        settled_count = len(settled[0]) + len(settled[1])
+
+        if meet == -1:
+            return float('inf'), [], settled_count
+
+        # Путь в иерархии: start -> ... -> meet -> ... -> end
+        hops = reconstruct_path(parent[0], start, meet)
+        current = parent[1][meet]
+        while current != -1:
+            hops.append(current)
+            current = parent[1][current]
+
+        return best, self._unpack(hops), settled_count
+
+    def _unpack(self, hops):
+        """
+        Раскрывает рёбра-сокращения в последовательность вершин исходного графа.
+        """
+        if self._middle is None:
+            self._middle = {}
+            for u, row in enumerate(self.up):
+                for x, _, middle in row:
+                    self._middle[(u, x)] = middle
+            for x, row in enumerate(self.down):
+                for u, _, middle in row:
+                    self._middle[(u, x)] = middle
+
+        path = [hops[0]]
+        stack = [(u, x) for u, x in zip(reversed(hops[:-1]), reversed(hops[1:]))]
+
+        while stack:
+            u, x = stack.pop()
+            middle = self._middle[(u, x)]
+            if middle == -1:
+                path.append(x)
+            else:
+                stack.append((middle, x))
+                stack.append((u, middle))
+
+        return path
+
+    def to_dict(self):
+        """
+        Возвращает представление иерархии для сохранения в JSON.
+        """
+        return {
+            "fingerprint": self.fingerprint,
+            "rank": self.rank,
+            "up": self.up,
+            "down": self.down,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Восстанавливает иерархию из данных to_dict.
+
+        Raises:
+            KeyError: Если формат данных некорректен.
+        """
+        up = [[tuple(edge) for edge in row] for row in data["up"]]
+        down = [[tuple(edge) for edge in row] for row in data["down"]]
+        return cls(len(data["rank"]), data["rank"], up, down, data["fingerprint"])
+
+    def save(self, file_path):
+        """
+        Сохраняет иерархию в файл JSON.
+        """
+        with open(file_path, "w") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Загружает иерархию из файла JSON.
+
+        Raises:
+            FileNotFoundError: Если файл не найден.
+            KeyError: Если формат данных некорректен.
+        """
+        with open(file_path, "r") as file:
+            return cls.from_dict(json.load(file))
+
+
+def hierarchy_file(graph_file):
+    """
+    Возвращает путь к файлу иерархии сжатия рядом с файлом графа: saves/graph.json -> saves/graph.ch.json.
+    """
+    base, _ = os.path.splitext(graph_file)
+    return base + ".ch.json"
+
+
+# Иерархии сжатия по версиям моделей графа (несколько последних)
+_hierarchies = OrderedDict()
+HIERARCHY_CACHE_SIZE = 4
+
+
+def contraction_hierarchy(model, graph_file=None):
+    """
+    Возвращает иерархию сжатия для текущей версии модели графа, строя её не более одного раза на версию.
+
+    Если указан файл графа, иерархия сначала ищется рядом с ним (см. hierarchy_file) и используется,
+    если её контрольная сумма совпадает с графом; иначе она строится заново и сохраняется туда же.
+
+    Args:
+        model: Модель графа (GraphModel).
+        graph_file: Путь к файлу графа (опционально).
+
+    Returns:
+        ContractionHierarchy.
+    """
+    hierarchy = _hierarchies.get(model.version)
+    if hierarchy is not None:
+        _hierarchies.move_to_end(model.version)
+        return hierarchy
+
+    adjacency = model.adjacency()
+    fingerprint = graph_fingerprint(adjacency)
+
+    if graph_file is not None and os.path.exists(hierarchy_file(graph_file)):
+        try:
+            hierarchy = ContractionHierarchy.load(hierarchy_file(graph_file))
+        except (ValueError, KeyError, TypeError):
+            hierarchy = None
+        if hierarchy is not None and hierarchy.fingerprint != fingerprint:
+            hierarchy = None
+
+    if hierarchy is None:
+        hierarchy = ContractionHierarchy.build(adjacency=adjacency)
+        if graph_file is not None:
+            hierarchy.save(hierarchy_file(graph_file))
+
+    _hierarchies[model.version] = hierarchy
+    while len(_hierarchies) > HIERARCHY_CACHE_SIZE:
+        _hierarchies.popitem(last=False)
+
+    return hierarchy
+
+
+def fresh_hierarchy(model):
+    """
+    Возвращает уже построенную иерархию сжатия для текущей версии модели графа или None (без построения).
+    """
+    return _hierarchies.get(model.version)
+
+
+def dijkstra_all_pairs(graph, parallel=False, workers=None, chunk_size=None, adjacency=None, progress=None):
     """
     Вычисляет кратчайшие пути между всеми парами вершин в графе с помощью алгоритма Дейкстры.
 
+    В параллельном режиме источники распределяются по пулу процессов, а рабочие процессы
+    записывают строки результата напрямую в общую память, поэтому результаты не сериализуются.
+    Поиск от каждого источника заканчивается, как только найдены все достижимые из него вершины
+    (по индексу достижимости, см. search_limits).
+
     Args:
-        graph: Матрица смежности графа.
+        graph: Матрица смежности графа (может быть None, если передан adjacency).
+        parallel: Если True, используется пул процессов.
+        workers: Количество рабочих процессов (по умолчанию - число ядер).
+        chunk_size: Количество источников в одном задании (по умолчанию подбирается по размеру графа).
+        adjacency: Заранее построенные списки смежности (см. build_adjacency).
+        progress: Функция progress(done, total) - число обработанных источников из всех.
+            Исключение из неё прерывает расчёт.
 
     Returns:
         dist_matrix: Матрица кратчайших расстояний между всеми парами вершин.
         path_matrix: Матрица родительских вершин для восстановления путей.
     """
-    n = len(graph)
+    if adjacency is None:
+        adjacency = build_adjacency(graph)
+
+    limits = search_limits(adjacency)
+
+    if parallel and len(adjacency) > 1:
+        return _dijkstra_all_pairs_parallel(adjacency, workers, chunk_size, progress, limits)
+
     dist_matrix = []
     path_matrix = []
 
-    for start in range(n):
-        dist, parent = dijkstra(graph, start, return_parent=True)
+    for start in range(len(adjacency)):
+        dist, parent = _dijkstra_heap(adjacency, start, limit=limits[start])
         dist_matrix.append(dist)
         path_matrix.append(parent)
+        if progress is not None:
+            progress(start + 1, len(adjacency))
 
     return dist_matrix, path_matrix
 
 
+def _dijkstra_all_pairs_parallel(adjacency, workers=None, chunk_size=None, progress=None, limits=None):
+    """
+    Параллельный алгоритм Дейкстры для всех пар вершин с матрицами результата в общей памяти.
+
+    Args:
+        adjacency: Списки смежности графа.
+        workers: Количество рабочих процессов.
+        chunk_size: Количество источников в одном задании.
+        progress: Функция progress(done, total) (см. dijkstra_rows_parallel).
+        limits: Границы поиска от источников (см. search_limits).
+
+    Returns:
+        dist_matrix: Матрица кратчайших расстояний между всеми парами вершин.
+        path_matrix: Матрица родительских вершин для восстановления путей.
+    """
+    n = len(adjacency)
+    dist, parent = dijkstra_rows_parallel(adjacency, workers=workers, chunk_size=chunk_size, progress=progress,
+                                          limits=limits)
+    dist_matrix = [dist[i * n:(i + 1) * n].tolist() for i in range(n)]
+    path_matrix = [parent[i * n:(i + 1) * n].tolist() for i in range(n)]
+    return dist_matrix, path_matrix
+
+
+def dijkstra_rows_parallel(adjacency, dist_typecode="d", parent_typecode="i", workers=None, chunk_size=None,
+                           sources=None, first_hop=False, progress=None, limits=None):
+    """
+    Вычисляет в пуле процессов плоские (построчные) массивы расстояний и родительских вершин для всех источников.
+
+    Рабочие процессы записывают строки напрямую в блоки общей памяти, откуда результат
+    копируется в массивы array одной операцией.
+
+    Args:
+        adjacency: Списки смежности графа.
+        dist_typecode: Тип элементов массива расстояний ("d" или "f").
+        parent_typecode: Тип элементов массива родительских вершин ("h" или "i").
+        workers: Количество рабочих процессов (по умолчанию - число ядер).
+        chunk_size: Количество источников в одном задании (по умолчанию подбирается по размеру графа).
+        sources: Источники (по умолчанию - все вершины); строка r результата относится к sources[r].
+        first_hop: Если True, вместо родительских вершин записываются первые вершины путей (см. first_hops).
+        progress: Функция progress(done, total), вызываемая по завершении каждого задания.
+            Исключение из неё отменяет ещё не начатые задания и прерывает расчёт.
+        limits: Границы поиска в порядке источников (см. search_limits).
+
+    Returns:
+        dist: array длины k * n, где dist[r * n + j] - расстояние от r-го источника до j.
+        parent: array длины k * n, где parent[r * n + j] - родитель j в дереве путей из r-го источника
+            (или первая вершина пути, если first_hop=True).
+    """
+    n = len(adjacency)
+    sources = range(n) if sources is None else list(sources)
+    k = len(sources)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, k // (workers * 4))
+    chunks = [range(i, min(i + chunk_size, k)) for i in range(0, k, chunk_size)]
+
+    dist = array(dist_typecode)
+    parent = array(parent_typecode)
+    dist_shm = shared_memory.SharedMemory(create=True, size=max(1, k * n * dist.itemsize))
+    parent_shm = shared_memory.SharedMemory(create=True, size=max(1, k * n * parent.itemsize))
+
+    try:
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_all_pairs_worker,
+                initargs=(adjacency, dist_shm.name, parent_shm.name, dist_typecode, parent_typecode, sources,
+                          first_hop, limits)
+        ) as executor:
+            done = 0
+            try:
+                for count in executor.map(_all_pairs_worker_chunk, chunks):
+                    done += count
+                    if progress is not None:
+                        progress(done, k)
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+        dist.frombytes(dist_shm.buf[:k * n * dist.itemsize])
+        parent.frombytes(parent_shm.buf[:k * n * parent.itemsize])
+    finally:
+        for shm in (dist_shm, parent_shm):
+            shm.close()
+            shm.unlink()
+
+    return dist, parent
+
+
+def _init_all_pairs_worker(adjacency, dist_name, parent_name, dist_typecode="d", parent_typecode="i", sources=None,
+                           first_hop=False, limits=None):
+    """
+    Инициализирует рабочий процесс: сохраняет списки смежности и подключает общую память.
+    """
+    _worker_state["adjacency"] = adjacency
+    _worker_state["dist_shm"] = shared_memory.SharedMemory(name=dist_name)
+    _worker_state["parent_shm"] = shared_memory.SharedMemory(name=parent_name)
+    _worker_state["typecodes"] = (dist_typecode, parent_typecode)
+    _worker_state["sources"] = range(len(adjacency)) if sources is None else sources
+    _worker_state["first_hop"] = first_hop
+    _worker_state["limits"] = limits
+
+
+def _all_pairs_worker_chunk(rows):
+    """
+    Вычисляет строки матриц результата для группы источников и записывает их в общую память.
+
+    Args:
+        rows: Диапазон номеров строк (индексов в списке источников).
+
+    Returns:
+        Количество обработанных источников.
+    """
+    adjacency = _worker_state["adjacency"]
+    sources = _worker_state["sources"]
+    dist_typecode, parent_typecode = _worker_state["typecodes"]
+    n = len(adjacency)
+
+    with _worker_state["dist_shm"].buf.cast(dist_typecode) as dist_view, \
+            _worker_state["parent_shm"].buf.cast(parent_typecode) as parent_view:
+        for row in rows:
+            start = sources[row]
+            limits = _worker_state["limits"]
+            dist, parent = _dijkstra_heap(adjacency, start, limit=limits[row] if limits is not None else None)
+            if _worker_state["first_hop"]:
+                parent = first_hops(parent, start)
+            dist_view[row * n:(row + 1) * n] = array(dist_typecode, dist)
+            parent_view[row * n:(row + 1) * n] = array(parent_typecode, parent)
+
+    return len(rows)
+
+
+def first_hops(parent, source):
+    """
+    Преобразует массив родительских вершин дерева путей в массив первых вершин путей.
+
+    Args:
+        parent: Массив родительских вершин из алгоритма Дейкстры от source.
+        source: Индекс начальной вершины.
+
+    Returns:
+        first_hop: first_hop[j] - вершина, следующая за source на пути в j (source для самой source, -1 - нет пути).
+    """
+    first_hop = [-1] * len(parent)
+    first_hop[source] = source
+
+    for target in range(len(parent)):
+        if first_hop[target] != -1 or parent[target] == -1:
+            continue
+
+        chain = []
+        current = target
+        while first_hop[current] == -1 and parent[current] != source:
+            chain.append(current)
+            current = parent[current]
+
+        hop = first_hop[current] if first_hop[current] != -1 else current
+        first_hop[current] = hop
+        for vertex in chain:
+            first_hop[vertex] = hop
+
+    return first_hop
+
+
+def multi_source_dijkstra(graph, sources, parallel=False, workers=None, chunk_size=None, adjacency=None,
+                          dist_typecode="d", reachability=None):
+    """
+    Кратчайшие пути от группы источников за один вызов.
+
+    Списки смежности строятся один раз на всю группу; при parallel=True источники распределяются
+    по пулу процессов, и строки записываются прямо в общую память (см. dijkstra_rows_parallel).
+
+    Args:
+        graph: Матрица смежности графа (может быть None, если передан adjacency).
+        sources: Список k индексов начальных вершин.
+        parallel: Если True, источники обрабатываются в пуле процессов.
+        workers: Количество рабочих процессов.
+        chunk_size: Количество источников в одном задании.
+        adjacency: Заранее построенные списки смежности (см. build_adjacency).
+        dist_typecode: Тип элементов массива расстояний ("d" или "f").
+        reachability: Индекс достижимости по тем же спискам смежности. Если передан, поиск
+            от источника заканчивается, как только найдены все достижимые из него вершины.
+
+    Returns:
+        dist: Плоский блок k x V (array), dist[r * V + j] - расстояние от sources[r] до j.
+        first_hop: Плоский блок k x V (array("i")), first_hop[r * V + j] - первая вершина пути
+            от sources[r] к j (-1, если пути нет).
+    """
+    if adjacency is None:
+        adjacency = build_adjacency(graph)
+
+    sources = list(sources)
+    limits = search_limits(adjacency, sources, reachability) if reachability is not None else [None] * len(sources)
+
+    if parallel and len(sources) > 1:
+        return dijkstra_rows_parallel(adjacency, dist_typecode, "i", workers, chunk_size, sources, first_hop=True,
+                                      limits=limits)
+
+    dist = array(dist_typecode)
+    first_hop = array("i")
+    for start, limit in zip(sources, limits):
+        row_dist, parent = _dijkstra_heap(adjacency, start, limit=limit)
+        dist.extend(row_dist)
+        first_hop.extend(first_hops(parent, start))
+
+    return dist, first_hop
+
+
+def bellman_ford(graph, start, adjacency=None):
+    """
+    Алгоритм Беллмана-Форда с очередью (SPFA) для графов с отрицательными весами.
+
+    В отличие от dijkstra учитывает все ненулевые рёбра, включая отрицательные.
+    В очередь попадают только вершины, расстояние до которых изменилось.
+
+    Args:
+        graph: Матрица смежности графа (может быть None, если передан adjacency).
+        start: Индекс начальной вершины.
+        adjacency: Списки смежности (см. build_adjacency с allow_negative=True).
+
+    Returns:
+        dist: Массив расстояний.
+        parent: Массив родительских вершин.
+
+    Raises:
+        NegativeCycleError: Если из start достижим цикл отрицательного веса.
+    """
+    if adjacency is None:
+        adjacency = build_adjacency(graph, allow_negative=True)
+
+    n = len(adjacency)
+    dist = [float('inf')] * n
+    dist[start] = 0
+    parent = [-1] * n
+    _shortest_path_faster(adjacency, dist, parent, [start])
+    return dist, parent
+
+
+def _shortest_path_faster(adjacency, dist, parent, sources):
+    """
+    Ядро SPFA: релаксирует рёбра, начиная с вершин sources, пока расстояния изменяются.
+
+    Цикл отрицательного веса обнаруживается по длине пути: кратчайший путь без циклов
+    не может содержать n и более рёбер.
+
+    Raises:
+        NegativeCycleError: Если обнаружен цикл отрицательного веса.
+    """
+    n = len(adjacency)
+    length = [0] * n
+    in_queue = [False] * n
+    queue = deque(sources)
+
+    for vertex in sources:
+        in_queue[vertex] = True
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = False
+        d = dist[u]
+
+        for v, weight in adjacency[u]:
+            if d + weight < dist[v]:
+                dist[v] = d + weight
+                parent[v] = u
+                length[v] = length[u] + 1
+
+                if length[v] >= n:
+                    raise NegativeCycleError("Граф содержит цикл отрицательного веса")
+
+                if not in_queue[v]:
+                    in_queue[v] = True
+                    queue.append(v)
+
+
+def johnson_all_pairs(graph, parallel=False, workers=None, chunk_size=None, adjacency=None, progress=None):
+    """
+    Алгоритм Джонсона: кратчайшие пути между всеми парами вершин в графе с отрицательными весами.
+
+    Один раз вычисляет потенциалы вершин алгоритмом SPFA, переводит веса в неотрицательные
+    w'(u, v) = w(u, v) + h(u) - h(v) и запускает быстрый алгоритм Дейкстры от каждой вершины.
+    На разреженных графах это O(VE log V) вместо O(V^3).
+
+    Args:
+        graph: Матрица смежности графа (может быть None, если передан adjacency).
+        parallel: Если True, поиск от источников выполняется в пуле процессов (см. dijkstra_all_pairs).
+        workers: Количество рабочих процессов.
+        chunk_size: Количество источников в одном задании.
+        adjacency: Списки смежности (см. build_adjacency с allow_negative=True).
+        progress: Функция progress(done, total) для поиска от источников (см. dijkstra_all_pairs).
+
+    Returns:
+        dist_matrix: Матрица кратчайших расстояний между всеми парами вершин.
+        path_matrix: Матрица родительских вершин для восстановления путей.
+
+    Raises:
+        NegativeCycleError: Если граф содержит цикл отрицательного веса.
+    """
+    if adjacency is None:
+        adjacency = build_adjacency(graph, allow_negative=True)
+
+    n = len(adjacency)
+
+    # Потенциалы - расстояния от фиктивной вершины, соединённой со всеми рёбрами веса 0
+    potential = [0] * n
+    _shortest_path_faster(adjacency, potential, [-1] * n, list(range(n)))
+
+    reweighted = [
+        [(v, weight + potential[u] - potential[v]) for v, weight in edges]
+        for u, edges in enumerate(adjacency)
+    ]
+
+    dist_matrix, path_matrix = dijkstra_all_pairs(
+        None, parallel=parallel, workers=workers, chunk_size=chunk_size, adjacency=reweighted, progress=progress
+    )
+
+    for u, row in enumerate(dist_matrix):
+        for v, d in enumerate(row):
+            if d != float('inf'):
+                row[v] = d - potential[u] + potential[v]
+
+    return dist_matrix, path_matrix
+
+
+def check_negative_cycle(dist):
+    """
+    Проверяет матрицу расстояний алгоритма Флойда-Уоршелла на циклы отрицательного веса.
+
+    Raises:
+        NegativeCycleError: Если для какой-либо вершины dist[i][i] < 0.
+    """
+    if any(dist[i][i] < 0 for i in range(len(dist))):
+        raise NegativeCycleError("Граф содержит цикл отрицательного веса")
+
+
+def has_negative_weights(graph):
+    """
+    Проверяет, есть ли в матрице смежности рёбра с отрицательным весом.
+    """
+    return any(weight < 0 for row in graph for weight in row)
+
+
 def reconstruct_path(data, start, end, is_floyd=False):
     """
     Восстанавливает путь между двумя вершинами на основе данных алгоритма Дейкстры или Флойда-Уоршелла.
@@ -152,84 +1448,70 @@ def construct_floyd_path(next_vertex, start, end):
     if next_vertex[start][end] == -1:
         return []
 
-    path = [start]
+    path = [int(start)]
 
     while start != end:
-        start = next_vertex[start][end]
+        start = int(next_vertex[start][end])
         path.append(start)
 
     return path
 
 
-def random_routing(graph, num_packets=1, protocol='TCP'):
+def random_routing(graph, num_packets=1, protocol='TCP', seed=None, max_hops=None, max_restarts=0):
     """
     Реализация случайной маршрутизации с поддержкой дейтаграммного метода.
 
+    Использует RandomWalker: индекс соседей строится один раз, маршруты всех пакетов строятся
+    за один вызов, посещённые вершины отмечаются в общем массиве меток.
+
     Args:
         graph: Объект графа.
         num_packets: Количество пакетов для маршрутизации.
         protocol: Протокол передачи данных ('TCP' или 'UDP').
+        seed: Зерно генератора случайных чисел (None - случайное).
+        max_hops: Максимальная длина маршрута (по умолчанию - число вершин).
+        max_restarts: Сколько раз пакет начинает маршрут заново, зайдя в тупик.
 
     Returns:
         Tuple[List[List[dict]], str]: Список путей для каждого пакета и название алгоритма.
     """
-    total_packets = num_packets
     algorithm_name = "Случайная маршрутизация"
 
-    def find_random_path():
-        """
-        Находит случайный маршрут от начальной до конечной вершины.
-
-        Returns:
-            path: Список вершин, представляющих случайный маршрут. Возвращает None, если маршрут не найден.
-        """
-        path = [graph.start_vertex]
-        current_vertex = graph.start_vertex
-        visited = set()
-
-        while current_vertex != graph.end_vertex:
-            visited.add(current_vertex["id"])
-
-            # Для неориентированного графа учитываем ребра в обоих направлениях
-            neighbors = []
-            for edge in graph.edges.values():
-                if edge[0]["id"] == current_vertex["id"] and edge[1]["id"] not in visited:
-                    neighbors.append(edge[1])
-                if edge[1]["id"] == current_vertex["id"] and edge[0]["id"] not in visited:
-                    neighbors.append(edge[0])
-
-            if not neighbors:
-                return None
+    # Случайный маршрут идёт по рёбрам в обоих направлениях
+    start_idx = graph.vertices.index(graph.start_vertex)
+    end_idx = graph.vertices.index(graph.end_vertex)
+    if not graph.model.reachability(undirected=True).can_reach(start_idx, end_idx):
+        messagebox.showwarning("Ошибка", "Конечная вершина недостижима из начальной.")
+        return [], algorithm_name
 
-            next_vertex = random.choice(neighbors)
-            path.append(next_vertex)
-            current_vertex = next_vertex
+    walker = RandomWalker(graph.model.adjacency(allow_negative=True), undirected=True, seed=seed,
+                          reachability=graph.model.reachability(undirected=True))
+    result = walker.walk(start_idx, end_idx, num_packets, max_hops=max_hops, max_restarts=max_restarts)
 
-        return path
+    if result.gave_up:
+        messagebox.showwarning("Ошибка", "Не удалось найти путь до конечной вершины для одного из пакетов.")
+        return [], algorithm_name
 
-    all_paths = []
-
-    for _ in range(total_packets):
-        path = find_random_path()
-        if path is None:
-            messagebox.showwarning("Ошибка", "Не удалось найти путь до конечной вершины для одного из пакетов.")
-            return [], algorithm_name
-        all_paths.append(path)
+    all_paths = [[graph.vertices[v] for v in path] for path in result.paths]
 
-    for packet_index, path in enumerate(all_paths, start=1):
-        display_packet_path(graph, path, algorithm_name, total_packets)
+    for path in all_paths:
+        display_packet_path(graph, path, algorithm_name, num_packets)
 
     return all_paths, algorithm_name
 
 
-def flooding_routing(graph, num_packets=1, protocol='TCP'):
+def flooding_routing(graph, num_packets=1, protocol='TCP', ttl=None):
     """
     Реализация лавинной маршрутизации.
 
+    Использует Flooder: индекс соседей строится один раз на все пакеты, дубликаты подавляются
+    по порядковым номерам, путь первой дошедшей копии восстанавливается по указателям на родителя.
+
     Args:
         graph: Объект графа.
         num_packets: Количество пакетов для маршрутизации.
         protocol: Протокол передачи данных ('TCP' или 'UDP').
+        ttl: Максимальное число пересылок копии пакета (по умолчанию - число вершин минус один).
 
     Returns:
         Tuple[List[List[dict]], str]: Список путей для каждого пакета и название алгоритма.
@@ -237,29 +1519,22 @@ def flooding_routing(graph, num_packets=1, protocol='TCP'):
     algorithm_name = "Лавинная маршрутизация"
     all_paths = []
 
-    for _ in range(num_packets):
-        path = []
-        queue = [(graph.start_vertex, [graph.start_vertex])]
-        visited = set()
-
-        while queue:
-            current_vertex, current_path = queue.pop(0)
-            if current_vertex["id"] in visited:
-                continue
-            visited.add(current_vertex["id"])
+    start_idx = graph.vertices.index(graph.start_vertex)
+    end_idx = graph.vertices.index(graph.end_vertex)
+    if not graph.model.reachability().can_reach(start_idx, end_idx):
+        messagebox.showwarning("Ошибка", "Конечная вершина недостижима из начальной.")
+        return [], algorithm_name
 
-            if current_vertex == graph.end_vertex:
-                path = current_path
-                break
+    flooder = Flooder(graph.model.adjacency(allow_negative=True), reachability=graph.model.reachability())
 
-            neighbors = [edge[1] for edge in graph.edges.values() if edge[0] == current_vertex]
-            for neighbor in neighbors:
-                queue.append((neighbor, current_path + [neighbor]))
+    for _ in range(num_packets):
+        result = flooder.send(start_idx, end_idx, ttl)
 
-        if not path:
+        if not result.delivered:
             messagebox.showwarning("Ошибка", "Не удалось найти путь до конечной вершины.")
             return [], algorithm_name
 
+        path = [graph.vertices[v] for v in result.path]
         all_paths.append(path)
 
         display_packet_path(graph, path, algorithm_name, num_packets)
@@ -267,14 +1542,22 @@ def flooding_routing(graph, num_packets=1, protocol='TCP'):
     return all_paths, algorithm_name
 
 
-def historical_routing(graph, num_packets=1, protocol='TCP'):
+def historical_routing(graph, num_packets=1, protocol='TCP', max_age=None, undirected=False):
     """
     Реализация маршрутизации по предыдущему опыту.
 
+    Использует BackwardLearningRouter: узлы запоминают, через какого соседа пришёл пакет от
+    каждого источника, пакеты к ещё не известному назначению рассылаются лавиной. По TCP
+    назначение отвечает подтверждением, и со второго пакета маршрут уже известен; по UDP
+    подтверждений нет, и узлы узнают только маршрут к источнику.
+
     Args:
         graph: Объект графа.
         num_packets: Количество пакетов для маршрутизации.
         protocol: Протокол передачи данных ('TCP' или 'UDP').
+        max_age: Время жизни записи таблицы в пакетах (None - записи не стареют).
+        undirected: Если True, каналы двунаправленные (в ориентированном графе узел учится
+            только на каналах, по которым можно ответить).
 
     Returns:
         Tuple[List[List[dict]], dict, str]: Список путей для каждого пакета, таблица маршрутизации и название алгоритма.
@@ -284,19 +1567,29 @@ def historical_routing(graph, num_packets=1, protocol='TCP'):
 
     start_idx = graph.vertices.index(graph.start_vertex)
     end_idx = graph.vertices.index(graph.end_vertex)
-    distance, path = dijkstra(graph.graph, start_idx, end_idx, True)
-
-    if not path:
-        messagebox.showwarning("Ошибка", "Не удалось найти путь до конечной вершины.")
+    if not graph.model.reachability(undirected).can_reach(start_idx, end_idx):
+        messagebox.showwarning("Ошибка", "Конечная вершина недостижима из начальной.")
         return [], routing_tables, algorithm_name
 
-    destination = graph.vertices[path[-1]]["name"]
-    hops = len(path) - 1
-    routing_tables[destination] = {"hops": hops}
-
-    all_paths = [path for _ in range(num_packets)]
+    router = BackwardLearningRouter(graph.model.adjacency(allow_negative=True), undirected, max_age,
+                                    graph.model.reachability(undirected))
+    all_paths = []
 
     for _ in range(num_packets):
+        result = router.send(start_idx, end_idx, reply=protocol == 'TCP')
+
+        if not result.delivered:
+            messagebox.showwarning("Ошибка", "Не удалось найти путь до конечной вершины.")
+            return [], routing_tables, algorithm_name
+
+        path = [graph.vertices[v] for v in result.path]
+        all_paths.append(path)
+
+    destination = graph.end_vertex["name"]
+    routing_tables[destination] = {"hops": len(all_paths[-1]) - 1}
+    graph.routing_tables = router.tables(graph.model.names)
+
+    for path in all_paths:
         display_packet_path(graph, path, algorithm_name, num_packets)
 
     return all_paths, routing_tables, algorithm_name
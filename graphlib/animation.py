@@ -0,0 +1,187 @@
+"""
+Планировщик анимации пакетов на холсте.
+
+Все пакеты двигаются от одного таймера кадров: на каждом кадре планировщик за один проход
+переставляет все летящие пакеты и перекрашивает только те рёбра, выделение которых изменилось.
+Положение пакета считается по прошедшему времени, поэтому задержка кадра не замедляет анимацию.
+Множитель скорости ускоряет полёт, а режим пропуска анимирует лишь выборку пакетов, остальные
+завершаются сразу, и большое моделирование не ждёт анимации.
+"""
+import time
+
+# Частота кадров анимации
+FRAME_RATE = 30
+
+# Шагов на одну пересылку в прежней покадровой анимации: время пересылки - столько задержек шага
+HOP_STEPS = 50
+
+# Сколько пакетов одновременно показывается в режиме пропуска анимации
+SKIP_SAMPLE = 3
+
+PACKET_RADIUS = 10
+HIGHLIGHT_COLOUR = "blue"
+EDGE_COLOUR = "black"
+
+
+def hop_time(packet_size):
+    """
+    Время одной пересылки пакета в секундах при скорости 1 (задержка шага растёт с размером пакета).
+    """
+    return HOP_STEPS * min(200, packet_size // 10) / 1000
+
+
+class _Flight:
+    """
+    Летящий пакет: элемент холста, точки маршрута и время полёта.
+    """
+
+    __slots__ = ("item", "points", "duration", "elapsed")
+
+    def __init__(self, item, points, duration):
+        self.item = item
+        self.points = points
+        self.duration = duration
+        self.elapsed = 0.0
+
+
+class PacketAnimator:
+    """
+    Единый таймер кадров для всех пакетов на холсте.
+
+    Пакеты, запущенные, пока анимация не простаивает, образуют одну серию; выделены рёбра
+    маршрутов текущей серии. Выделение сохраняется после посадки пакетов и снимается только
+    с тех рёбер, которых нет в маршрутах следующей серии.
+    """
+
+    def __init__(self, canvas, frame_rate=FRAME_RATE, speed=1.0, skip=False, sample=SKIP_SAMPLE):
+        """
+        Args:
+            canvas: Холст Tk.
+            frame_rate: Частота кадров.
+            speed: Множитель скорости анимации.
+            skip: Режим пропуска анимации: одновременно летит не более sample пакетов,
+                  остальные сразу считаются доставленными.
+            sample: Размер выборки пакетов в режиме пропуска.
+        """
+        self.canvas = canvas
+        self.interval = max(1, round(1000 / frame_rate))
+        self.speed = speed
+        self.skip = skip
+        self.sample = sample
+
+        self.flights = []
+        self.route_edges = set()
+        self.highlighted = set()
+        self._dirty = set()
+        self._job = None
+        self._last = None
+        self.skipped = 0
+
+    @property
+    def active(self):
+        return bool(self.flights)
+
+    def add(self, points, duration, colour, edges=()):
+        """
+        Запускает пакет по маршруту.
+
+        Args:
+            points: Координаты вершин маршрута [(x, y), ...].
+            duration: Время одной пересылки в секундах при скорости 1.
+            colour: Цвет пакета.
+            edges: Элементы холста рёбер маршрута, которые нужно выделить.
+
+        Returns:
+            bool: True, если пакет анимируется, False - если он пропущен.
+        """
+        if not self.flights:
+            # Новая серия: выделение прошлой серии пересматривается на ближайшем кадре
+            self._dirty |= self.route_edges
+            self.route_edges = set()
+        self.route_edges.update(edges)
+        self._dirty.update(edges)
+
+        if len(points) < 2 or (self.skip and len(self.flights) >= self.sample):
+            self.skipped += 1
+            self._schedule()
+            return False
+
+        x, y = points[0]
+        item = self.canvas.create_oval(
+            x - PACKET_RADIUS, y - PACKET_RADIUS, x + PACKET_RADIUS, y + PACKET_RADIUS,
+            fill=colour, outline="black", width=2
+        )
+        self.flights.append(_Flight(item, points, duration))
+        self._schedule()
+        return True
+
+    def finish_all(self):
+        """
+        Сразу завершает полёт всех пакетов (их маршруты остаются выделенными).
+        """
+        for flight in self.flights:
+            self.canvas.delete(flight.item)
+        self.flights = []
+        self._recolour()
+
+    def clear(self):
+        """
+        Убирает пакеты с холста и снимает выделение со всех рёбер.
+        """
+        self.finish_all()
+        self._dirty |= self.route_edges
+        self.route_edges = set()
+        self._recolour()
+        if self._job is not None:
+            self.canvas.after_cancel(self._job)
+            self._job = None
+
+    def _schedule(self):
+        if self._job is None:
+            self._last = time.perf_counter()
+            self._job = self.canvas.after(self.interval, self._tick)
+
+    def _tick(self):
+        """
+        Один кадр: перемещение всех пакетов за один проход и перекраска изменившихся рёбер.
+        """
+        self._job = None
+        now = time.perf_counter()
+        step = (now - self._last) * self.speed
+        self._last = now
+
+        alive = []
+        coords = self.canvas.coords
+        for flight in self.flights:
+            flight.elapsed += step
+            position = flight.elapsed / flight.duration if flight.duration > 0 else len(flight.points)
+            hop = int(position)
+            if hop >= len(flight.points) - 1:
+                self.canvas.delete(flight.item)
+                continue
+
+            fraction = position - hop
+            (x1, y1), (x2, y2) = flight.points[hop], flight.points[hop + 1]
+            x = x1 + (x2 - x1) * fraction
+            y = y1 + (y2 - y1) * fraction
+            coords(flight.item, x - PACKET_RADIUS, y - PACKET_RADIUS, x + PACKET_RADIUS, y + PACKET_RADIUS)
+            alive.append(flight)
+        self.flights = alive
+
+        self._recolour()
+        if alive:
+            self._schedule()
+
+    def _recolour(self):
+        """
+        Перекрашивает только рёбра, выделение которых изменилось с прошлого кадра.
+        """
+        for edge in self._dirty:
+            wanted = edge in self.route_edges
+            if wanted != (edge in self.highlighted):
+                self.canvas.itemconfig(edge, fill=HIGHLIGHT_COLOUR if wanted else EDGE_COLOUR)
+                if wanted:
+                    self.highlighted.add(edge)
+                else:
+                    self.highlighted.discard(edge)
+        self._dirty.clear()
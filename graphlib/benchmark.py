@@ -0,0 +1,531 @@
+"""
+Набор тестов производительности алгоритмов graphlib без графического интерфейса.
+
+Генерирует графы нескольких семейств (случайный граф Эрдёша-Реньи, решётка, безмасштабный граф
+Барабаши-Альберт, полный граф) заданных размеров, запускает каждый алгоритм с прогревом и
+повторными замерами time.perf_counter и сохраняет медиану, 95-й перцентиль и пиковый объём памяти
+в JSON. Результат можно сравнить с сохранённым эталоном: при регрессии программа завершается с кодом 1.
+Перед каждым замером выполняется эталонная нагрузка calibrate, и сравнивается медиана отношений
+времени алгоритма к её времени: так сравнение почти не зависит от того, насколько занята машина.
+
+Пример:
+    python -m graphlib.benchmark --sizes 50 200 --output bench.json
+    python -m graphlib.benchmark --sizes 50 200 --baseline bench.json
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .algorithms import HAS_NUMPY, floyd_warshall, floyd_warshall_numpy, dijkstra, dijkstra_all_pairs, \
+    shortest_path, bellman_ford, johnson_all_pairs, reverse_adjacency, euclidean_scale, ContractionHierarchy, \
+    multi_source_dijkstra
+from .blocked import blocked_floyd_warshall
+from .incremental import IncrementalAPSP
+from .model import GraphModel
+from .routing import Flooder, RandomWalker
+
+DEFAULT_SIZES = (50, 100, 200)
+DEFAULT_FAMILIES = ("erdos_renyi", "grid", "scale_free", "complete")
+DEFAULT_REPEATS = 15
+
+# Допустимое относительное замедление и абсолютный порог (секунды), ниже которого разница считается шумом
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_DELTA = 0.0005
+
+# Сколько раз перемеряются замеры, показавшие замедление, прежде чем оно считается регрессией
+DEFAULT_RECHECKS = 2
+
+# Размер графа эталонной нагрузки calibrate (поиск из двух вершин занимает около миллисекунды)
+CALIBRATION_SIZE = 300
+
+# Количество источников в замере пакетного поиска multi_source_dijkstra
+MULTI_SOURCE_COUNT = 16
+
+
+def _layout(model, n, rng):
+    """
+    Размещает n вершин в случайных точках холста 800x600 (координаты нужны эвристике A*).
+    """
+    for _ in range(n):
+        model.add_vertex(rng.randint(15, 785), rng.randint(15, 585))
+
+
+def erdos_renyi_graph(n, seed=0, degree=4, max_weight=10):
+    """
+    Случайный ориентированный граф Эрдёша-Реньи G(n, p) со средней полустепенью исхода degree.
+
+    Args:
+        n: Количество вершин.
+        seed: Зерно генератора случайных чисел.
+        degree: Средняя полустепень исхода (p = degree / (n - 1)).
+        max_weight: Максимальный вес ребра (веса - целые от 1 до max_weight).
+
+    Returns:
+        GraphModel.
+    """
+    rng = random.Random(seed)
+    model = GraphModel()
+    _layout(model, n, rng)
+
+    p = min(1.0, degree / max(1, n - 1))
+    for u in range(n):
+        for v in range(n):
+            if u != v and rng.random() < p:
+                model.set_edge(u, v, rng.randint(1, max_weight))
+
+    return model
+
+
+def grid_graph(n, seed=0, max_weight=10):
+    """
+    Квадратная решётка из примерно n вершин; соседние вершины соединены рёбрами в обе стороны.
+    """
+    rng = random.Random(seed)
+    side = max(1, round(math.sqrt(n)))
+    model = GraphModel()
+
+    for row in range(side):
+        for col in range(side):
+            model.add_vertex(40 + col * 40, 40 + row * 40)
+
+    for row in range(side):
+        for col in range(side):
+            u = row * side + col
+            for v in ((u + 1) if col + 1 < side else None, (u + side) if row + 1 < side else None):
+                if v is not None:
+                    model.set_edge(u, v, rng.randint(1, max_weight))
+                    model.set_edge(v, u, rng.randint(1, max_weight))
+
+    return model
+
+
+def scale_free_graph(n, seed=0, attach=2, max_weight=10):
+    """
+    Безмасштабный граф Барабаши-Альберт: каждая новая вершина соединяется с attach вершинами,
+    выбранными с вероятностью, пропорциональной их степени. Рёбра добавляются в обе стороны.
+    """
+    rng = random.Random(seed)
+    model = GraphModel()
+    _layout(model, n, rng)
+
+    # Каждая вершина входит в targets столько раз, какова её степень
+    targets = []
+    for u in range(1, n):
+        chosen = {0} if u <= attach else set()
+        while len(chosen) < min(attach, u):
+            chosen.add(rng.choice(targets))
+
+        for v in chosen:
+            model.set_edge(u, v, rng.randint(1, max_weight))
+            model.set_edge(v, u, rng.randint(1, max_weight))
+            targets.extend((u, v))
+
+    return model
+
+
+def complete_graph(n, seed=0, max_weight=10):
+    """
+    Полный ориентированный граф со случайными весами.
+    """
+    rng = random.Random(seed)
+    model = GraphModel()
+    _layout(model, n, rng)
+
+    for u in range(n):
+        for v in range(n):
+            if u != v:
+                model.set_edge(u, v, rng.randint(1, max_weight))
+
+    return model
+
+
+GENERATORS = {
+    "erdos_renyi": erdos_renyi_graph,
+    "grid": grid_graph,
+    "scale_free": scale_free_graph,
+    "complete": complete_graph,
+}
+
+
+def prepare_case(model):
+    """
+    Готовит входные данные алгоритмов один раз на граф, чтобы их построение не попадало в замеры.
+
+    Returns:
+        Словарь с матрицей смежности, списками смежности, координатами, парой вершин для поиска пути,
+        группой источников для пакетного поиска и ребром для инкрементальных обновлений.
+    """
+    adjacency = model.adjacency()
+    n = len(model)
+    edge = next(((u, *edges[0]) for u, edges in enumerate(adjacency) if edges), None)
+    return {
+        "matrix": model.matrix(),
+        "adjacency": adjacency,
+        "adjacency_all": model.adjacency(allow_negative=True),
+        "reverse": reverse_adjacency(adjacency),
+        "coords": model.coords,
+        "scale": euclidean_scale(adjacency, model.coords),
+        "start": 0,
+        "end": n - 1,
+        "sources": list(range(0, n, max(1, n // MULTI_SOURCE_COUNT))),
+        "edge": edge,
+    }
+
+
+def _blocked_floyd(case):
+    with tempfile.TemporaryDirectory() as directory:
+        result = blocked_floyd_warshall(None, directory, adjacency=case["adjacency_all"], resume=False)
+        del result
+
+
+def _hierarchy_query(case):
+    # Иерархия строится один раз на граф при первом (прогревочном) запуске; замеряются только запросы
+    if "hierarchy" not in case:
+        case["hierarchy"] = ContractionHierarchy.build(adjacency=case["adjacency"])
+    return shortest_path(None, case["start"], case["end"], "ch", hierarchy=case["hierarchy"])
+
+
+def _incremental_update(case):
+    # Матрицы строятся при первом (прогревочном) запуске; замеряется увеличение веса ребра и его возврат
+    if "apsp" not in case:
+        case["apsp"] = IncrementalAPSP(case["matrix"])
+    if case["edge"] is not None:
+        u, v, weight = case["edge"]
+        case["apsp"].set_edge(u, v, weight * 2)
+        case["apsp"].set_edge(u, v, weight)
+
+
+ENGINES = {
+    "floyd_warshall": lambda case: floyd_warshall(case["matrix"]),
+    "dijkstra": lambda case: dijkstra(None, case["start"], adjacency=case["adjacency"]),
+    "dijkstra_all_pairs": lambda case: dijkstra_all_pairs(None, adjacency=case["adjacency"]),
+    "dijkstra_all_pairs_parallel": lambda case: dijkstra_all_pairs(None, parallel=True, adjacency=case["adjacency"]),
+    "bidirectional": lambda case: shortest_path(None, case["start"], case["end"], "bidirectional",
+                                                adjacency=case["adjacency"], reverse=case["reverse"]),
+    "astar": lambda case: shortest_path(None, case["start"], case["end"], "astar", coords=case["coords"],
+                                        adjacency=case["adjacency"], scale=case["scale"]),
+    "ch": _hierarchy_query,
+    "ch_build": lambda case: ContractionHierarchy.build(adjacency=case["adjacency"]),
+    "multi_source_dijkstra": lambda case: multi_source_dijkstra(None, case["sources"], adjacency=case["adjacency"]),
+    "incremental_update": _incremental_update,
+    "bellman_ford": lambda case: bellman_ford(None, case["start"], adjacency=case["adjacency_all"]),
+    "johnson": lambda case: johnson_all_pairs(None, adjacency=case["adjacency_all"]),
+    "flooding": lambda case: Flooder(case["adjacency_all"]).send(case["start"], case["end"]),
+    "random_walk": lambda case: RandomWalker(case["adjacency_all"], seed=0).walk(case["start"], case["end"], 100),
+}
+
+# Семейства графов, на которых замеряется алгоритм (по умолчанию - все): построение иерархии сжатия
+# полного графа добавляет почти все возможные сокращения и занимает минуты уже на сотне вершин
+ENGINE_FAMILIES = {
+    "ch": ("erdos_renyi", "grid", "scale_free"),
+    "ch_build": ("erdos_renyi", "grid", "scale_free"),
+}
+
+if HAS_NUMPY:
+    ENGINES["floyd_warshall_numpy"] = lambda case: floyd_warshall_numpy(case["matrix"])
+    ENGINES["blocked_floyd_warshall"] = _blocked_floyd
+
+
+def percentile(values, q):
+    """
+    Перцентиль q (0..100) методом ближайшего ранга.
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def calibration_graph():
+    """
+    Списки смежности графа для calibrate.
+    """
+    return erdos_renyi_graph(CALIBRATION_SIZE).adjacency()
+
+
+def calibrate(adjacency):
+    """
+    Эталонная нагрузка: алгоритм Дейкстры из двух вершин графа calibration_graph. Её время показывает
+    текущую скорость машины, и, в отличие от арифметического цикла, она так же, как замеряемые алгоритмы,
+    зависит от кэша и кучи.
+
+    Returns:
+        Время выполнения (секунды).
+    """
+    start_time = time.perf_counter()
+    dijkstra(None, 0, adjacency=adjacency)
+    dijkstra(None, 1, adjacency=adjacency)
+    return time.perf_counter() - start_time
+
+
+def measure(engine, case, repeats=DEFAULT_REPEATS, warmup=1, calibration=None):
+    """
+    Замеряет время работы алгоритма на подготовленном графе.
+
+    Сначала выполняются warmup прогревочных запусков, затем repeats замеров time.perf_counter
+    с отключённым сборщиком мусора (как в timeit); перед каждым замером выполняется calibrate.
+    Пиковая память измеряется отдельным запуском под tracemalloc, чтобы трассировка не искажала время
+    (память рабочих процессов в неё не входит).
+
+    Args:
+        engine: Функция engine(case).
+        case: Результат prepare_case.
+        repeats: Количество замеров.
+        warmup: Количество прогревочных запусков.
+        calibration: Результат calibration_graph (строится, если не передан).
+
+    Returns:
+        Словарь с ключами median, p95, min, calibration (медиана времени calibrate; секунды),
+        relative (медиана отношений времени замера к времени предшествующего ему calibrate),
+        repeats и peak_memory (байты).
+    """
+    if calibration is None:
+        calibration = calibration_graph()
+
+    for _ in range(warmup):
+        engine(case)
+
+    timings = []
+    calibrations = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            calibrations.append(calibrate(calibration))
+            start_time = time.perf_counter()
+            engine(case)
+            timings.append(time.perf_counter() - start_time)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        engine(case)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median": statistics.median(timings),
+        "p95": percentile(timings, 95),
+        "min": min(timings),
+        "calibration": statistics.median(calibrations),
+        "relative": statistics.median(t / c for t, c in zip(timings, calibrations)),
+        "repeats": repeats,
+        "peak_memory": peak_memory,
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, families=DEFAULT_FAMILIES, engines=None, seed=0, repeats=DEFAULT_REPEATS,
+                   warmup=1, log=None):
+    """
+    Запускает все сочетания семейства графов, размера и алгоритма.
+
+    Args:
+        sizes: Количества вершин.
+        families: Семейства графов (ключи GENERATORS).
+        engines: Алгоритмы (ключи ENGINES); по умолчанию все доступные. Сочетания, не входящие
+            в ENGINE_FAMILIES, пропускаются.
+        seed: Зерно генераторов графов.
+        repeats: Количество замеров.
+        warmup: Количество прогревочных запусков.
+        log: Функция для вывода прогресса (например, print).
+
+    Returns:
+        Словарь с описанием окружения ("meta") и списком результатов ("results").
+
+    Raises:
+        ValueError: Если указано неизвестное семейство графов или алгоритм.
+    """
+    engines = list(ENGINES) if engines is None else list(engines)
+    for name in families:
+        if name not in GENERATORS:
+            raise ValueError(f"Неизвестное семейство графов: {name}")
+    for name in engines:
+        if name not in ENGINES:
+            raise ValueError(f"Неизвестный алгоритм: {name}")
+
+    calibration = calibration_graph()
+    results = []
+    for family in families:
+        for size in sizes:
+            model = GENERATORS[family](size, seed)
+            case = prepare_case(model)
+
+            for engine in engines:
+                if family not in ENGINE_FAMILIES.get(engine, GENERATORS):
+                    continue
+                stats = measure(ENGINES[engine], case, repeats, warmup, calibration)
+                results.append(dict(
+                    family=family, size=size, seed=seed, vertices=len(model), edges=len(model.edges),
+                    engine=engine, **stats
+                ))
+                if log:
+                    log(f"{family:<12} {size:>6} {engine:<28} min {stats['min']:.6f} с  "
+                        f"median {stats['median']:.6f} с  "
+                        f"p95 {stats['p95']:.6f} с  память {stats['peak_memory'] / 1024:.0f} КБ")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": HAS_NUMPY,
+            "seed": seed,
+            "repeats": repeats,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+
+def _key(entry):
+    return entry["family"], entry["size"], entry["seed"], entry["engine"]
+
+
+def _slowdowns(report, baseline, tolerance, min_delta):
+    """
+    Замеры, время которых хуже эталонного (см. compare).
+
+    Returns:
+        Список троек (замер, эталонное время, новое время) во времени эталона.
+    """
+    reference = {_key(entry): entry for entry in baseline["results"]}
+    slowdowns = []
+
+    for entry in report["results"]:
+        old = reference.get(_key(entry))
+        if old is None:
+            continue
+
+        if "relative" in old and "relative" in entry:
+            old_time, new_time = old["relative"] * old["calibration"], entry["relative"] * old["calibration"]
+        else:
+            old_time, new_time = old["median"], entry["median"]
+        if new_time - old_time > max(old_time * tolerance, min_delta):
+            slowdowns.append((entry, old_time, new_time))
+
+    return slowdowns
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Сравнивает результаты с эталоном.
+
+    Время сравнивается в пересчёте на скорость машины при записи эталона: relative * calibration эталона.
+    Скорость одноядерной или занятой машины меняется в разы за секунды, и отношение к соседнему запуску
+    calibrate устойчиво к этому, в отличие от времени в секундах. Для эталонов без relative
+    сравниваются медианы. Регрессией считается время, превышающее эталонное больше чем
+    на max(tolerance * эталон, min_delta), или пиковая память больше эталонной более чем
+    в (1 + tolerance) раз. Замеры, отсутствующие в эталоне, не проверяются.
+
+    Args:
+        report: Результат run_benchmarks.
+        baseline: Эталонный результат в том же формате.
+        tolerance: Допустимое относительное ухудшение.
+        min_delta: Минимальная абсолютная разница времени (секунды), считающаяся регрессией
+            для самых быстрых замеров; для медленных порог растёт вместе с эталонным временем.
+
+    Returns:
+        Список описаний регрессий (пустой, если их нет).
+    """
+    reference = {_key(entry): entry for entry in baseline["results"]}
+    regressions = [
+        "{} n={} seed={} {}".format(*_key(entry)) + f": время {old_time:.6f} -> {new_time:.6f} с"
+        for entry, old_time, new_time in _slowdowns(report, baseline, tolerance, min_delta)
+    ]
+
+    for entry in report["results"]:
+        old = reference.get(_key(entry))
+        if old is not None and entry["peak_memory"] > old["peak_memory"] * (1 + tolerance):
+            name = "{} n={} seed={} {}".format(*_key(entry))
+            regressions.append(f"{name}: память {old['peak_memory']} -> {entry['peak_memory']} байт")
+
+    return regressions
+
+
+def recheck(report, baseline, tolerance=DEFAULT_TOLERANCE, min_delta=DEFAULT_MIN_DELTA, rechecks=DEFAULT_RECHECKS,
+            log=None):
+    """
+    Перемеряет замеры, которые медленнее эталона, и оставляет лучший из замеров.
+
+    Кратковременная нагрузка на машину даёт замедление одного замера, а настоящая регрессия
+    воспроизводится при каждом повторе, поэтому регрессией считается только замедление,
+    сохранившееся после rechecks повторов.
+
+    Args:
+        report: Результат run_benchmarks; изменяется на месте.
+        baseline: Эталонный результат.
+        tolerance: См. compare.
+        min_delta: См. compare.
+        rechecks: Наибольшее число повторов.
+        log: Функция для вывода прогресса.
+    """
+    warmup = report["meta"]["warmup"]
+    repeats = report["meta"]["repeats"]
+    calibration = calibration_graph()
+
+    for _ in range(rechecks):
+        slowdowns = _slowdowns(report, baseline, tolerance, min_delta)
+        if not slowdowns:
+            return
+
+        for entry, _, _ in slowdowns:
+            case = prepare_case(GENERATORS[entry["family"]](entry["size"], entry["seed"]))
+            stats = measure(ENGINES[entry["engine"]], case, repeats, warmup, calibration)
+            if log:
+                log("повтор {} n={} seed={} {}".format(*_key(entry)) + f": relative {entry['relative']:.3f} -> "
+                    f"{stats['relative']:.3f}")
+            if stats["relative"] < entry["relative"]:
+                entry.update(stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Тесты производительности алгоритмов graphlib")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="количества вершин")
+    parser.add_argument("--families", nargs="+", default=list(DEFAULT_FAMILIES), choices=list(GENERATORS))
+    parser.add_argument("--engines", nargs="+", default=None, choices=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", help="файл для сохранения результатов (JSON)")
+    parser.add_argument("--baseline", help="эталонный файл результатов для сравнения")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA)
+    parser.add_argument("--rechecks", type=int, default=DEFAULT_RECHECKS,
+                        help="сколько раз перемерять замедлившиеся замеры перед сравнением с эталоном")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.families, args.engines, args.seed, args.repeats, args.warmup, print)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+        recheck(report, baseline, args.tolerance, args.min_delta, args.rechecks, print)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"Обнаружены регрессии ({len(regressions)}):", file=sys.stderr)
+            for line in regressions:
+                print("  " + line, file=sys.stderr)
+            return 1
+        print("Регрессий не обнаружено")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+import json
+import mmap
+import os
+from array import array
+
+from .algorithms import build_adjacency, graph_fingerprint
+from .paths import AllPairsResult, index_typecode
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него результат можно только прочитать
+    np = None
+
+META_FILE = "meta.json"
+DIST_FILE = "dist.bin"
+NEXT_FILE = "next.bin"
+
+BLOCKED_DTYPES = {"float64": "d", "float32": "f"}
+
+
+def blocked_floyd_warshall(graph, directory, block_size=256, dtype="float64", adjacency=None, resume=True,
+                           tile_columns=4096):
+    """
+    Блочный алгоритм Флойда-Уоршелла для графов, матрицы которых не помещаются в оперативную память.
+
+    Матрица расстояний хранится в файле, отображённом в память (numpy.memmap), и обрабатывается
+    плитками block_size x tile_columns в стандартном трёхфазном порядке для каждого k-блока:
+        1) диагональный блок (K, K);
+        2) строка блоков (K, *) и столбец блоков (*, K);
+        3) остальные блоки (I, J) по результатам фазы 2.
+    После каждого k-блока матрица сбрасывается на диск, а номер блока записывается в meta.json,
+    поэтому прерванный расчёт продолжается с последнего завершённого блока.
+
+    Матрица next_vertex не ведётся во время расчёта (это вдвое сокращает ввод-вывод и делает
+    повтор прерванного блока безопасным): она восстанавливается в конце по равенству
+    w(i, h) + dist[h][j] == dist[i][j]. Для графов с циклами нулевого веса пути могут быть неоднозначны.
+
+    Args:
+        graph: Матрица смежности графа (может быть None, если передан adjacency).
+        directory: Каталог для файлов dist.bin, next.bin и meta.json.
+        block_size: Размер k-блока (строк в плитке).
+        dtype: Тип хранения расстояний: "float64" или "float32".
+        adjacency: Списки смежности со всеми ненулевыми рёбрами (см. build_adjacency с allow_negative=True).
+        resume: Если True, продолжает незавершённый расчёт для того же графа и параметров.
+        tile_columns: Ширина плитки (столбцов) в фазах 2 и 3.
+
+    Returns:
+        AllPairsResult, читающий файлы результата без копирования (см. open_blocked_result).
+
+    Raises:
+        ImportError: Если NumPy не установлен.
+        ValueError: Если указан неподдерживаемый dtype.
+    """
+    if np is None:
+        raise ImportError("Для blocked_floyd_warshall требуется NumPy")
+
+    if dtype not in BLOCKED_DTYPES:
+        raise ValueError(f"Неподдерживаемый тип данных: {dtype}")
+
+    if adjacency is None:
+        adjacency = build_adjacency(graph, allow_negative=True)
+
+    n = len(adjacency)
+    os.makedirs(directory, exist_ok=True)
+
+    settings = {
+        "n": n,
+        "block_size": block_size,
+        "dtype": dtype,
+        "next_dtype": "int16" if index_typecode(n) == "h" else "int32",
+        "fingerprint": graph_fingerprint(adjacency),
+    }
+
+    meta = _read_meta(directory) if resume else None
+    if meta is None or any(meta.get(key) != value for key, value in settings.items()):
+        meta = dict(settings, completed_blocks=0, next_done=False)
+        _init_dist_file(directory, adjacency, dtype, block_size)
+        _write_meta(directory, meta)
+
+    if n == 0:
+        meta["next_done"] = True
+        _write_meta(directory, meta)
+        return open_blocked_result(directory)
+
+    dist = np.memmap(os.path.join(directory, DIST_FILE), dtype=dtype, mode="r+", shape=(n, n))
+    blocks = (n + block_size - 1) // block_size
+
+    for kb in range(meta["completed_blocks"], blocks):
+        _process_k_block(dist, kb, block_size, tile_columns)
+        dist.flush()
+        meta["completed_blocks"] = kb + 1
+        _write_meta(directory, meta)
+
+    if not meta["next_done"]:
+        _derive_next_vertex(dist, adjacency, directory, meta["next_dtype"], block_size)
+        meta["next_done"] = True
+        _write_meta(directory, meta)
+
+    del dist
+    return open_blocked_result(directory)
+
+
+def open_blocked_result(directory):
+    """
+    Открывает результат blocked_floyd_warshall без копирования: массивы AllPairsResult -
+    это memoryview над файлами, отображёнными в память. NumPy для чтения не требуется.
+
+    Args:
+        directory: Каталог с файлами результата.
+
+    Returns:
+        AllPairsResult (вид "next").
+
+    Raises:
+        FileNotFoundError: Если результат не найден.
+        ValueError: Если расчёт ещё не завершён.
+    """
+    meta = _read_meta(directory)
+    if meta is None:
+        raise FileNotFoundError(f"Результат не найден: {directory}")
+
+    n = meta["n"]
+    blocks = (n + meta["block_size"] - 1) // meta["block_size"]
+    if meta["completed_blocks"] < blocks or not meta["next_done"]:
+        raise ValueError("Расчёт не завершён")
+
+    dist_typecode = BLOCKED_DTYPES[meta["dtype"]]
+    next_typecode = "h" if meta["next_dtype"] == "int16" else "i"
+
+    if n == 0:
+        return AllPairsResult(0, array(dist_typecode), array(next_typecode), "next")
+
+    dist = _map_file(os.path.join(directory, DIST_FILE)).cast(dist_typecode)
+    next_vertex = _map_file(os.path.join(directory, NEXT_FILE)).cast(next_typecode)
+    return AllPairsResult(n, dist, next_vertex, "next")
+
+
+def _map_file(path):
+    """
+    Отображает файл в память только для чтения и возвращает memoryview над ним.
+    """
+    with open(path, "rb") as file:
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _read_meta(directory):
+    path = os.path.join(directory, META_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def _write_meta(directory, meta):
+    """
+    Атомарно записывает meta.json (через временный файл), чтобы прерывание не повредило контрольную точку.
+    """
+    path = os.path.join(directory, META_FILE)
+    with open(path + ".tmp", "w") as file:
+        json.dump(meta, file)
+    os.replace(path + ".tmp", path)
+
+
+def _init_dist_file(directory, adjacency, dtype, block_size):
+    """
+    Создаёт файл расстояний: inf для несмежных пар, 0 на диагонали и веса рёбер. Записывается полосами строк.
+    """
+    n = len(adjacency)
+    path = os.path.join(directory, DIST_FILE)
+
+    if n == 0:
+        open(path, "wb").close()
+        return
+
+    dist = np.memmap(path, dtype=dtype, mode="w+", shape=(n, n))
+    for start in range(0, n, block_size):
+        stripe = np.full((min(block_size, n - start), n), np.inf, dtype=dtype)
+        for row, i in enumerate(range(start, start + len(stripe))):
+            for v, weight in adjacency[i]:
+                stripe[row, v] = weight
+            stripe[row, i] = 0
+        dist[start:start + len(stripe)] = stripe
+    dist.flush()
+    del dist
+
+
+def _process_k_block(dist, kb, block_size, tile_columns):
+    """
+    Выполняет три фазы блочного алгоритма Флойда-Уоршелла для k-блока kb.
+    """
+    n = dist.shape[0]
+    k0, k1 = kb * block_size, min((kb + 1) * block_size, n)
+    width = k1 - k0
+
+    # Фаза 1: диагональный блок
+    diagonal = np.array(dist[k0:k1, k0:k1])
+    for k in range(width):
+        np.minimum(diagonal, diagonal[:, k:k + 1] + diagonal[k:k + 1, :], out=diagonal)
+    dist[k0:k1, k0:k1] = diagonal
+
+    # Фаза 2: строка блоков (K, *)
+    for j0 in range(0, n, tile_columns):
+        j1 = min(j0 + tile_columns, n)
+        tile = np.array(dist[k0:k1, j0:j1])
+        for k in range(width):
+            np.minimum(tile, diagonal[:, k:k + 1] + tile[k:k + 1, :], out=tile)
+        dist[k0:k1, j0:j1] = tile
+
+    for i0 in range(0, n, block_size):
+        if i0 == k0:
+            continue
+        i1 = min(i0 + block_size, n)
+
+        # Фаза 2: блок столбца (I, K)
+        column = np.array(dist[i0:i1, k0:k1])
+        for k in range(width):
+            np.minimum(column, column[:, k:k + 1] + diagonal[k:k + 1, :], out=column)
+        dist[i0:i1, k0:k1] = column
+
+        # Фаза 3: остальные плитки строки (I, *)
+        for j0 in range(0, n, tile_columns):
+            j1 = min(j0 + tile_columns, n)
+            tile = np.array(dist[i0:i1, j0:j1])
+            row = dist[k0:k1, j0:j1]
+            for k in range(width):
+                np.minimum(tile, column[:, k:k + 1] + row[k:k + 1, :], out=tile)
+            dist[i0:i1, j0:j1] = tile
+
+
+def _derive_next_vertex(dist, adjacency, directory, next_dtype, block_size):
+    """
+    Восстанавливает матрицу next_vertex по итоговым расстояниям: next[i][j] = h для первого
+    соседа h вершины i, для которого w(i, h) + dist[h][j] совпадает с dist[i][j].
+    """
+    n = dist.shape[0]
+    next_vertex = np.memmap(os.path.join(directory, NEXT_FILE), dtype=next_dtype, mode="w+", shape=(n, n))
+    rtol = 1e-6 if dist.dtype == np.float32 else 1e-9
+
+    for start in range(0, n, block_size):
+        stripe = np.array(dist[start:start + block_size])
+        result = np.full(stripe.shape, -1, dtype=next_dtype)
+
+        for row, i in enumerate(range(start, start + len(stripe))):
+            target = stripe[row]
+            reachable = np.isfinite(target)
+            result[row, i] = i
+
+            for h, weight in adjacency[i]:
+                via = dist[h] + weight
+                match = reachable & (result[row] == -1) & np.isclose(via, target, rtol=rtol, atol=0)
+                result[row, match] = h
+
+        next_vertex[start:start + len(stripe)] = result
+
+    next_vertex.flush()
+    del next_vertex
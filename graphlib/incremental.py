@@ -0,0 +1,185 @@
+from .algorithms import HAS_NUMPY, build_adjacency, floyd_warshall, floyd_warshall_numpy, multi_source_dijkstra
+
+
+class IncrementalAPSP:
+    """
+    Кратчайшие пути между всеми парами вершин, поддерживаемые при изменении рёбер.
+
+    Хранит матрицы dist и next_vertex в том же формате, что и floyd_warshall, и обновляет их
+    после каждого изменения веса ребра:
+        - добавление ребра или уменьшение веса - за O(V^2) без пересчёта;
+        - удаление ребра или увеличение веса - пересчитываются только строки источников,
+          кратчайшие пути которых проходили через изменённое ребро.
+    При отрицательных рёбрах строки пересчитываются алгоритмом Дейкстры на перевзвешенном графе
+    (как в johnson_all_pairs): потенциалы берутся из старой матрицы dist и остаются допустимыми,
+    раз вес ребра только вырос. Полный пересчёт выполняется лишь при изменении числа вершин
+    и пока в графе есть цикл отрицательного веса.
+    Индексом достижимости служит сама матрица dist: строки источников, из которых u недостижима
+    (dist[i][u] == inf), не просматриваются и не пересчитываются.
+    """
+
+    def __init__(self, graph, progress=None):
+        """
+        Args:
+            graph: Матрица смежности графа, где graph[i][j] - вес ребра от вершины i к j (0 - нет ребра).
+            progress: Функция progress(done, total) для первого расчёта (см. floyd_warshall).
+        """
+        self.weights = [row[:] for row in graph]
+        # Число отрицательных рёбер: от него зависит, нужно ли перевзвешивание в _increase
+        self.negative = self._count_negative()
+        self.dist = []
+        self.next_vertex = []
+        self.rebuild(progress)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def rebuild(self, progress=None):
+        """
+        Полностью пересчитывает матрицы алгоритмом Флойда-Уоршелла.
+
+        Args:
+            progress: Функция progress(done, total), вызываемая после каждой итерации по k.
+        """
+        if HAS_NUMPY:
+            dist, next_vertex = floyd_warshall_numpy(self.weights, progress=progress)
+            self.dist, self.next_vertex = dist.tolist(), next_vertex.tolist()
+        else:
+            self.dist, self.next_vertex = floyd_warshall(self.weights, progress)
+
+    def sync(self, graph):
+        """
+        Приводит структуру к новой матрице смежности, применяя изменения по одной ячейке.
+
+        Args:
+            graph: Текущая матрица смежности графа.
+
+        Returns:
+            Количество изменённых рёбер (-1, если потребовался полный пересчёт).
+        """
+        if len(graph) != len(self.weights):
+            self.weights = [row[:] for row in graph]
+            self.negative = self._count_negative()
+            self.rebuild()
+            return -1
+
+        changes = [
+            (i, j, weight)
+            for i, (row, old_row) in enumerate(zip(graph, self.weights))
+            for j, (weight, old_weight) in enumerate(zip(row, old_row))
+            if weight != old_weight
+        ]
+
+        for i, j, weight in changes:
+            self.set_edge(i, j, weight)
+
+        return len(changes)
+
+    def set_edge(self, u, v, weight):
+        """
+        Устанавливает вес ребра u -> v (0 - удалить ребро) и обновляет кратчайшие пути.
+
+        Args:
+            u: Индекс начальной вершины ребра.
+            v: Индекс конечной вершины ребра.
+            weight: Новый вес ребра.
+        """
+        old_weight = self.weights[u][v]
+        if weight == old_weight or u == v:
+            self.weights[u][v] = weight
+            return
+
+        self.weights[u][v] = weight
+        self.negative += (weight < 0) - (old_weight < 0)
+
+        # Пока в графе есть цикл отрицательного веса, матрицы содержат расстояния по нему,
+        # и поправлять их на месте нельзя
+        if any(self.dist[i][i] < 0 for i in range(len(self.dist))):
+            self.rebuild()
+        elif weight != 0 and (old_weight == 0 or weight < old_weight):
+            self._decrease(u, v, weight)
+        else:
+            self._increase(u, v, old_weight)
+
+    def remove_edge(self, u, v):
+        """
+        Удаляет ребро u -> v.
+        """
+        self.set_edge(u, v, 0)
+
+    def _decrease(self, u, v, weight):
+        """
+        Обновляет матрицы после добавления ребра u -> v или уменьшения его веса: O(V^2).
+        """
+        dist = self.dist
+        from_v = dist[v][:]
+
+        # Новое ребро замыкает цикл отрицательного веса: матрицы, как у floyd_warshall, строятся заново
+        if from_v[u] + weight < 0:
+            self.rebuild()
+            return
+
+        for i, row in enumerate(dist):
+            to_u = row[u]
+            if to_u == float('inf'):
+                continue
+
+            via = to_u + weight
+            first_hop = v if i == u else self.next_vertex[i][u]
+            next_row = self.next_vertex[i]
+
+            for j, tail in enumerate(from_v):
+                if via + tail < row[j]:
+                    row[j] = via + tail
+                    next_row[j] = first_hop
+
+    def _increase(self, u, v, old_weight):
+        """
+        Обновляет матрицы после удаления ребра u -> v или увеличения его веса.
+
+        Пересчитываются только пары (i, j), кратчайший путь которых мог проходить через ребро:
+        dist[i][u] + old_weight + dist[v][j] == dist[i][j] (с допуском на погрешность вещественных весов).
+        """
+        dist = self.dist
+        from_v = dist[v]
+        affected = {}
+
+        for i, row in enumerate(dist):
+            to_u = row[u]
+            if to_u == float('inf'):
+                continue
+
+            via = to_u + old_weight
+            targets = [
+                j for j, tail in enumerate(from_v)
+                if tail != float('inf') and abs(via + tail - row[j]) <= 1e-9 * max(1.0, abs(row[j]))
+            ]
+            if targets:
+                affected[i] = targets
+
+        if not affected:
+            return
+
+        n = len(dist)
+        if self.negative:
+            # Расстояния от фиктивной вершины, соединённой со всеми рёбрами веса 0, до изменения ребра.
+            # Увеличение веса не нарушает неравенство треугольника, поэтому потенциалы остаются допустимыми
+            potential = [min(0, *column) for column in zip(*dist)]
+            adjacency = [
+                [(x, w + potential[y] - potential[x]) for x, w in edges]
+                for y, edges in enumerate(build_adjacency(self.weights, allow_negative=True))
+            ]
+        else:
+            potential = [0] * n
+            adjacency = build_adjacency(self.weights)
+
+        sources = list(affected)
+        dist_block, first_hop = multi_source_dijkstra(None, sources, adjacency=adjacency)
+
+        for row, i in enumerate(sources):
+            for j in affected[i]:
+                dist[i][j] = dist_block[row * n + j] - potential[i] + potential[j]
+                self.next_vertex[i][j] = first_hop[row * n + j]
+
+    def _count_negative(self):
+        return sum(w < 0 for row in self.weights for w in row)
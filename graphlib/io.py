@@ -2,7 +2,9 @@ import json
 import os
 from tkinter import messagebox, filedialog
 
-from .utils import add_vertex, create_edge, set_end_vertex, set_start_vertex, update_matrix_display
+from .model import GraphModel
+from .utils import add_vertex, create_edge, set_end_vertex, set_start_vertex, update_graph_matrix, \
+    update_matrix_display
 
 
 def save_graph(graph):
@@ -13,14 +15,6 @@ def save_graph(graph):
         graph: Объект графа.
         task: Номер задания.
     """
-    graph_data = {
-        "start_vertex": graph.vertices.index(graph.start_vertex) if graph.start_vertex else None,
-        "end_vertex": graph.vertices.index(graph.end_vertex) if graph.end_vertex else None,
-        "vertices": [{"coords": graph.canvas.coords(v["id"])} for v in graph.vertices],
-        "edges": [(graph.vertices.index(start_v), graph.vertices.index(end_v), weight) for
-                  _, (start_v, end_v, weight, _) in graph.edges.items()]
-    }
-
     file_path = filedialog.asksaveasfilename(
         defaultextension=".json",
         filetypes=[("JSON files", "*.json")],
@@ -30,8 +24,7 @@ def save_graph(graph):
     if not file_path:
         return
 
-    with open(file_path, "w") as file:
-        json.dump(graph_data, file)
+    write_graph(graph.model, file_path)
 
     messagebox.showinfo("Сохранение", f"Граф сохранен в файл {os.path.basename(file_path)}")
 
@@ -58,29 +51,31 @@ def load_graph(graph, direction: bool = True):
         if not file_path:
             return
 
-        with open(file_path, "r") as f:
-            graph_data = json.load(f)
+        model = read_graph(file_path)
 
         clear_graph(graph)
 
-        for vertex_data in graph_data["vertices"]:
-            x0, y0, x1, y1 = vertex_data["coords"]
-            add_vertex(graph, (x0 + x1) // 2, (y0 + y1) // 2)
+        # Матрица смежности пересчитывается один раз в конце, а не после каждой вершины и ребра
+        for x, y in model.coords:
+            add_vertex(graph, x, y, update=False)
 
-        for start_idx, end_idx, weight in graph_data["edges"]:
+        for (start_idx, end_idx), weight in model.edges.items():
             start_vertex = graph.vertices[start_idx]
             end_vertex = graph.vertices[end_idx]
-            create_edge(graph, start_vertex, end_vertex, weight, direction)
+            create_edge(graph, start_vertex, end_vertex, weight, direction, update=False)
+
+        for (start_idx, end_idx), (bandwidth, queue) in model.links.items():
+            graph.model.set_link(start_idx, end_idx, bandwidth, queue)
 
-        if graph_data["start_vertex"] is not None:
-            graph.start_vertex = graph.vertices[graph_data["start_vertex"]]
-            set_start_vertex(graph, graph.start_vertex)
+        if model.start_vertex is not None:
+            set_start_vertex(graph, graph.vertices[model.start_vertex])
 
-        if graph_data["end_vertex"] is not None:
-            graph.end_vertex = graph.vertices[graph_data["end_vertex"]]
-            set_end_vertex(graph, graph.end_vertex)
+        if model.end_vertex is not None:
+            set_end_vertex(graph, graph.vertices[model.end_vertex])
 
+        update_graph_matrix(graph)
         update_matrix_display(graph)
+        graph.on_graph_loaded(file_path)
 
         messagebox.showinfo("Загрузка", f"Граф загружен из файла {os.path.basename(file_path)}")
 
@@ -90,6 +85,30 @@ def load_graph(graph, direction: bool = True):
         messagebox.showerror("Ошибка", f"Некорректный формат данных: {e}")
 
 
+def export_packet_log(graph):
+    """
+    Выгружает журнал пакетов в CSV или в двоичный файл по столбцам (по расширению файла).
+
+    Args:
+        graph: Объект графа.
+    """
+    file_path = filedialog.asksaveasfilename(
+        defaultextension=".csv",
+        filetypes=[("CSV files", "*.csv"), ("Packet log files", "*.pktlog")],
+        initialdir="saves",
+        title="Выгрузить журнал пакетов"
+    )
+    if not file_path:
+        return
+
+    if file_path.endswith(".pktlog"):
+        graph.packet_log.to_binary(file_path)
+    else:
+        graph.packet_log.to_csv(file_path)
+
+    messagebox.showinfo("Журнал пакетов", f"Журнал выгружен в файл {os.path.basename(file_path)}")
+
+
 def clear_graph(graph):
     """
     Полностью очищает граф.
@@ -101,8 +120,44 @@ def clear_graph(graph):
         graph.canvas.delete(vertex["id"])
         graph.canvas.delete(vertex["text"])
 
-    for edge_id in graph.edges:
+    for edge_id, (_, _, _, label_id) in graph.edges.items():
         graph.canvas.delete(edge_id)
+        graph.canvas.delete(label_id)
 
     graph.vertices.clear()
     graph.edges.clear()
+    graph.start_vertex = None
+    graph.end_vertex = None
+    graph.model.clear()
+
+
+def read_graph(file_path):
+    """
+    Читает граф из файла JSON без обращения к интерфейсу.
+
+    Args:
+        file_path: Путь к файлу.
+
+    Returns:
+        Модель графа (GraphModel).
+
+    Raises:
+        FileNotFoundError: Если файл с графом не найден.
+        KeyError: Если формат данных некорректен.
+    """
+    with open(file_path, "r") as f:
+        graph_data = json.load(f)
+
+    return GraphModel.from_dict(graph_data)
+
+
+def write_graph(model, file_path):
+    """
+    Записывает модель графа в файл JSON без обращения к интерфейсу.
+
+    Args:
+        model: Модель графа (GraphModel).
+        file_path: Путь к файлу.
+    """
+    with open(file_path, "w") as file:
+        json.dump(model.to_dict(), file)
@@ -0,0 +1,180 @@
+"""
+Фоновые расчёты для окон лабораторных работ.
+
+Расчёт выполняется в рабочем потоке и не обращается к Tk: ход расчёта, промежуточные
+и итоговые результаты передаются через очередь, которую главный поток опрашивает таймером
+after. Отмена кооперативная: алгоритмы вызывают функцию progress, и она прерывает расчёт
+исключением JobCancelled, как только пользователь нажал «Отмена».
+"""
+import queue
+import threading
+import time
+
+# Период опроса очереди главным потоком, мс (около 60 раз в секунду)
+POLL_INTERVAL = 16
+
+# Не чаще этого (в секундах) рабочий поток отправляет сообщения о ходе расчёта
+PROGRESS_INTERVAL = 1 / 60
+
+
+class JobCancelled(Exception):
+    """
+    Исключение, которым прерывается отменённый расчёт.
+    """
+
+
+class BackgroundJob:
+    """
+    Расчёт function(job, *args, **kwargs) в рабочем потоке.
+
+    Рабочий поток вызывает job.progress(done, total) и job.partial(value); главный поток
+    получает их в обработчиках on_progress(done, total, stage) и on_partial(value), а по окончании -
+    on_done(result), on_error(exception) или on_cancelled(). Все обработчики вызываются
+    в главном потоке, поэтому могут работать с виджетами.
+
+    Пример:
+        job = BackgroundJob(root, lambda job, graph: all_pairs(graph, progress=job.progress), graph,
+                            on_done=show_result)
+        job.start()
+    """
+
+    def __init__(self, widget, function, *args, on_done=None, on_error=None, on_cancelled=None, on_progress=None,
+                 on_partial=None, **kwargs):
+        """
+        Args:
+            widget: Виджет Tk, таймером которого опрашивается очередь.
+            function: Функция расчёта; первым аргументом получает сам BackgroundJob.
+            *args, **kwargs: Остальные аргументы function.
+            on_done: Обработчик результата.
+            on_error: Обработчик исключения расчёта (по умолчанию исключение пробрасывается в Tk).
+            on_cancelled: Обработчик отмены.
+            on_progress: Обработчик хода расчёта.
+            on_partial: Обработчик промежуточных результатов.
+        """
+        self.widget = widget
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.on_progress = on_progress
+        self.on_partial = on_partial
+
+        self.stage = ""
+        self.started = None
+        self.finished = False
+        self._queue = queue.SimpleQueue()
+        self._cancel = threading.Event()
+        self._last_progress = 0.0
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and not self.finished
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def start(self):
+        """
+        Запускает рабочий поток и опрос очереди.
+        """
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.widget.after(POLL_INTERVAL, self._poll)
+        return self
+
+    def cancel(self):
+        """
+        Просит расчёт остановиться; он прервётся при ближайшем вызове progress или check.
+        """
+        self._cancel.set()
+
+    # Методы рабочего потока
+
+    def check(self):
+        """
+        Прерывает расчёт, если он отменён.
+
+        Raises:
+            JobCancelled: Если пользователь отменил расчёт.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def set_stage(self, stage):
+        """
+        Задаёт название этапа расчёта для сообщений о ходе.
+        """
+        self.check()
+        self.stage = stage
+        self._queue.put(("progress", (0, 0, stage)))
+
+    def progress(self, done, total):
+        """
+        Сообщает о ходе расчёта (не чаще PROGRESS_INTERVAL) и проверяет отмену.
+        Подходит как аргумент progress для алгоритмов graphlib.
+        """
+        self.check()
+        now = time.perf_counter()
+        if now - self._last_progress >= PROGRESS_INTERVAL or done == total:
+            self._last_progress = now
+            self._queue.put(("progress", (done, total, self.stage)))
+
+    def partial(self, value):
+        """
+        Передаёт промежуточный результат главному потоку.
+        """
+        self._queue.put(("partial", value))
+
+    def _run(self):
+        try:
+            result = self.function(self, *self.args, **self.kwargs)
+        except JobCancelled:
+            self._queue.put(("cancelled", None))
+        except Exception as e:
+            self._queue.put(("error", e))
+        else:
+            self._queue.put(("done", result))
+
+    # Главный поток
+
+    def _poll(self):
+        """
+        Разбирает накопившиеся сообщения рабочего потока; вызывается таймером главного потока.
+        """
+        latest_progress = None
+        while True:
+            try:
+                kind, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                # Из нескольких сообщений о ходе за период опроса важно только последнее
+                latest_progress = value
+                continue
+            if kind == "partial":
+                if self.on_partial is not None:
+                    self.on_partial(value)
+                continue
+
+            self.finished = True
+            if kind == "done":
+                if self.on_done is not None:
+                    self.on_done(value)
+            elif kind == "cancelled":
+                if self.on_cancelled is not None:
+                    self.on_cancelled()
+            elif self.on_error is not None:
+                self.on_error(value)
+            else:
+                raise value
+            return
+
+        if latest_progress is not None and self.on_progress is not None:
+            self.on_progress(*latest_progress)
+        self.widget.after(POLL_INTERVAL, self._poll)
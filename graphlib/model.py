@@ -0,0 +1,300 @@
+import itertools
+
+from .reachability import ReachabilityIndex
+
+# Общий счётчик версий: версии разных моделей не совпадают, поэтому по ним можно кэшировать результаты
+_versions = itertools.count(1)
+
+
+class GraphModel:
+    """
+    Модель графа, не зависящая от Tk.
+
+    Хранит вершины, взвешенные рёбра, начальную и конечную вершины и координаты раскладки.
+    Вершины адресуются индексами 0..n-1 в том же порядке, что и graph.vertices в представлении,
+    поэтому модель можно передавать в алгоритмы, рабочие процессы и функции ввода-вывода
+    без холста. Объект полностью сериализуется через pickle.
+
+    Необязательные параметры каналов (пропускная способность и ёмкость очереди) хранятся
+    в links рядом с весами рёбер и на кратчайшие пути не влияют.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.coords = []
+        self.edges = {}
+        self.links = {}
+        self.start_vertex = None
+        self.end_vertex = None
+        self.version = 0
+        self._adjacency_cache = {}
+        self._reachability = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_adjacency_cache"] = {}
+        state["_reachability"] = {}
+        return state
+
+    def _touch(self, reachability=None):
+        """
+        Отмечает изменение модели: присваивает новую версию и сбрасывает кэш списков смежности.
+
+        Args:
+            reachability: Индексы достижимости, уже обновлённые под изменение (остальные сбрасываются).
+        """
+        self.version = next(_versions)
+        self._adjacency_cache = {}
+        self._reachability = reachability or {}
+
+    def add_vertex(self, x, y, name=None):
+        """
+        Добавляет вершину.
+
+        Args:
+            x: Координата x центра вершины.
+            y: Координата y центра вершины.
+            name: Имя (подпись) вершины. По умолчанию - её индекс.
+
+        Returns:
+            Индекс новой вершины.
+        """
+        index = len(self.names)
+        self.names.append(index if name is None else name)
+        self.coords.append((x, y))
+
+        for reachability in self._reachability.values():
+            reachability.add_vertex()
+        self._touch(self._reachability)
+        return index
+
+    def remove_vertex(self, index):
+        """
+        Удаляет вершину и все инцидентные ей рёбра. Индексы следующих вершин сдвигаются на единицу.
+
+        Args:
+            index: Индекс вершины.
+        """
+        del self.names[index]
+        del self.coords[index]
+
+        def shift(vertex):
+            return vertex - 1 if vertex > index else vertex
+
+        self.edges = {
+            (shift(start), shift(end)): weight
+            for (start, end), weight in self.edges.items()
+            if start != index and end != index
+        }
+        self.links = {
+            (shift(start), shift(end)): link
+            for (start, end), link in self.links.items()
+            if start != index and end != index
+        }
+
+        if self.start_vertex == index:
+            self.start_vertex = None
+        elif self.start_vertex is not None:
+            self.start_vertex = shift(self.start_vertex)
+
+        if self.end_vertex == index:
+            self.end_vertex = None
+        elif self.end_vertex is not None:
+            self.end_vertex = shift(self.end_vertex)
+
+        self._touch()
+
+    def move_vertex(self, index, x, y):
+        """
+        Перемещает вершину в новые координаты.
+        """
+        self.coords[index] = (x, y)
+
+    def set_edge(self, start, end, weight):
+        """
+        Добавляет ребро start -> end или изменяет его вес.
+        """
+        # Нулевой вес означает отсутствие ребра, поэтому запись не сохраняется
+        if weight == 0:
+            self.remove_edge(start, end)
+            return
+        old_weight = self.edges.get((start, end), 0)
+        self.edges[(start, end)] = weight
+
+        # Добавление ребра обновляет индексы достижимости на месте, изменение веса их не затрагивает
+        if old_weight == 0:
+            for reachability in self._reachability.values():
+                reachability.add_edge(start, end)
+        self._touch(self._reachability)
+
+    def remove_edge(self, start, end):
+        """
+        Удаляет ребро start -> end, если оно существует.
+        """
+        self.links.pop((start, end), None)
+        if self.edges.pop((start, end), None) is not None:
+            self._touch()
+
+    def reverse_edge(self, start, end):
+        """
+        Меняет направление ребра start -> end на end -> start.
+        """
+        weight = self.edges.pop((start, end))
+        self.edges[(end, start)] = weight
+        if (start, end) in self.links:
+            self.links[(end, start)] = self.links.pop((start, end))
+        self._touch()
+
+    def weight(self, start, end):
+        """
+        Возвращает вес ребра start -> end или 0, если ребра нет.
+        """
+        return self.edges.get((start, end), 0)
+
+    def set_link(self, start, end, bandwidth=None, queue=None):
+        """
+        Задаёт параметры канала start -> end. Они не меняют весов рёбер, поэтому версия модели
+        и кэши алгоритмов сохраняются.
+
+        Args:
+            start: Индекс начальной вершины.
+            end: Индекс конечной вершины.
+            bandwidth: Пропускная способность канала, байт в единицу времени (None - не задана).
+            queue: Ёмкость очереди канала в пакетах (None - не задана, 0 - канал без буфера).
+        """
+        if bandwidth is None and queue is None:
+            self.links.pop((start, end), None)
+        else:
+            self.links[(start, end)] = (bandwidth, queue)
+
+    def link(self, start, end):
+        """
+        Возвращает параметры канала start -> end: пару (пропускная способность, ёмкость очереди),
+        где None - параметр не задан (в моделировании действует общее значение сети или ограничения нет).
+        """
+        return self.links.get((start, end), (None, None))
+
+    def clear(self):
+        """
+        Полностью очищает модель.
+        """
+        self.names.clear()
+        self.coords.clear()
+        self.edges.clear()
+        self.links.clear()
+        self.start_vertex = None
+        self.end_vertex = None
+        self._touch()
+
+    def matrix(self):
+        """
+        Возвращает матрицу смежности, где matrix[i][j] - вес ребра i -> j (0 - нет ребра).
+        """
+        n = len(self.names)
+        matrix = [[0] * n for _ in range(n)]
+
+        for (start, end), weight in self.edges.items():
+            matrix[start][end] = weight
+
+        return matrix
+
+    def adjacency(self, allow_negative=False, undirected=False, reverse=False):
+        """
+        Возвращает списки смежности модели. Результат кэшируется до следующего изменения.
+
+        Args:
+            allow_negative: Если True, учитываются все ненулевые рёбра, иначе только положительные.
+            undirected: Если True, каждое ребро учитывается в обоих направлениях.
+            reverse: Если True, рёбра обращаются (adjacency[v] содержит пары (u, вес ребра u -> v)).
+
+        Returns:
+            adjacency: Список, где adjacency[u] - список пар (v, вес ребра u -> v).
+        """
+        key = (allow_negative, undirected, reverse)
+        if key not in self._adjacency_cache:
+            adjacency = [[] for _ in self.names]
+
+            for (start, end), weight in self.edges.items():
+                if weight > 0 or (allow_negative and weight != 0):
+                    if reverse:
+                        start, end = end, start
+                    adjacency[start].append((end, weight))
+                    if undirected:
+                        adjacency[end].append((start, weight))
+
+            self._adjacency_cache[key] = adjacency
+
+        return self._adjacency_cache[key]
+
+    def reachability(self, undirected=False):
+        """
+        Возвращает индекс достижимости по всем ненулевым рёбрам модели.
+
+        Индекс обновляется на месте при добавлении вершин и рёбер и строится заново
+        при первом обращении после удаления ребра или вершины.
+
+        Args:
+            undirected: Если True, рёбра учитываются в обоих направлениях.
+
+        Returns:
+            ReachabilityIndex.
+        """
+        if undirected not in self._reachability:
+            self._reachability[undirected] = ReachabilityIndex(self.adjacency(allow_negative=True), undirected)
+
+        return self._reachability[undirected]
+
+    def to_dict(self):
+        """
+        Возвращает представление модели в формате файлов сохранения (saves/*.json).
+        Параметры канала записываются необязательным четвёртым элементом ребра.
+        """
+        edges = []
+        for (start, end), weight in self.edges.items():
+            edge = [start, end, weight]
+            bandwidth, queue = self.link(start, end)
+            attributes = {
+                key: value for key, value in (("bandwidth", bandwidth), ("queue", queue)) if value is not None
+            }
+            if attributes:
+                edge.append(attributes)
+            edges.append(edge)
+
+        return {
+            "start_vertex": self.start_vertex,
+            "end_vertex": self.end_vertex,
+            "vertices": [{"coords": [x - 15, y - 15, x + 15, y + 15]} for x, y in self.coords],
+            "edges": edges
+        }
+
+    @classmethod
+    def from_dict(cls, graph_data):
+        """
+        Создаёт модель из данных в формате файлов сохранения.
+
+        Args:
+            graph_data: Словарь с ключами "vertices", "edges", "start_vertex", "end_vertex".
+
+        Returns:
+            Новая модель графа.
+
+        Raises:
+            KeyError: Если формат данных некорректен.
+        """
+        model = cls()
+
+        for vertex_data in graph_data["vertices"]:
+            x0, y0, x1, y1 = vertex_data["coords"]
+            model.add_vertex((x0 + x1) // 2, (y0 + y1) // 2)
+
+        for start, end, weight, *attributes in graph_data["edges"]:
+            model.set_edge(start, end, weight)
+            if attributes:
+                model.set_link(start, end, attributes[0].get("bandwidth"), attributes[0].get("queue"))
+
+        model.start_vertex = graph_data["start_vertex"]
+        model.end_vertex = graph_data["end_vertex"]
+        return model
@@ -0,0 +1,334 @@
+"""
+Журнал пакетов: кольцевой буфер фиксированной ёмкости с типизированными столбцами.
+
+Каждая запись - строка столбцов (номер пакета, запуск, алгоритм, отправитель, назначение, маршрут,
+размер, hop limit, время отправки и завершения, итог). Маршруты, имена вершин и названия алгоритмов
+хранятся один раз и адресуются номерами, текст записи формируется только при отображении. Журнал
+хранит имена вершин, а не их индексы, поэтому записи остаются верными после удаления вершин графа. Когда буфер
+заполнен, новые записи вытесняют самые старые, поэтому память журнала ограничена при любой
+длине прогона. Журнал выгружается в CSV и в компактный двоичный файл по столбцам.
+"""
+import csv
+import json
+import math
+from array import array
+
+DEFAULT_CAPACITY = 100000
+
+# Столбцы журнала и типы элементов массивов
+COLUMNS = (
+    ("packet_id", "q"),
+    ("run", "i"),
+    ("algorithm", "h"),
+    ("source", "i"),
+    ("destination", "i"),
+    ("path", "i"),
+    ("size", "i"),
+    ("hop_limit", "i"),
+    ("created", "d"),
+    ("finished", "d"),
+    ("status", "h"),
+)
+
+BINARY_MAGIC = b"PKTLOG2\n"
+
+
+class PacketLog:
+    """
+    Журнал пакетов на кольцевом буфере.
+
+    Логический индекс записи: 0 - самая старая из хранимых, -1 - самая новая.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity: Максимальное число хранимых записей.
+        """
+        if capacity < 1:
+            raise ValueError("Ёмкость журнала должна быть положительной")
+
+        self.capacity = capacity
+        self.columns = {name: array(typecode, [0]) * capacity for name, typecode in COLUMNS}
+        self.clear()
+
+    def clear(self):
+        """
+        Очищает журнал за O(1): массивы не обнуляются, сбрасываются только счётчики и справочники.
+        """
+        self.start = 0
+        self.count = 0
+        self.total = 0
+
+        # Справочники: имена вершин, названия алгоритмов и итогов, маршруты (номера имён вершин)
+        # с числом ссылающихся на них записей
+        self.vertices = []
+        self._vertex_ids = {}
+        self.algorithms = []
+        self._algorithm_ids = {}
+        self.statuses = []
+        self._status_ids = {}
+        self.paths = {}
+        self._path_ids = {}
+        self._path_refs = {}
+        self._next_path_id = 0
+
+    def __len__(self):
+        return self.count
+
+    def _intern(self, value, values, ids):
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(values)
+            values.append(value)
+        return index
+
+    def _intern_vertex(self, name):
+        return self._intern(name, self.vertices, self._vertex_ids)
+
+    def _intern_path(self, path):
+        if path is None:
+            return -1
+
+        path = tuple(path)
+        path_id = self._path_ids.get(path)
+        if path_id is None:
+            path_id = self._next_path_id
+            self._next_path_id += 1
+            self._path_ids[path] = path_id
+            self.paths[path_id] = path
+            self._path_refs[path_id] = 0
+        self._path_refs[path_id] += 1
+        return path_id
+
+    def _release_path(self, path_id):
+        if path_id == -1:
+            return
+
+        self._path_refs[path_id] -= 1
+        if self._path_refs[path_id] == 0:
+            del self._path_refs[path_id]
+            del self._path_ids[self.paths.pop(path_id)]
+
+    def append(self, source, destination, path=None, size=0, hop_limit=0, algorithm="", created=math.nan,
+               finished=math.nan, status="delivered", run=0, names=None):
+        """
+        Добавляет запись, вытесняя самую старую, если буфер заполнен.
+
+        Args:
+            source: Индекс вершины-отправителя.
+            destination: Индекс вершины назначения.
+            path: Маршрут (индексы вершин) или None, если он не записывался.
+            size: Размер пакета в байтах.
+            hop_limit: Ограничение числа пересылок.
+            algorithm: Название алгоритма маршрутизации.
+            created: Время отправки.
+            finished: Время доставки или потери.
+            status: Итог ("delivered" или причина потери).
+            run: Номер запуска маршрутизации.
+            names: Имена вершин по индексам; по умолчанию source, destination и path - уже имена.
+
+        Returns:
+            Номер пакета (с единицы, сквозной с момента очистки журнала).
+        """
+        columns = self.columns
+        if self.count == self.capacity:
+            slot = self.start
+            self._release_path(columns["path"][slot])
+            self.start = (self.start + 1) % self.capacity
+        else:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+
+        self.total += 1
+        columns["packet_id"][slot] = self.total
+        columns["run"][slot] = run
+        columns["algorithm"][slot] = self._intern(algorithm, self.algorithms, self._algorithm_ids)
+        if names is not None:
+            source, destination = names[source], names[destination]
+            path = None if path is None else [names[v] for v in path]
+        columns["source"][slot] = self._intern_vertex(source)
+        columns["destination"][slot] = self._intern_vertex(destination)
+        columns["path"][slot] = self._intern_path(None if path is None else map(self._intern_vertex, path))
+        columns["size"][slot] = size
+        columns["hop_limit"][slot] = hop_limit
+        columns["created"][slot] = created
+        columns["finished"][slot] = finished
+        columns["status"][slot] = self._intern(status, self.statuses, self._status_ids)
+        return self.total
+
+    def extend(self, other):
+        """
+        Дописывает записи другого журнала (от старой к новой) с новыми номерами пакетов.
+        Так журнал фонового расчёта переносится в основной в главном потоке.
+
+        Args:
+            other: PacketLog.
+        """
+        columns = [other.column(name) for name, _ in COLUMNS]
+        for packet_id, run, algorithm, source, destination, path, size, hop_limit, created, finished, status \
+                in zip(*columns):
+            self.append(other.vertices[source], other.vertices[destination], other.path(path), size, hop_limit,
+                        other.algorithms[algorithm], created, finished, other.statuses[status], run)
+
+    def _slot(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Индекс записи журнала вне диапазона")
+        return (self.start + index) % self.capacity
+
+    def row(self, index):
+        """
+        Возвращает запись по логическому индексу в виде словаря (маршрут, имена вершин и названия раскрыты).
+        """
+        slot = self._slot(index)
+        row = {name: self.columns[name][slot] for name, _ in COLUMNS}
+        row["algorithm"] = self.algorithms[row["algorithm"]]
+        row["status"] = self.statuses[row["status"]]
+        row["source"] = self.vertices[row["source"]]
+        row["destination"] = self.vertices[row["destination"]]
+        row["path"] = self.path(row["path"])
+        return row
+
+    def path(self, path_id):
+        """
+        Возвращает маршрут по номеру в виде списка имён вершин (None для номера -1).
+        """
+        if path_id == -1:
+            return None
+        return [self.vertices[v] for v in self.paths[path_id]]
+
+    def rows(self):
+        for index in range(self.count):
+            yield self.row(index)
+
+    def column(self, name):
+        """
+        Возвращает столбец в порядке записей (от старой к новой) как новый массив.
+        """
+        data = self.columns[name]
+        end = self.start + self.count
+        if end <= self.capacity:
+            return data[self.start:end]
+        return data[self.start:] + data[:end - self.capacity]
+
+    def format(self, index):
+        """
+        Формирует текст записи для окна информации о пакетах.
+
+        Args:
+            index: Логический индекс записи.
+        """
+        row = self.row(index)
+        lines = [
+            f"Маршрутизация №{row['run']}",
+            f"Алгоритм: {row['algorithm']}",
+            f"Адрес отправителя: Вершина {row['source']}",
+            f"Адрес назначения: Вершина {row['destination']}",
+        ]
+        if row["path"] is not None:
+            lines.append(f"Назначенный маршрут: {' -> '.join(map(str, row['path']))}")
+        lines += [
+            f"Номер пакета: {row['packet_id']}",
+            f"Размер пакета: {row['size']} байт",
+            f"Время жизни (hop limit): {row['hop_limit']} пересылок",
+        ]
+        if row["status"] != "delivered":
+            lines.append(f"Пакет потерян: {row['status']}")
+        return "\n".join(lines) + "\n"
+
+    def to_csv(self, file_path):
+        """
+        Выгружает журнал в CSV (маршрут - имена вершин через пробел).
+
+        Args:
+            file_path: Путь к файлу.
+        """
+        with open(file_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow([column for column, _ in COLUMNS])
+            for row in self.rows():
+                row["path"] = " ".join(map(str, row["path"])) if row["path"] is not None else ""
+                writer.writerow([row[column] for column, _ in COLUMNS])
+
+    def to_binary(self, file_path):
+        """
+        Выгружает журнал в двоичный файл по столбцам: сигнатура, длина и текст JSON-заголовка,
+        затем байты столбцов в порядке записей. Маршруты хранятся двумя столбцами: смещения
+        и номера имён вершин подряд; сами имена - в заголовке.
+        """
+        path_ids = sorted(self.paths)
+        offsets = array("q", [0])
+        vertices = array("i")
+        for path_id in path_ids:
+            vertices.extend(self.paths[path_id])
+            offsets.append(len(vertices))
+
+        blocks = [(name, self.column(name)) for name, _ in COLUMNS]
+        blocks += [("path_ids", array("i", path_ids)), ("path_offsets", offsets), ("path_vertices", vertices)]
+
+        header = json.dumps({
+            "count": self.count,
+            "total": self.total,
+            "vertices": self.vertices,
+            "algorithms": self.algorithms,
+            "statuses": self.statuses,
+            "columns": [[name, data.typecode, len(data)] for name, data in blocks],
+        }, ensure_ascii=False).encode("utf-8")
+
+        with open(file_path, "wb") as file:
+            file.write(BINARY_MAGIC)
+            file.write(len(header).to_bytes(4, "little"))
+            file.write(header)
+            for _, data in blocks:
+                data.tofile(file)
+
+    @classmethod
+    def read_binary(cls, file_path):
+        """
+        Читает журнал, выгруженный to_binary.
+
+        Returns:
+            PacketLog с ёмкостью, равной числу записей (не меньше 1).
+
+        Raises:
+            ValueError: Если файл не является журналом пакетов.
+        """
+        with open(file_path, "rb") as file:
+            if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                raise ValueError(f"{file_path} не является журналом пакетов")
+            header = json.loads(file.read(int.from_bytes(file.read(4), "little")).decode("utf-8"))
+
+            blocks = {}
+            for name, typecode, length in header["columns"]:
+                data = array(typecode)
+                data.fromfile(file, length)
+                blocks[name] = data
+
+        log = cls(max(1, header["count"]))
+        log.count = header["count"]
+        log.total = header["total"]
+        log.vertices = header["vertices"]
+        log._vertex_ids = {name: index for index, name in enumerate(log.vertices)}
+        log.algorithms = header["algorithms"]
+        log._algorithm_ids = {name: index for index, name in enumerate(log.algorithms)}
+        log.statuses = header["statuses"]
+        log._status_ids = {name: index for index, name in enumerate(log.statuses)}
+
+        for name, _ in COLUMNS:
+            log.columns[name][:log.count] = blocks[name]
+
+        offsets = blocks["path_offsets"]
+        vertices = blocks["path_vertices"]
+        for position, path_id in enumerate(blocks["path_ids"]):
+            path = tuple(vertices[offsets[position]:offsets[position + 1]])
+            log.paths[path_id] = path
+            log._path_ids[path] = path_id
+            log._path_refs[path_id] = 0
+            log._next_path_id = max(log._next_path_id, path_id + 1)
+        for path_id in log.column("path"):
+            if path_id != -1:
+                log._path_refs[path_id] += 1
+
+        return log
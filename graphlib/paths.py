@@ -0,0 +1,315 @@
+from array import array
+
+from .algorithms import HAS_NUMPY, build_adjacency, dijkstra_rows_parallel, floyd_warshall_numpy, \
+    johnson_all_pairs, search_limits, _dijkstra_heap
+
+# Точность float32 достаточна для целых расстояний, не превышающих 2^24
+FLOAT32_EXACT_LIMIT = 2 ** 24
+
+
+def index_typecode(n):
+    """
+    Возвращает тип элементов массива индексов вершин: int16 для графов до 32767 вершин, иначе int32.
+    """
+    return "h" if n < 2 ** 15 else "i"
+
+
+def distance_typecode(adjacency):
+    """
+    Подбирает тип элементов массива расстояний.
+
+    float32 выбирается, если все веса целые и любое расстояние точно представимо в float32,
+    иначе float64.
+
+    Args:
+        adjacency: Списки смежности графа.
+
+    Returns:
+        "f" или "d".
+    """
+    max_weight = 0
+    for edges in adjacency:
+        for _, weight in edges:
+            if weight != int(weight):
+                return "d"
+            max_weight = max(max_weight, abs(weight))
+
+    return "f" if max_weight * max(1, len(adjacency) - 1) < FLOAT32_EXACT_LIMIT else "d"
+
+
+class AllPairsResult:
+    """
+    Результат поиска кратчайших путей между всеми парами вершин.
+
+    Расстояния и предшественники хранятся построчно в плоских типизированных массивах
+    (int16/int32 для индексов вершин, float32/float64 для расстояний), поэтому ячейка занимает
+    несколько байт вместо десятков для списков Python. Пути восстанавливаются только по запросу.
+
+    Виды матрицы предшественников:
+        "parent" - pred[i][j] - вершина перед j на пути из i (алгоритм Дейкстры, Джонсона);
+        "next" - pred[i][j] - следующая вершина после i на пути в j (алгоритм Флойда-Уоршелла).
+    """
+
+    def __init__(self, n, dist, pred, kind="parent"):
+        """
+        Args:
+            n: Количество вершин.
+            dist: Плоский массив расстояний длины n * n.
+            pred: Плоский массив предшественников длины n * n (-1 - нет пути).
+            kind: Вид матрицы предшественников: "parent" или "next".
+        """
+        if kind not in ("parent", "next"):
+            raise ValueError(f"Неизвестный вид матрицы предшественников: {kind}")
+
+        self.n = n
+        self.dist = dist
+        self.pred = pred
+        self.kind = kind
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        """
+        Возвращает строку расстояний от вершины i (без копирования), так что result[i][j] - расстояние.
+        """
+        return memoryview(self.dist)[i * self.n:(i + 1) * self.n]
+
+    @classmethod
+    def from_matrices(cls, dist_matrix, pred_matrix, kind="parent", dist_typecode="d"):
+        """
+        Упаковывает матрицы (списки списков или numpy.ndarray) в компактный результат.
+
+        Args:
+            dist_matrix: Матрица расстояний.
+            pred_matrix: Матрица родительских вершин (kind="parent") или next_vertex (kind="next").
+            kind: Вид матрицы предшественников.
+            dist_typecode: Тип элементов массива расстояний ("d" или "f").
+
+        Returns:
+            Новый AllPairsResult.
+        """
+        n = len(dist_matrix)
+        dist = array(dist_typecode)
+        pred = array(index_typecode(n))
+
+        if hasattr(dist_matrix, "tobytes"):
+            dist.frombytes(dist_matrix.astype(_numpy_dtype(dist.typecode), copy=False).tobytes())
+        else:
+            for row in dist_matrix:
+                dist.extend(row)
+
+        if hasattr(pred_matrix, "tobytes"):
+            pred.frombytes(pred_matrix.astype(_numpy_dtype(pred.typecode), copy=False).tobytes())
+        else:
+            for row in pred_matrix:
+                pred.extend(row)
+
+        return cls(n, dist, pred, kind)
+
+    @property
+    def nbytes(self):
+        """
+        Объём памяти, занимаемый массивами результата, в байтах.
+        """
+        return self.dist.itemsize * len(self.dist) + self.pred.itemsize * len(self.pred)
+
+    def distance(self, i, j):
+        """
+        Возвращает длину кратчайшего пути из i в j (inf, если пути нет).
+        """
+        return self.dist[i * self.n + j]
+
+    def has_path(self, i, j):
+        """
+        Проверяет, существует ли путь из i в j.
+        """
+        return self.dist[i * self.n + j] != float('inf')
+
+    def path(self, i, j):
+        """
+        Восстанавливает кратчайший путь из i в j.
+
+        Returns:
+            Список вершин пути (пустой, если пути нет).
+        """
+        n, pred = self.n, self.pred
+
+        if self.kind == "next":
+            if pred[i * n + j] == -1:
+                return []
+            path = [i]
+            while i != j:
+                i = pred[i * n + j]
+                path.append(i)
+                if len(path) > n:  # Зацикливание возможно только на циклах нулевого веса
+                    return []
+            return path
+
+        path = []
+        current = j
+        while current != -1:
+            path.append(current)
+            if current == i:
+                break
+            current = pred[i * n + current]
+
+        if current == -1:
+            return []
+
+        path.reverse()
+        return path
+
+    def pairs(self, include_unreachable=True):
+        """
+        Генератор по парам различных вершин. Пути восстанавливаются по мере перебора.
+
+        Args:
+            include_unreachable: Если False, пары без пути пропускаются.
+
+        Yields:
+            Кортеж (i, j, расстояние, путь); для недостижимых пар путь пуст, расстояние inf.
+        """
+        for i in range(self.n):
+            for j in range(self.n):
+                if i == j:
+                    continue
+                if self.has_path(i, j):
+                    yield i, j, self.distance(i, j), self.path(i, j)
+                elif include_unreachable:
+                    yield i, j, float('inf'), []
+
+    def has_negative_cycle(self):
+        """
+        Проверяет наличие цикла отрицательного веса (dist[i][i] < 0).
+        """
+        return any(self.dist[i * self.n + i] < 0 for i in range(self.n))
+
+
+def floyd_rows(adjacency, dist_typecode="d", progress=None):
+    """
+    Алгоритм Флойда-Уоршелла прямо в плоских типизированных массивах, без матриц из списков Python:
+    списками на время итерации становятся только строка k и обновляемая строка i.
+
+    Args:
+        adjacency: Списки смежности графа (со всеми ненулевыми рёбрами, в том числе отрицательными).
+        dist_typecode: Тип элементов массива расстояний ("d" или "f").
+        progress: Функция progress(done, total), вызываемая после каждой итерации по k.
+
+    Returns:
+        Пара плоских массивов (расстояния, next_vertex) длины n * n, как у AllPairsResult с kind="next".
+    """
+    n = len(adjacency)
+    inf = float('inf')
+    dist = array(dist_typecode, [inf]) * (n * n)
+    next_vertex = array(index_typecode(n), [-1]) * (n * n)
+
+    for i, edges in enumerate(adjacency):
+        base = i * n
+        for j, weight in edges:
+            dist[base + j] = weight
+            next_vertex[base + j] = j
+        dist[base + i] = 0
+        next_vertex[base + i] = i
+
+    for k in range(n):
+        row_k = dist[k * n:(k + 1) * n].tolist()
+        for i in range(n):
+            base = i * n
+            d_ik = dist[base + k]
+            if d_ik == inf:
+                continue
+
+            row = dist[base:base + n].tolist()
+            hop = next_vertex[base + k]
+            changed = False
+            for j in range(n):
+                candidate = d_ik + row_k[j]
+                if candidate < row[j]:
+                    row[j] = candidate
+                    next_vertex[base + j] = hop
+                    changed = True
+            if changed:
+                dist[base:base + n] = array(dist_typecode, row)
+
+        if progress is not None:
+            progress(k + 1, n)
+
+    return dist, next_vertex
+
+
+def _numpy_dtype(typecode):
+    """
+    Соответствие типов array и NumPy.
+    """
+    return {"d": "float64", "f": "float32", "h": "int16", "i": "int32"}[typecode]
+
+
+def all_pairs(graph, algorithm="dijkstra", parallel=False, workers=None, chunk_size=None, dist_typecode=None,
+              progress=None):
+    """
+    Вычисляет кратчайшие пути между всеми парами вершин в компактный AllPairsResult.
+    Для алгоритма Дейкстры строки записываются сразу в типизированные массивы,
+    без промежуточных матриц из списков Python; алгоритм Флойда без NumPy работает прямо
+    в таких массивах (floyd_rows), а с NumPy - в матрицах того же типа расстояний.
+
+    Args:
+        graph: Матрица смежности графа.
+        algorithm: "dijkstra", "johnson" или "floyd".
+        parallel: Если True, источники обрабатываются в пуле процессов (для "dijkstra" и "johnson").
+        workers: Количество рабочих процессов.
+        chunk_size: Количество источников в одном задании.
+        dist_typecode: Тип элементов массива расстояний ("d" или "f"); по умолчанию см. distance_typecode.
+        progress: Функция progress(done, total): итерации по k для "floyd", источники для остальных.
+            Исключение из неё прерывает расчёт.
+
+    Returns:
+        AllPairsResult.
+
+    Raises:
+        ValueError: Если указан неизвестный алгоритм.
+        NegativeCycleError: Если алгоритм Джонсона обнаружил цикл отрицательного веса.
+    """
+    n = len(graph)
+
+    if algorithm == "floyd":
+        adjacency = build_adjacency(graph, allow_negative=True)
+        dist_typecode = dist_typecode or distance_typecode(adjacency)
+        if not HAS_NUMPY:
+            dist, next_vertex = floyd_rows(adjacency, dist_typecode, progress)
+            return AllPairsResult(n, dist, next_vertex, "next")
+
+        # Матрица расстояний сразу в типе результата, чтобы упаковка не создавала ещё одну копию
+        dist, next_vertex = floyd_warshall_numpy(graph, _numpy_dtype(dist_typecode), progress)
+        return AllPairsResult.from_matrices(dist, next_vertex, "next", dist_typecode)
+
+    if algorithm == "johnson":
+        adjacency = build_adjacency(graph, allow_negative=True)
+        dist_typecode = dist_typecode or distance_typecode(adjacency)
+        dist, parent = johnson_all_pairs(None, parallel, workers, chunk_size, adjacency, progress)
+        return AllPairsResult.from_matrices(dist, parent, "parent", dist_typecode)
+
+    if algorithm != "dijkstra":
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+
+    adjacency = build_adjacency(graph)
+    dist_typecode = dist_typecode or distance_typecode(adjacency)
+    parent_typecode = index_typecode(n)
+    # Поиск от источника заканчивается, как только найдены все достижимые из него вершины
+    limits = search_limits(adjacency)
+
+    if parallel and n > 1:
+        dist, parent = dijkstra_rows_parallel(adjacency, dist_typecode, parent_typecode, workers, chunk_size,
+                                              progress=progress, limits=limits)
+        return AllPairsResult(n, dist, parent, "parent")
+
+    dist = array(dist_typecode)
+    parent = array(parent_typecode)
+    for start in range(n):
+        row_dist, row_parent = _dijkstra_heap(adjacency, start, limit=limits[start])
+        dist.extend(row_dist)
+        parent.extend(row_parent)
+        if progress is not None:
+            progress(start + 1, n)
+
+    return AllPairsResult(n, dist, parent, "parent")
@@ -0,0 +1,615 @@
+"""
+Моделирование протоколов маршрутизации: вектор расстояний (по образцу RIP) и состояние каналов
+(по образцу OSPF). Протоколы работают без интерфейса, считают раунды до сходимости, число и
+объём сообщений и умеют сходиться заново после изменения весов рёбер модели.
+
+Таблицы всех маршрутизаторов хранятся в плоских массивах V x V: distance[u * V + d] - длина
+маршрута из u в d, next_hop[u * V + d] - следующий маршрутизатор (u для самого u, -1 - нет маршрута).
+"""
+import heapq
+import math
+from array import array
+
+from .algorithms import multi_source_dijkstra
+
+# Размеры сообщений в байтах: заголовок и запись RIPv2, заголовок LSA и описание канала OSPF
+DV_HEADER_BYTES = 4
+DV_ENTRY_BYTES = 20
+LSA_HEADER_BYTES = 24
+LSA_LINK_BYTES = 12
+
+MODES = ("sync", "event")
+HORIZONS = ("none", "split_horizon", "poison_reverse")
+
+
+class ConvergenceReport:
+    """
+    Итоги одной сходимости протокола.
+
+    Attributes:
+        rounds: Число раундов обмена (для событийного режима - длина самой длинной цепочки сообщений).
+        time: Модельное время сходимости (задержка канала - вес ребра; в синхронном режиме равно rounds).
+        messages: Число переданных сообщений.
+        bytes: Объём переданных сообщений.
+        changes: Число изменённых записей таблиц.
+    """
+    __slots__ = ("protocol", "mode", "rounds", "time", "messages", "bytes", "changes")
+
+    def __init__(self, protocol, mode):
+        self.protocol = protocol
+        self.mode = mode
+        self.rounds = 0
+        self.time = 0.0
+        self.messages = 0
+        self.bytes = 0
+        self.changes = 0
+
+    def summary(self):
+        return {
+            "protocol": self.protocol,
+            "mode": self.mode,
+            "rounds": self.rounds,
+            "time": self.time,
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "changes": self.changes,
+        }
+
+
+class RoutingProtocol:
+    """
+    Базовый класс протокола маршрутизации: каналы маршрутизаторов и их таблицы.
+
+    Каналы берутся из модели графа: links[u][v] - стоимость канала u -> v (по нему u может
+    отправить пакет v), listeners[v] - маршрутизаторы, которые могут отправлять пакеты через v.
+    """
+    name = ""
+
+    def __init__(self, model, undirected=True, mode="sync"):
+        """
+        Args:
+            model: Модель графа (GraphModel).
+            undirected: Если True, каналы двунаправленные.
+            mode: "sync" - синхронные раунды обмена, "event" - событийная модель с задержками каналов.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим {mode!r}; допустимы: {', '.join(MODES)}")
+
+        self.undirected = undirected
+        self.mode = mode
+        self.n = 0
+        self.links = []
+        self.listeners = []
+        self.distance = array("d")
+        self.next_hop = array("i")
+        self._load(model)
+
+    def __len__(self):
+        return self.n
+
+    def _read_links(self, model):
+        links = [{} for _ in range(len(model))]
+        for u, edges in enumerate(model.adjacency(undirected=self.undirected)):
+            for v, weight in edges:
+                if v != u:
+                    links[u][v] = min(weight, links[u].get(v, weight))
+        return links
+
+    def _load(self, model):
+        """
+        Сбрасывает таблицы: каждый маршрутизатор знает только себя.
+        """
+        self.links = self._read_links(model)
+        self.n = len(self.links)
+        self._index_listeners()
+        self._reset_tables()
+
+    def _reset_tables(self):
+        n = self.n
+        self.distance = array("d", [math.inf]) * (n * n)
+        self.next_hop = array("i", [-1]) * (n * n)
+        for u in range(n):
+            self.distance[u * n + u] = 0.0
+            self.next_hop[u * n + u] = u
+
+    def _index_listeners(self):
+        self.listeners = [[] for _ in range(self.n)]
+        for u, row in enumerate(self.links):
+            for v in row:
+                self.listeners[v].append(u)
+
+    def run(self):
+        """
+        Запускает протокол с пустых таблиц и доводит его до сходимости.
+
+        Returns:
+            ConvergenceReport.
+        """
+        raise NotImplementedError
+
+    def update(self, model):
+        """
+        Применяет изменения каналов модели (например, после change_edge_weight) и доводит
+        протокол до новой сходимости. Если изменилось число вершин, протокол запускается заново.
+
+        Returns:
+            ConvergenceReport.
+        """
+        if len(model) != self.n:
+            self._load(model)
+            return self.run()
+
+        links = self._read_links(model)
+        changed = []
+        for u in range(self.n):
+            old, new = self.links[u], links[u]
+            for v in old.keys() | new.keys():
+                if old.get(v) != new.get(v):
+                    changed.append((u, v, old.get(v), new.get(v)))
+
+        self.links = links
+        self._index_listeners()
+        return self._reconverge(changed)
+
+    def _reconverge(self, changed):
+        raise NotImplementedError
+
+    def route(self, source, destination):
+        """
+        Восстанавливает маршрут по таблицам, переходя от узла к узлу по next_hop.
+
+        Returns:
+            Список индексов вершин (пустой, если маршрута нет или таблицы образуют петлю).
+        """
+        n = self.n
+        path = [source]
+        while path[-1] != destination:
+            hop = self.next_hop[path[-1] * n + destination]
+            if hop == -1 or len(path) > n:
+                return []
+            path.append(hop)
+        return path
+
+    def tables(self, names):
+        """
+        Возвращает таблицы маршрутизаторов в виде, который читает окно таблиц маршрутизации.
+
+        Args:
+            names: Имена вершин по индексам.
+
+        Returns:
+            Dict: {узел: {назначение: {"next_hop": узел, "edge_weight": вес канала, "distance": длина маршрута}}}.
+        """
+        n = self.n
+        tables = {}
+        for u in range(n):
+            table = {}
+            for d in range(n):
+                hop = self.next_hop[u * n + d]
+                if d == u or hop == -1:
+                    continue
+                table[names[d]] = {
+                    "next_hop": names[hop],
+                    "edge_weight": self.links[u][hop],
+                    "distance": self.distance[u * n + d],
+                }
+            if table:
+                tables[names[u]] = table
+        return tables
+
+
+class DistanceVector(RoutingProtocol):
+    """
+    Протокол вектора расстояний (распределённый алгоритм Беллмана - Форда).
+
+    Маршрутизатор рассылает изменившиеся записи своей таблицы тем, кто может слать через него
+    пакеты. Получатель принимает запись, если она короче его маршрута или пришла от его текущего
+    следующего узла. Если маршрут от следующего узла ухудшился, получатель запрашивает эту запись
+    у остальных соседей (запрос RIP), чтобы найти обходной путь. Расщепление горизонта не сообщает
+    соседу маршруты, ведущие через него, отравление обратного пути сообщает их с бесконечной длиной.
+    Бесконечность - сумма стоимостей всех каналов плюс один, поэтому счёт до бесконечности конечен.
+    """
+    name = "Вектор расстояний"
+
+    def __init__(self, model, undirected=True, mode="sync", horizon="poison_reverse", update_delay=0.0):
+        """
+        Args:
+            model: Модель графа (GraphModel).
+            undirected: Если True, каналы двунаправленные.
+            mode: "sync" или "event".
+            horizon: "none", "split_horizon" или "poison_reverse".
+            update_delay: Задержка триггерного обновления в событийном режиме (изменения,
+                накопленные за это время, отправляются одним сообщением).
+        """
+        if horizon not in HORIZONS:
+            raise ValueError(f"Неизвестный режим горизонта {horizon!r}; допустимы: {', '.join(HORIZONS)}")
+        self.horizon = horizon
+        self.update_delay = update_delay
+        self.infinity = math.inf
+        super().__init__(model, undirected, mode)
+
+    def _load(self, model):
+        super()._load(model)
+        self._update_infinity()
+
+    def _update_infinity(self):
+        self.infinity = sum(sum(row.values()) for row in self.links) + 1
+
+    def run(self):
+        self._reset_tables()
+        # Каждый маршрутизатор сообщает о себе
+        pending = {u: ({u}, {}, {}) for u in range(self.n)}
+        return self._exchange(pending)
+
+    def _reconverge(self, changed):
+        self._update_infinity()
+        n = self.n
+        pending = {}
+
+        for u, v, old, new in changed:
+            # Маршруты через изменившийся канал пересчитываются на месте
+            base = u * n
+            worse = set()
+            for d in range(n):
+                k = base + d
+                if d == u or self.next_hop[k] != v:
+                    continue
+                value = math.inf if new is None else self.distance[k] - old + new
+                if value >= self.infinity:
+                    value = math.inf
+                if value != self.distance[k]:
+                    if value > self.distance[k]:
+                        worse.add(d)
+                    self.distance[k] = value
+                    if value == math.inf:
+                        self.next_hop[k] = -1
+                    self._pending(pending, u)[0].add(d)
+
+            if worse:
+                self._request_alternatives(pending, u, worse)
+            # По новому или подешевевшему каналу запрашивается вся таблица соседа
+            if new is not None and (old is None or new < old):
+                self._pending(pending, u)[2].setdefault(v, set()).add(None)
+
+        return self._exchange(pending)
+
+    @staticmethod
+    def _pending(pending, u):
+        """
+        Возвращает неотправленные изменения маршрутизатора u: (назначения для рассылки,
+        {сосед: назначения в ответ на его запрос}, {сосед: запрашиваемые назначения}).
+        """
+        entry = pending.get(u)
+        if entry is None:
+            entry = pending[u] = (set(), {}, {})
+        return entry
+
+    def _request_alternatives(self, pending, u, destinations, exclude=-1):
+        requests = self._pending(pending, u)[2]
+        for v in self.links[u]:
+            if v != exclude:
+                requests.setdefault(v, set()).update(destinations)
+
+    def _advertise(self, u, w, destinations):
+        """
+        Формирует записи таблицы u для соседа w с учётом режима горизонта.
+
+        Returns:
+            Список пар (назначение, длина маршрута).
+        """
+        n = self.n
+        base = u * n
+        if None in destinations:
+            destinations = range(n)
+
+        entries = []
+        for d in destinations:
+            k = base + d
+            if self.next_hop[k] == w:
+                if self.horizon == "split_horizon":
+                    continue
+                if self.horizon == "poison_reverse":
+                    entries.append((d, math.inf))
+                    continue
+            entries.append((d, self.distance[k]))
+        return entries
+
+    def _receive(self, w, x, entries):
+        """
+        Обрабатывает записи, пришедшие маршрутизатору w от соседа x.
+
+        Returns:
+            (изменившиеся назначения, назначения, маршрут к которым ухудшился).
+        """
+        cost = self.links[w].get(x)
+        changed = []
+        worse = []
+        if cost is None:
+            return changed, worse
+
+        n = self.n
+        base = w * n
+        distance = self.distance
+        next_hop = self.next_hop
+        infinity = self.infinity
+
+        for d, metric in entries:
+            if d == w:
+                continue
+            value = cost + metric
+            if value >= infinity:
+                value = math.inf
+            k = base + d
+
+            if next_hop[k] == x:
+                if value != distance[k]:
+                    if value > distance[k]:
+                        worse.append(d)
+                    distance[k] = value
+                    if value == math.inf:
+                        next_hop[k] = -1
+                    changed.append(d)
+            elif value < distance[k]:
+                distance[k] = value
+                next_hop[k] = x
+                changed.append(d)
+
+        return changed, worse
+
+    def _outbox(self, u, entry):
+        """
+        Упаковывает изменения маршрутизатора u в сообщения: не больше одного обновления
+        и одного запроса на каждого соседа.
+
+        Returns:
+            Список сообщений (отправитель, получатель, вид, содержимое).
+        """
+        broadcast, replies, requests = entry
+        messages = []
+
+        if broadcast:
+            for w in self.listeners[u]:
+                extra = replies.pop(w, None)
+                entries = self._advertise(u, w, broadcast | extra if extra else broadcast)
+                if entries:
+                    messages.append((u, w, "update", entries))
+
+        for w, destinations in replies.items():
+            entries = self._advertise(u, w, destinations)
+            if entries:
+                messages.append((u, w, "update", entries))
+
+        for x, destinations in requests.items():
+            messages.append((u, x, "request", destinations))
+
+        return messages
+
+    def _handle(self, receiver, sender, kind, payload, pending, report):
+        if kind == "request":
+            self._pending(pending, receiver)[1].setdefault(sender, set()).update(payload)
+            return
+
+        changed, worse = self._receive(receiver, sender, payload)
+        report.changes += len(changed)
+        if changed:
+            self._pending(pending, receiver)[0].update(changed)
+        if worse:
+            self._request_alternatives(pending, receiver, worse, exclude=sender)
+
+    def _count(self, kind, payload, report):
+        report.messages += 1
+        if kind == "request" and None in payload:
+            payload = range(self.n)
+        report.bytes += DV_HEADER_BYTES + DV_ENTRY_BYTES * len(payload)
+
+    def _exchange(self, pending):
+        """
+        Доводит обмен до сходимости, начиная с неотправленных изменений pending.
+
+        Returns:
+            ConvergenceReport.
+        """
+        report = ConvergenceReport(self.name, self.mode)
+        if self.mode == "sync":
+            self._exchange_sync(pending, report)
+        else:
+            self._exchange_event(pending, report)
+        return report
+
+    def _exchange_sync(self, pending, report):
+        while pending:
+            messages = [message for u, entry in pending.items() for message in self._outbox(u, entry)]
+            if not messages:
+                break
+
+            report.rounds += 1
+            pending = {}
+            for sender, receiver, kind, payload in messages:
+                self._count(kind, payload, report)
+                self._handle(receiver, sender, kind, payload, pending, report)
+
+        report.time = float(report.rounds)
+
+    def _exchange_event(self, pending, report):
+        """
+        Событийный обмен: сообщение идёт по каналу с задержкой, равной его стоимости. Изменения,
+        накопленные маршрутизатором за update_delay, уходят одним сообщением на соседа.
+        """
+        events = []
+        sequence = 0
+        # Маршрутизаторы, отправка изменений которых уже запланирована, и глубина цепочки их изменений
+        scheduled = {}
+
+        def schedule_flush(time, u, depth):
+            nonlocal sequence
+            if u in scheduled:
+                scheduled[u] = max(scheduled[u], depth)
+                return
+            scheduled[u] = depth
+            heapq.heappush(events, (time, sequence, "flush", u, None, None))
+            sequence += 1
+
+        for u in list(pending):
+            schedule_flush(0.0, u, 0)
+
+        while events:
+            now, _, kind, u, sender, payload = heapq.heappop(events)
+
+            if kind == "flush":
+                depth = scheduled.pop(u)
+                entry = pending.pop(u, None)
+                for _, receiver, message_kind, content in self._outbox(u, entry) if entry else ():
+                    # Запрос идёт по каналу u -> receiver, обновление - по каналу, которым пользуется получатель
+                    delay = self.links[u][receiver] if message_kind == "request" else self.links[receiver][u]
+                    heapq.heappush(events, (now + delay, sequence, message_kind, receiver, u, (content, depth + 1)))
+                    sequence += 1
+                continue
+
+            content, depth = payload
+            self._count(kind, content, report)
+            report.rounds = max(report.rounds, depth)
+            report.time = now
+
+            self._handle(u, sender, kind, content, pending, report)
+            if u in pending:
+                schedule_flush(now + self.update_delay, u, depth)
+
+
+class LinkState(RoutingProtocol):
+    """
+    Протокол состояния каналов.
+
+    Каждый маршрутизатор рассылает лавиной LSA - список своих каналов с порядковым номером.
+    Получатель сохраняет LSA, если его номер больше сохранённого, и пересылает его всем соседям,
+    кроме отправителя; копии с известным номером отбрасываются. Затем каждый маршрутизатор
+    строит по базе LSA дерево кратчайших путей (алгоритм Дейкстры) и заполняет таблицу.
+    Модель считает базы всех маршрутизаторов одинаковыми, что верно для связного графа
+    с двунаправленными каналами.
+    """
+    name = "Состояние каналов"
+
+    def __init__(self, model, undirected=True, mode="sync", parallel=False):
+        """
+        Args:
+            model: Модель графа (GraphModel).
+            undirected: Если True, каналы двунаправленные.
+            mode: "sync" или "event".
+            parallel: Если True, деревья кратчайших путей строятся в пуле процессов.
+        """
+        self.parallel = parallel
+        self.sequence = array("i")
+        self.received = array("i")
+        super().__init__(model, undirected, mode)
+
+    def _load(self, model):
+        super()._load(model)
+        # sequence[o] - номер последнего LSA маршрутизатора o, received[u * V + o] - номер LSA o в базе u
+        self.sequence = array("i", [0]) * self.n
+        self.received = array("i", [0]) * (self.n * self.n)
+
+    def run(self):
+        return self._reconverge_origins(range(self.n))
+
+    def _reconverge(self, changed):
+        origins = {u for u, _, _, _ in changed}
+        return self._reconverge_origins(sorted(origins))
+
+    def _reconverge_origins(self, origins):
+        report = ConvergenceReport(self.name, self.mode)
+        for origin in origins:
+            self.sequence[origin] += 1
+            size = LSA_HEADER_BYTES + LSA_LINK_BYTES * len(self.links[origin])
+            if self.mode == "sync":
+                messages, rounds, time = self._flood_sync(origin)
+            else:
+                messages, rounds, time = self._flood_event(origin)
+            report.messages += messages
+            report.bytes += messages * size
+            report.rounds = max(report.rounds, rounds)
+            report.time = max(report.time, time)
+
+        if origins:
+            report.changes = self._compute_tables()
+        return report
+
+    def _accept(self, u, origin):
+        k = u * self.n + origin
+        if self.received[k] >= self.sequence[origin]:
+            return False
+        self.received[k] = self.sequence[origin]
+        return True
+
+    def _flood_sync(self, origin):
+        """
+        Рассылает LSA синхронными раундами: за раунд LSA проходит один канал.
+
+        Returns:
+            (число сообщений, число раундов, модельное время).
+        """
+        self._accept(origin, origin)
+        frontier = [(origin, -1)]
+        messages = 0
+        rounds = 0
+
+        while frontier:
+            following = []
+            for u, came_from in frontier:
+                for v in self.links[u]:
+                    if v == came_from:
+                        continue
+                    messages += 1
+                    if self._accept(v, origin):
+                        following.append((v, u))
+            if following:
+                rounds += 1
+            frontier = following
+
+        return messages, rounds, float(rounds)
+
+    def _flood_event(self, origin):
+        """
+        Рассылает LSA с задержками каналов: LSA приходит в узел первым по самому быстрому пути.
+
+        Returns:
+            (число сообщений, длина самой длинной цепочки пересылок, модельное время).
+        """
+        events = [(0.0, 0, origin, -1)]
+        messages = 0
+        rounds = 0
+        time = 0.0
+
+        while events:
+            now, depth, u, came_from = heapq.heappop(events)
+            # Копия, пришедшая позже первой, отбрасывается
+            if not self._accept(u, origin):
+                continue
+            rounds = max(rounds, depth)
+            time = now
+            for v in self.links[u]:
+                if v != came_from:
+                    messages += 1
+                    heapq.heappush(events, (now + self.links[u][v], depth + 1, v, u))
+
+        return messages, rounds, time
+
+    def _compute_tables(self):
+        """
+        Строит таблицы всех маршрутизаторов по базе LSA.
+
+        Returns:
+            Число изменённых записей.
+        """
+        adjacency = [list(row.items()) for row in self.links]
+        distance, next_hop = multi_source_dijkstra(None, range(self.n), parallel=self.parallel, adjacency=adjacency)
+
+        changes = sum(1 for k in range(len(next_hop))
+                      if next_hop[k] != self.next_hop[k] or distance[k] != self.distance[k])
+        self.distance = distance
+        self.next_hop = next_hop
+        return changes
+
+
+PROTOCOLS = {
+    "distance_vector": DistanceVector,
+    "link_state": LinkState,
+}
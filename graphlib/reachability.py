@@ -0,0 +1,182 @@
+from itertools import compress
+
+# Перевод двоичной записи числа в байты 0/1 (селекторы для itertools.compress)
+_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class ReachabilityIndex:
+    """
+    Индекс достижимости: отвечает на вопрос «достижима ли v из u?» за O(1).
+
+    Граф разбивается на компоненты сильной связности (итеративный алгоритм Тарьяна), а для
+    конденсации (ориентированного ациклического графа компонент) строится транзитивное замыкание:
+    reach[c] - целое число, i-й бит которого установлен, если из компоненты c достижима компонента i.
+
+    Добавление ребра и вершины обновляет замыкание без перестроения; удаление ребра требует
+    полного перестроения (см. GraphModel.reachability, где оно выполняется лениво).
+    """
+
+    def __init__(self, adjacency, undirected=False):
+        """
+        Args:
+            adjacency: Списки смежности графа (пары (v, вес) или индексы v).
+            undirected: Если True, каждое ребро учитывается в обоих направлениях.
+        """
+        self.undirected = undirected
+        self.successors = [[] for _ in adjacency]
+
+        for u, edges in enumerate(adjacency):
+            for edge in edges:
+                v = edge[0] if isinstance(edge, tuple) else edge
+                self.successors[u].append(v)
+                if undirected:
+                    self.successors[v].append(u)
+
+        self.component = []
+        self.reach = []
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.successors)
+
+    @property
+    def component_count(self):
+        """
+        Количество компонент сильной связности на момент последнего перестроения.
+        """
+        return len(self.reach)
+
+    def rebuild(self):
+        """
+        Полностью перестраивает компоненты и замыкание за O(V + E) операций над битовыми масками.
+        """
+        self.component = self._strongly_connected_components(self.successors)
+        self.reach = [0] * (max(self.component) + 1 if self.component else 0)
+
+        # Тарьян нумерует компоненты в обратном топологическом порядке: все преемники компоненты c
+        # имеют меньшие номера, поэтому их замыкания уже готовы
+        members = [[] for _ in self.reach]
+        for v, c in enumerate(self.component):
+            members[c].append(v)
+
+        for c, vertices in enumerate(members):
+            reach = 1 << c
+            for u in vertices:
+                for v in self.successors[u]:
+                    reach |= self.reach[self.component[v]]
+            self.reach[c] = reach
+
+    @staticmethod
+    def _strongly_connected_components(successors):
+        """
+        Итеративный алгоритм Тарьяна (без рекурсии, поэтому не ограничен глубиной стека).
+
+        Returns:
+            component: component[v] - номер компоненты вершины v (в обратном топологическом порядке).
+        """
+        n = len(successors)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        component = [-1] * n
+        stack = []
+        counter = 0
+        components = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+
+            work = [(root, 0)]
+            while work:
+                u, position = work.pop()
+                if position == 0:
+                    index[u] = low[u] = counter
+                    counter += 1
+                    stack.append(u)
+                    on_stack[u] = True
+
+                edges = successors[u]
+                while position < len(edges):
+                    v = edges[position]
+                    position += 1
+                    if index[v] == -1:
+                        work.append((u, position))
+                        work.append((v, 0))
+                        break
+                    if on_stack[v]:
+                        low[u] = min(low[u], index[v])
+                else:
+                    if low[u] == index[u]:
+                        while True:
+                            v = stack.pop()
+                            on_stack[v] = False
+                            component[v] = components
+                            if v == u:
+                                break
+                        components += 1
+
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[u])
+
+        return component
+
+    def can_reach(self, u, v):
+        """
+        Проверяет, достижима ли вершина v из вершины u (вершина достижима из самой себя).
+        """
+        return (self.reach[self.component[u]] >> self.component[v]) & 1 == 1
+
+    def reachable_from(self, u):
+        """
+        Возвращает список вершин, достижимых из u.
+        """
+        reach = self.reach[self.component[u]]
+        return [v for v, c in enumerate(self.component) if (reach >> c) & 1]
+
+    def reachable_counts(self):
+        """
+        Возвращает для каждой вершины число достижимых из неё вершин (включая её саму).
+        """
+        sizes = [0] * len(self.reach)
+        for c in self.component:
+            sizes[c] += 1
+
+        # Биты замыкания - номера компонент, младший бит первым
+        counts = [sum(compress(sizes, bin(reach)[:1:-1].encode().translate(_BITS))) for reach in self.reach]
+        return [counts[c] for c in self.component]
+
+    def add_vertex(self):
+        """
+        Добавляет изолированную вершину с новой компонентой.
+
+        Returns:
+            Индекс новой вершины.
+        """
+        self.successors.append([])
+        self.component.append(len(self.reach))
+        self.reach.append(1 << len(self.reach))
+        return len(self.successors) - 1
+
+    def add_edge(self, u, v):
+        """
+        Добавляет ребро u -> v и обновляет замыкание: всё, что достигало u, теперь достигает
+        всего, что достижимо из v. Компоненты, слившиеся в цикл, не перенумеровываются - их
+        замыкания просто становятся одинаковыми, поэтому ответы can_reach остаются точными.
+        """
+        self.successors[u].append(v)
+        if self.undirected:
+            self.successors[v].append(u)
+            self._link(v, u)
+        self._link(u, v)
+
+    def _link(self, u, v):
+        cu, cv = self.component[u], self.component[v]
+        if (self.reach[cu] >> cv) & 1:
+            return
+
+        added = self.reach[cv]
+        for c, reach in enumerate(self.reach):
+            if (reach >> cu) & 1:
+                self.reach[c] = reach | added
@@ -0,0 +1,574 @@
+"""
+Алгоритмы маршрутизации без графического интерфейса. Работают со списками смежности модели
+графа и подходят для сетей из десятков тысяч узлов.
+"""
+import random
+from array import array
+from collections import deque
+
+from .reachability import ReachabilityIndex
+
+
+class FloodResult:
+    """
+    Результат лавинной рассылки одного пакета.
+    """
+    __slots__ = ("sequence", "path", "transmissions", "reached")
+
+    def __init__(self, sequence, path, transmissions, reached):
+        self.sequence = sequence
+        self.path = path
+        self.transmissions = transmissions
+        self.reached = reached
+
+    @property
+    def delivered(self):
+        return bool(self.path)
+
+
+class Flooder:
+    """
+    Лавинная маршрутизация с подавлением дубликатов по порядковым номерам.
+
+    Индекс соседей строится один раз. Каждый узел помнит последний порядковый номер пакета
+    от каждого источника и отбрасывает копии с уже виденным номером, поэтому между пакетами
+    ничего не очищается. Фронт рассылки - очередь deque, путь восстанавливается по указателям
+    на родителя (без копирования путей). Копия пакета живёт не больше ttl пересылок.
+
+    Правило пересылки (forward) используется и стратегией лавинной маршрутизации дискретно-событийной
+    модели (graphlib.simulation), где копии разных пакетов идут по сети одновременно.
+    """
+
+    def __init__(self, adjacency, undirected=False, reachability=None):
+        """
+        Args:
+            adjacency: Списки смежности графа (пары (v, вес) или индексы v).
+            undirected: Если True, каналы двунаправленные.
+            reachability: Индекс достижимости этой сети (по умолчанию строится по adjacency).
+        """
+        n = len(adjacency)
+        self.neighbours = [[] for _ in range(n)]
+        self.reachability = ReachabilityIndex(adjacency, undirected) if reachability is None else reachability
+
+        for u, edges in enumerate(adjacency):
+            for edge in edges:
+                v = edge[0] if isinstance(edge, tuple) else edge
+                self.neighbours[u].append(v)
+                if undirected:
+                    self.neighbours[v].append(u)
+
+        self.parent = array("i", [-1]) * n
+        # last_seen[источник][узел] - последний порядковый номер пакета источника, принятый узлом
+        self.last_seen = {}
+        self.sequence = {}
+
+        self.packets = 0
+        self.delivered = 0
+        self.transmissions = 0
+
+    def __len__(self):
+        return len(self.neighbours)
+
+    @property
+    def transmissions_per_delivered(self):
+        """
+        Среднее число передач по каналам на один доставленный пакет.
+        """
+        return self.transmissions / self.delivered if self.delivered else float('inf')
+
+    def forward(self, node, came_from):
+        """
+        Возвращает соседей, которым узел node пересылает копию пакета, пришедшую от came_from
+        (-1 - пакет отправлен из node): всех, кроме came_from.
+        """
+        return [v for v in self.neighbours[node] if v != came_from]
+
+    def send(self, source, destination, ttl=None):
+        """
+        Рассылает пакет из source. Узел назначения принимает пакет и дальше его не пересылает,
+        остальные узлы пересылают его всем соседям, кроме того, от кого он пришёл. Пакет
+        к недостижимому назначению не рассылается.
+
+        Args:
+            source: Индекс узла-источника.
+            destination: Индекс узла назначения.
+            ttl: Максимальное число пересылок копии (по умолчанию - число узлов минус один).
+
+        Returns:
+            FloodResult: путь первой дошедшей копии (пустой, если пакет не доставлен),
+            число передач и число узлов, получивших пакет.
+        """
+        n = len(self.neighbours)
+        ttl = n - 1 if ttl is None else ttl
+
+        sequence = self.sequence.get(source, -1) + 1
+        self.sequence[source] = sequence
+        seen = self.last_seen.get(source)
+        if seen is None:
+            seen = self.last_seen[source] = array("q", [-1]) * n
+
+        if not self.reachability.can_reach(source, destination):
+            self.packets += 1
+            return FloodResult(sequence, [], 0, 1)
+
+        forward = self.forward
+        parent = self.parent
+        seen[source] = sequence
+        parent[source] = -1
+        frontier = deque(((source, ttl),))
+        transmissions = 0
+        reached = 1
+
+        while frontier:
+            u, hops_left = frontier.popleft()
+            if u == destination or hops_left == 0:
+                continue
+
+            for v in forward(u, parent[u]):
+                transmissions += 1
+                if seen[v] == sequence:
+                    continue
+                seen[v] = sequence
+                parent[v] = u
+                reached += 1
+                frontier.append((v, hops_left - 1))
+
+        path = []
+        if seen[destination] == sequence:
+            current = destination
+            while current != -1:
+                path.append(current)
+                current = parent[current]
+            path.reverse()
+
+        self.packets += 1
+        self.transmissions += transmissions
+        if path:
+            self.delivered += 1
+
+        return FloodResult(sequence, path, transmissions, reached)
+
+
+class RandomWalkResult:
+    """
+    Результат пакетной генерации случайных маршрутов.
+
+    Attributes:
+        hops: hops[w] - длина маршрута w в пересылках (-1, если маршрут не найден).
+        paths: Списки вершин маршрутов (None для ненайденных) или None, если пути не сохранялись.
+        transmissions: Общее число пересылок, включая попытки, завершившиеся тупиком.
+    """
+    __slots__ = ("hops", "paths", "transmissions")
+
+    def __init__(self, hops, paths, transmissions):
+        self.hops = hops
+        self.paths = paths
+        self.transmissions = transmissions
+
+    @property
+    def delivered(self):
+        return sum(1 for hops in self.hops if hops >= 0)
+
+    @property
+    def gave_up(self):
+        return len(self.hops) - self.delivered
+
+
+class RandomWalker:
+    """
+    Случайная маршрутизация: пакет уходит к случайному соседу, ещё не посещённому на этом маршруте.
+
+    Индекс соседей строится один раз и используется всеми маршрутами. Посещённые вершины
+    отмечаются номером маршрута в общем массиве меток, поэтому между маршрутами ничего не
+    очищается. Сосед выбирается случайной пробой, и список непосещённых соседей строится
+    только после промаха. Генератор случайных чисел задаётся зерном для воспроизводимости.
+    """
+
+    # Число случайных проб перед построением списка непосещённых соседей
+    PROBES = 2
+
+    def __init__(self, adjacency, undirected=False, seed=None, reachability=None):
+        """
+        Args:
+            adjacency: Списки смежности графа (пары (v, вес) или индексы v).
+            undirected: Если True, каналы двунаправленные.
+            seed: Зерно генератора случайных чисел.
+            reachability: Индекс достижимости этой сети (по умолчанию строится по adjacency).
+        """
+        self.reachability = ReachabilityIndex(adjacency, undirected) if reachability is None else reachability
+        neighbours = [set() for _ in adjacency]
+
+        for u, edges in enumerate(adjacency):
+            for edge in edges:
+                v = edge[0] if isinstance(edge, tuple) else edge
+                if v != u:
+                    neighbours[u].add(v)
+                    if undirected:
+                        neighbours[v].add(u)
+
+        self.neighbours = [tuple(sorted(row)) for row in neighbours]
+        self.rng = random.Random(seed)
+        # visited[v] == метка маршрута, если маршрут уже проходил через v
+        self.visited = array("q", [-1]) * len(self.neighbours)
+        self.mark = -1
+
+    def __len__(self):
+        return len(self.neighbours)
+
+    def walk(self, source, destination, count=1, max_hops=None, max_restarts=0, avoid_visited=True,
+             keep_paths=True):
+        """
+        Строит count случайных маршрутов из source в destination. Если destination недостижим,
+        маршруты не строятся вовсе (без max_restarts x max_hops случайных шагов на пакет).
+
+        Args:
+            source: Индекс начальной вершины.
+            destination: Индекс конечной вершины.
+            count: Количество маршрутов (пакетов).
+            max_hops: Максимальная длина маршрута (по умолчанию - число вершин).
+            max_restarts: Сколько раз маршрут начинается заново из source, зайдя в тупик или превысив max_hops.
+            avoid_visited: Если True, маршрут не возвращается в уже посещённые вершины.
+            keep_paths: Если False, сохраняются только длины маршрутов (экономия памяти на больших прогонах).
+
+        Returns:
+            RandomWalkResult.
+        """
+        neighbours = self.neighbours
+        visited = self.visited
+        random_value = self.rng.random
+        probes = self.PROBES
+        max_hops = len(neighbours) if max_hops is None else max_hops
+
+        result_hops = array("i", [-1]) * count
+        paths = [None] * count if keep_paths else None
+        transmissions = 0
+
+        if not self.reachability.can_reach(source, destination):
+            return RandomWalkResult(result_hops, paths, transmissions)
+
+        for w in range(count):
+            if source == destination:
+                result_hops[w] = 0
+                if keep_paths:
+                    paths[w] = [source]
+                continue
+
+            for _ in range(max_restarts + 1):
+                self.mark += 1
+                mark = self.mark
+                visited[source] = mark
+                path = [source] if keep_paths else None
+                u = source
+                hops = 0
+                delivered = False
+
+                while hops < max_hops:
+                    row = neighbours[u]
+                    if not row:
+                        break
+
+                    v = row[int(random_value() * len(row))]
+                    if avoid_visited and visited[v] == mark:
+                        for _ in range(probes - 1):
+                            v = row[int(random_value() * len(row))]
+                            if visited[v] != mark:
+                                break
+                        else:
+                            candidates = [x for x in row if visited[x] != mark]
+                            if not candidates:
+                                break
+                            v = candidates[int(random_value() * len(candidates))]
+
+                    visited[v] = mark
+                    transmissions += 1
+                    hops += 1
+                    if keep_paths:
+                        path.append(v)
+                    if v == destination:
+                        delivered = True
+                        break
+                    u = v
+
+                if delivered:
+                    result_hops[w] = hops
+                    if keep_paths:
+                        paths[w] = path
+                    break
+
+        return RandomWalkResult(result_hops, paths, transmissions)
+
+
+class BackwardLearningRouter:
+    """
+    Маршрутизация по предыдущему опыту (обратное обучение).
+
+    Узел, получивший пакет от соседа p, запоминает, что источник пакета достижим через p за
+    столько же пересылок, сколько прошёл пакет. Пакет с известным назначением уходит по таблице
+    к одному соседу, с неизвестным - рассылается лавиной, и эта рассылка обучает все узлы сети.
+    Записи стареют: запись старше max_age пакетов считается забытой.
+
+    Таблица узла - три массива длины V (следующий узел, число пересылок, момент записи),
+    которые создаются при первой записи в узел.
+    """
+
+    def __init__(self, adjacency, undirected=False, max_age=None, reachability=None):
+        """
+        Args:
+            adjacency: Списки смежности графа (пары (v, вес)).
+            undirected: Если True, каналы двунаправленные.
+            max_age: Время жизни записи в пакетах (None - записи не стареют).
+            reachability: Индекс достижимости этой сети (по умолчанию строится по adjacency).
+        """
+        n = len(adjacency)
+        self.reachability = ReachabilityIndex(adjacency, undirected) if reachability is None else reachability
+        # weights[u][v] - вес канала u -> v
+        self.weights = [{} for _ in range(n)]
+
+        for u, edges in enumerate(adjacency):
+            for v, weight in edges:
+                if v != u:
+                    self.weights[u][v] = weight
+                    if undirected:
+                        self.weights[v][u] = weight
+
+        self.neighbours = [list(row) for row in self.weights]
+        self.max_age = max_age
+        # Часы - число пакетов (включая подтверждения), прошедших через сеть
+        self.clock = 0
+
+        self.next_hop = [None] * n
+        self.hops = [None] * n
+        self.learned = [None] * n
+
+        self.seen = array("q", [-1]) * n
+        self.parent = array("i", [-1]) * n
+
+        self.packets = 0
+        self.delivered = 0
+        self.flooded = 0
+        self.transmissions = 0
+
+    def __len__(self):
+        return len(self.neighbours)
+
+    def learn(self, node, destination, via, hops):
+        """
+        Обновляет запись узла node: destination достижим через соседа via за hops пересылок.
+        Запись заменяется, если её не было, она устарела, новый маршрут короче или пришёл
+        через того же соседа (тогда обновляются длина и возраст). Если канала node -> via нет,
+        узел ничему не учится.
+        """
+        if via not in self.weights[node]:
+            return
+
+        next_hop = self.next_hop[node]
+        if next_hop is None:
+            n = len(self.neighbours)
+            next_hop = self.next_hop[node] = array("i", [-1]) * n
+            self.hops[node] = array("i", [0]) * n
+            self.learned[node] = array("q", [0]) * n
+
+        current = next_hop[destination]
+        if (current == -1 or current == via or hops < self.hops[node][destination]
+                or self._expired(node, destination)):
+            next_hop[destination] = via
+            self.hops[node][destination] = hops
+            self.learned[node][destination] = self.clock
+
+    def _expired(self, node, destination):
+        return self.max_age is not None and self.clock - self.learned[node][destination] > self.max_age
+
+    def lookup(self, node, destination):
+        """
+        Возвращает следующий узел на пути из node в destination или -1, если узел его не знает.
+        """
+        next_hop = self.next_hop[node]
+        if next_hop is None or next_hop[destination] == -1 or self._expired(node, destination):
+            return -1
+        return next_hop[destination]
+
+    def send(self, source, destination, ttl=None, reply=False):
+        """
+        Передаёт пакет из source в destination, обучая узлы на его пути (к недостижимому
+        назначению пакет не отправляется).
+
+        Args:
+            source: Индекс узла-источника.
+            destination: Индекс узла назначения.
+            ttl: Максимальное число пересылок копии (по умолчанию - число узлов минус один).
+            reply: Если True, назначение отвечает подтверждением, которое обучает узлы маршруту к destination.
+
+        Returns:
+            FloodResult: путь пакета (пустой, если он не доставлен), число передач (с подтверждением)
+            и число узлов, получивших пакет.
+        """
+        if not self.reachability.can_reach(source, destination):
+            self.packets += 1
+            return FloodResult(self.clock, [], 0, 1)
+
+        path, transmissions, reached, flooded = self._forward(source, destination, ttl)
+
+        self.packets += 1
+        if flooded:
+            self.flooded += 1
+        if path:
+            self.delivered += 1
+            if reply:
+                transmissions += self._forward(destination, source, ttl)[1]
+        self.transmissions += transmissions
+
+        return FloodResult(self.clock, path, transmissions, reached)
+
+    def _forward(self, source, destination, ttl):
+        """
+        Продвигает пакет по таблицам, рассылая его лавиной из узлов, не знающих назначения.
+
+        Returns:
+            (путь, число передач, число узлов, получивших пакет, была ли лавинная рассылка).
+        """
+        n = len(self.neighbours)
+        ttl = n - 1 if ttl is None else ttl
+
+        self.clock += 1
+        mark = self.clock
+        seen = self.seen
+        parent = self.parent
+        neighbours = self.neighbours
+
+        seen[source] = mark
+        parent[source] = -1
+        frontier = deque(((source, 0),))
+        transmissions = 0
+        reached = 1
+        flooded = False
+
+        while frontier:
+            u, hops = frontier.popleft()
+            if u == destination or hops == ttl:
+                continue
+
+            next_hop = self.lookup(u, destination)
+            if next_hop != -1:
+                targets = (next_hop,)
+            else:
+                came_from = parent[u]
+                targets = [v for v in neighbours[u] if v != came_from]
+                flooded = True
+
+            for v in targets:
+                transmissions += 1
+                if seen[v] == mark:
+                    continue
+                seen[v] = mark
+                parent[v] = u
+                reached += 1
+                self.learn(v, source, u, hops + 1)
+                frontier.append((v, hops + 1))
+
+        path = []
+        if seen[destination] == mark:
+            current = destination
+            while current != -1:
+                path.append(current)
+                current = parent[current]
+            path.reverse()
+
+        return path, transmissions, reached, flooded
+
+    def coverage(self):
+        """
+        Доля пар (узел, назначение), для которых у узла есть действующая запись.
+        """
+        n = len(self.neighbours)
+        if n < 2:
+            return 1.0
+
+        known = 0
+        for node, next_hop in enumerate(self.next_hop):
+            if next_hop is not None:
+                known += sum(1 for d in range(n) if d != node and self.lookup(node, d) != -1)
+        return known / (n * (n - 1))
+
+    def tables(self, names):
+        """
+        Возвращает таблицы узлов в виде, который читает окно таблиц маршрутизации.
+
+        Args:
+            names: Имена вершин по индексам.
+
+        Returns:
+            Dict: {узел: {назначение: {"next_hop": узел, "edge_weight": вес, "hops": пересылки, "age": возраст}}}.
+        """
+        tables = {}
+        for node, next_hop in enumerate(self.next_hop):
+            if next_hop is None:
+                continue
+
+            table = {}
+            for destination, hop in enumerate(next_hop):
+                if destination == node or self.lookup(node, destination) == -1:
+                    continue
+                table[names[destination]] = {
+                    "next_hop": names[hop],
+                    "edge_weight": self.weights[node][hop],
+                    "hops": self.hops[node][destination],
+                    "age": self.clock - self.learned[node][destination],
+                }
+            if table:
+                tables[names[node]] = table
+
+        return tables
+
+
+def learning_curve(adjacency, count, undirected=False, max_age=None, reply=True, step=None, seed=None):
+    """
+    Измеряет сходимость обратного обучения: случайные пары (источник, назначение) проходят через
+    BackwardLearningRouter, и каждые step пакетов фиксируется состояние маршрутизации.
+
+    Args:
+        adjacency: Списки смежности графа (пары (v, вес)).
+        count: Количество пакетов.
+        undirected: Если True, каналы двунаправленные.
+        max_age: Время жизни записи в пакетах.
+        reply: Если True, каждый доставленный пакет подтверждается.
+        step: Интервал между замерами в пакетах (по умолчанию - десятая часть count).
+        seed: Зерно генератора случайных пар.
+
+    Returns:
+        List[dict]: Замеры с полями packets, delivered_share, flooded_share, transmissions_per_packet
+        (по пакетам интервала) и coverage (доля известных маршрутов на момент замера).
+    """
+    router = BackwardLearningRouter(adjacency, undirected, max_age)
+    n = len(router)
+    if n < 2:
+        return []
+
+    rng = random.Random(seed)
+    step = step or max(1, count // 10)
+    curve = []
+    window = [0, 0, 0, 0]  # пакеты, доставлено, разослано лавиной, передачи
+
+    for packet in range(1, count + 1):
+        source = rng.randrange(n)
+        destination = rng.randrange(n - 1)
+        if destination >= source:
+            destination += 1
+
+        flooded = router.flooded
+        result = router.send(source, destination, reply=reply)
+        window[0] += 1
+        window[1] += result.delivered
+        window[2] += router.flooded - flooded
+        window[3] += result.transmissions
+
+        if packet % step == 0 or packet == count:
+            curve.append({
+                "packets": packet,
+                "delivered_share": window[1] / window[0],
+                "flooded_share": window[2] / window[0],
+                "transmissions_per_packet": window[3] / window[0],
+                "coverage": router.coverage(),
+            })
+            window = [0, 0, 0, 0]
+
+    return curve
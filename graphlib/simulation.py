@@ -0,0 +1,745 @@
+"""
+Дискретно-событийное моделирование передачи пакетов без графического интерфейса.
+
+События хранятся в двоичной куче, упорядоченной по времени. Вес ребра - задержка
+распространения по каналу; у каждого пакета есть размер и ограничение числа пересылок (hop limit).
+Маршрут выбирается подключаемой стратегией (случайная, лавинная, по кратчайшим путям),
+а результаты накапливаются в SimulationStats: время доставки, число пересылок и потерь.
+Каналы могут терять пакеты (loss), а поверх сети может работать транспорт UDP или TCP
+(graphlib.transport), итоги которого считаются по потокам.
+
+У канала может быть пропускная способность и очередь конечной ёмкости (GraphModel.links):
+тогда пакет ждёт в очереди FIFO, передаётся за время size / bandwidth и отбрасывается,
+если очередь заполнена. По каждому каналу собираются загрузка, число пакетов и потерь.
+"""
+import heapq
+import itertools
+import math
+import random
+import statistics
+from array import array
+from collections import deque
+
+from .algorithms import _dijkstra_heap, first_hops
+from .routing import BackwardLearningRouter, Flooder, RandomWalker
+from .transport import DEFAULT_WINDOW, TRANSPORTS, Transport
+
+DEFAULT_HOP_LIMIT = 64
+DEFAULT_PACKET_SIZE = (100, 1000)
+
+# Через сколько событий run() сообщает о ходе моделирования
+PROGRESS_EVENTS = 4096
+
+# Сколько раз источник выбирает случайный маршрут заново, если прежний упёрся в тупик
+RANDOM_RESTARTS = 10
+
+
+class Packet:
+    """
+    Пакет в модели. Копии пакета при лавинной рассылке разделяют общий объект flood.
+    Сегмент транспорта (поток, тип, номер, отметка времени) хранится в segment, маршрут,
+    назначенный источником (случайная маршрутизация), - в route.
+    """
+    __slots__ = ("id", "source", "destination", "size", "hop_limit", "created", "hops", "path", "times", "flood",
+                 "segment", "route")
+
+    def __init__(self, packet_id, source, destination, size, hop_limit, created, traced=False, segment=None):
+        self.id = packet_id
+        self.source = source
+        self.destination = destination
+        self.size = size
+        self.hop_limit = hop_limit
+        self.created = created
+        self.hops = 0
+        self.path = [] if traced else None
+        self.times = [] if traced else None
+        self.flood = None
+        self.segment = segment
+        self.route = None
+
+    def copy(self):
+        """
+        Возвращает копию пакета для отправки по ещё одному каналу.
+        """
+        packet = Packet.__new__(Packet)
+        for name in Packet.__slots__:
+            setattr(packet, name, getattr(self, name))
+        if self.path is not None:
+            packet.path = self.path[:]
+            packet.times = self.times[:]
+        return packet
+
+
+class _Flood:
+    """
+    Общее состояние копий одного пакета: посещённые узлы, число копий в пути и признак доставки.
+    """
+    __slots__ = ("seen", "copies", "delivered")
+
+    def __init__(self):
+        self.seen = set()
+        self.copies = 1
+        self.delivered = False
+
+
+class _Link:
+    """
+    Состояние канала: параметры, очередь FIFO и счётчики для итогов по каналам.
+    """
+    __slots__ = ("bandwidth", "queue_limit", "queue", "busy", "busy_time", "packets", "bytes", "queued", "wait",
+                 "max_queue", "drops")
+
+    def __init__(self, bandwidth, queue_limit):
+        self.bandwidth = bandwidth
+        self.queue_limit = queue_limit
+        self.queue = deque()
+        self.busy = False
+        self.busy_time = 0.0
+        self.packets = 0
+        self.bytes = 0
+        self.queued = 0
+        self.wait = 0.0
+        self.max_queue = 0
+        self.drops = 0
+
+
+class SimulationStats:
+    """
+    Итоги моделирования. Задержки и числа пересылок доставленных пакетов хранятся
+    в типизированных массивах, поэтому миллионы пакетов занимают единицы мегабайт.
+    """
+
+    def __init__(self):
+        self.generated = 0
+        self.delivered = 0
+        self.dropped = {}
+        self.transmissions = 0
+        self.duplicates = 0
+        self.latency = array("d")
+        self.hops = array("i")
+
+    @property
+    def dropped_total(self):
+        return sum(self.dropped.values())
+
+    def drop(self, reason):
+        self.dropped[reason] = self.dropped.get(reason, 0) + 1
+
+    def summary(self):
+        """
+        Возвращает сводку: доля доставленных, задержка (среднее, медиана, 95-й перцентиль, максимум),
+        число пересылок и потери по причинам.
+        """
+        latency = sorted(self.latency)
+        result = {
+            "generated": self.generated,
+            "delivered": self.delivered,
+            "dropped": dict(self.dropped),
+            "delivery_ratio": self.delivered / self.generated if self.generated else 0.0,
+            "transmissions": self.transmissions,
+            "transmissions_per_delivered": self.transmissions / self.delivered if self.delivered else math.inf,
+            "duplicates": self.duplicates,
+        }
+
+        if latency:
+            result.update(
+                latency_mean=statistics.fmean(latency),
+                latency_median=latency[len(latency) // 2],
+                latency_p95=latency[max(0, math.ceil(0.95 * len(latency)) - 1)],
+                latency_max=latency[-1],
+                hops_mean=statistics.fmean(self.hops),
+                hops_max=max(self.hops),
+            )
+
+        return result
+
+
+class RoutingStrategy:
+    """
+    Базовый класс стратегии маршрутизации.
+
+    Метод route вызывается при приходе пакета в промежуточный узел и возвращает список
+    следующих узлов: пустой список - маршрута нет, несколько узлов - пакет копируется.
+    """
+    name = ""
+    # Стратегия рассылает копии пакета, и модель должна подавлять дубликаты
+    floods = False
+    # Стратегия учится на приходящих пакетах: модель вызывает learn при каждом приходе в узел по каналу
+    learns = False
+
+    def attach(self, simulator):
+        """
+        Подключает стратегию к модели (здесь строятся индексы, общие для всех пакетов).
+        """
+        self.simulator = simulator
+
+    def route(self, packet, node, previous):
+        raise NotImplementedError
+
+    def learn(self, packet, node, previous):
+        """
+        Обрабатывает приход пакета в узел node от соседа previous (в том числе в узел назначения).
+        """
+
+
+class RandomStrategy(RoutingStrategy):
+    """
+    Случайная маршрутизация RandomWalker: в узле-источнике строится случайный маршрут без повторных
+    посещений узлов, и пакет проходит его по каналам модели. Маршрут, упёршийся в тупик, строится
+    заново (до RANDOM_RESTARTS раз), после чего пакет отбрасывается в источнике как не имеющий
+    маршрута; маршрут длиннее hop limit обрывается в пути.
+    """
+    name = "Случайная маршрутизация"
+
+    def attach(self, simulator):
+        super().attach(simulator)
+        self.walker = RandomWalker(simulator.adjacency, reachability=simulator.reachability)
+        # Маршруты воспроизводимы зерном модели
+        self.walker.rng = simulator.rng
+
+    def route(self, packet, node, previous):
+        if previous == -1:
+            packet.route = self.walker.walk(node, packet.destination, max_restarts=RANDOM_RESTARTS).paths[0]
+            if packet.route is None:
+                return []
+        return [packet.route[packet.hops + 1]]
+
+
+class FloodingStrategy(RoutingStrategy):
+    """
+    Лавинная маршрутизация по правилу Flooder: копия пакета уходит ко всем соседям, кроме того,
+    от кого он пришёл. Каждый узел пересылает пакет не более одного раза: копии разных пакетов
+    идут по сети одновременно, поэтому дубликаты подавляет модель по множеству узлов пакета.
+    """
+    name = "Лавинная маршрутизация"
+    floods = True
+
+    def attach(self, simulator):
+        super().attach(simulator)
+        self.flooder = Flooder(simulator.adjacency, reachability=simulator.reachability)
+
+    def route(self, packet, node, previous):
+        return self.flooder.forward(node, previous)
+
+
+class ShortestPathStrategy(RoutingStrategy):
+    """
+    Маршрутизация по кратчайшим путям: следующий узел берётся из дерева кратчайших путей
+    от текущего узла (деревья строятся по мере необходимости и переиспользуются). Узлы знают
+    всю сеть заранее, поэтому стратегия служит эталоном для остальных.
+    """
+    name = "Маршрутизация по кратчайшим путям"
+
+    def attach(self, simulator):
+        super().attach(simulator)
+        self.next_hop = {}
+
+    def route(self, packet, node, previous):
+        row = self.next_hop.get(node)
+        if row is None:
+            _, parent = _dijkstra_heap(self.simulator.adjacency, node)
+            row = self.next_hop[node] = array("i", first_hops(parent, node))
+
+        hop = row[packet.destination]
+        return [] if hop == -1 else [hop]
+
+
+class BackwardLearningStrategy(RoutingStrategy):
+    """
+    Маршрутизация по предыдущему опыту (BackwardLearningRouter): узел, получивший пакет от соседа,
+    запоминает, что источник пакета достижим через этого соседа. Пакет к известному назначению
+    уходит по таблице узла, к неизвестному - рассылается лавиной. Таблицы учатся на каждой
+    пересылке, в том числе на подтверждениях транспорта, которые идут от назначения к источнику.
+    """
+    name = "Маршрутизация по предыдущему опыту"
+    floods = True
+    learns = True
+
+    def __init__(self, max_age=None):
+        """
+        Args:
+            max_age: Время жизни записи таблицы в пакетах (None - записи не стареют).
+        """
+        self.max_age = max_age
+
+    def attach(self, simulator):
+        super().attach(simulator)
+        self.router = BackwardLearningRouter(simulator.adjacency, max_age=self.max_age,
+                                             reachability=simulator.reachability)
+
+    def learn(self, packet, node, previous):
+        self.router.learn(node, packet.source, previous, packet.hops)
+
+    def route(self, packet, node, previous):
+        router = self.router
+        if previous == -1:
+            # Часы таблиц - число отправленных пакетов
+            router.clock += 1
+
+        hop = router.lookup(node, packet.destination)
+        if hop != -1:
+            return [hop]
+        return [v for v in router.neighbours[node] if v != previous]
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "flooding": FloodingStrategy,
+    "historical": BackwardLearningStrategy,
+    "shortest_path": ShortestPathStrategy,
+}
+
+
+class Simulator:
+    """
+    Дискретно-событийная модель сети.
+
+    Пример:
+        simulator = Simulator(model, "flooding", seed=1)
+        simulator.add_traffic(poisson_traffic(100000, 0, 5, rate=10.0, seed=1))
+        simulator.run()
+        print(simulator.stats.summary())
+    """
+
+    def __init__(self, model, strategy="random", seed=None, undirected=False, trace_limit=0, log=None, run=0,
+                 loss=0.0, bandwidth=None, queue_limit=None):
+        """
+        Args:
+            model: Модель графа (GraphModel). Вес ребра - задержка распространения по каналу.
+            strategy: Стратегия маршрутизации (экземпляр RoutingStrategy или ключ STRATEGIES).
+            seed: Зерно генератора случайных чисел (для воспроизводимости).
+            undirected: Если True, каналы двунаправленные.
+            trace_limit: Число первых пакетов, маршрут которых записывается в trace.
+            log: Журнал пакетов (PacketLog), в который записывается каждый завершённый пакет.
+            run: Номер запуска для записей журнала.
+            loss: Вероятность потери пакета при каждой передаче по каналу.
+            bandwidth: Пропускная способность каналов, для которых она не задана в модели (байт
+                в единицу времени, None - передача мгновенная).
+            queue_limit: Ёмкость очереди каналов, для которых она не задана в модели, в пакетах
+                (None - без ограничения, 0 - без буфера: пакет, заставший канал занятым, теряется).
+        """
+        self.model = model
+        self.adjacency = model.adjacency(undirected=undirected)
+        self.reachability = model.reachability(undirected)
+        self.delays = [dict(edges) for edges in self.adjacency]
+        self.rng = random.Random(seed)
+        self.trace_limit = trace_limit
+        self.trace = []
+        self.log = log
+        self.run_number = run
+        self.loss = loss
+        self.bandwidth = bandwidth
+        self.queue_limit = queue_limit
+        self.undirected = undirected
+        self.links = {}
+        self.stats = SimulationStats()
+        self.now = 0.0
+        self.injected = 0
+
+        self._events = []
+        self._sequence = itertools.count()
+        self._packet_ids = itertools.count()
+
+        if isinstance(strategy, str):
+            strategy = STRATEGIES[strategy]()
+        self.strategy = strategy
+        strategy.attach(self)
+
+    def schedule(self, time, handler, *args):
+        """
+        Планирует вызов handler(*args) в момент time. События с равным временем выполняются в порядке планирования.
+        """
+        heapq.heappush(self._events, (time, next(self._sequence), handler, args))
+
+    def send(self, source, destination, size=512, hop_limit=DEFAULT_HOP_LIMIT, time=None, segment=None):
+        """
+        Создаёт пакет и планирует его появление в узле source.
+
+        Args:
+            segment: Сегмент транспорта (поток, тип, номер, отметка времени); при доставке
+                пакета поток получает его через receive.
+
+        Returns:
+            Packet.
+        """
+        packet_id = next(self._packet_ids)
+        time = self.now if time is None else time
+        packet = Packet(packet_id, source, destination, size, hop_limit, time, packet_id < self.trace_limit, segment)
+        if self.strategy.floods:
+            packet.flood = _Flood()
+
+        self.stats.generated += 1
+        self.schedule(time, self._arrive, packet, source, -1)
+        return packet
+
+    def add_traffic(self, traffic, submit=None):
+        """
+        Подключает поток пакетов. Пакеты создаются по одному в момент отправки,
+        поэтому очередь событий не растёт с числом пакетов.
+
+        Args:
+            traffic: Итератор кортежей (время, источник, назначение, размер, hop limit), упорядоченный по времени.
+            submit: Функция submit(источник, назначение, размер, hop limit), которая получает данные
+                в момент отправки вместо сети (например, Transport.submit).
+        """
+        traffic = iter(traffic)
+
+        def inject_item(item):
+            time, source, destination, size, hop_limit = item
+            self.injected += 1
+            if submit is None:
+                self.send(source, destination, size, hop_limit, time)
+            else:
+                submit(source, destination, size, hop_limit)
+            following = next(traffic, None)
+            if following is not None:
+                self.schedule(following[0], inject_item, following)
+
+        first = next(traffic, None)
+        if first is not None:
+            self.schedule(first[0], inject_item, first)
+
+    def run(self, until=None, progress=None):
+        """
+        Обрабатывает события до опустошения очереди или до момента until.
+
+        Args:
+            until: Момент модельного времени, на котором моделирование останавливается.
+            progress: Функция progress(injected), вызываемая каждые PROGRESS_EVENTS событий
+                с числом отправленных элементов трафика (см. add_traffic). Исключение из неё
+                прерывает моделирование.
+
+        Returns:
+            SimulationStats.
+        """
+        events = self._events
+        processed = 0
+        while events:
+            if until is not None and events[0][0] > until:
+                self.now = until
+                break
+            self.now, _, handler, args = heapq.heappop(events)
+            handler(*args)
+
+            processed += 1
+            if progress is not None and processed % PROGRESS_EVENTS == 0:
+                progress(self.injected)
+
+        return self.stats
+
+    def link(self, u, v):
+        """
+        Возвращает состояние канала u -> v, создавая его при первой передаче. Параметры берутся
+        из GraphModel.links (для неориентированной сети - и из обратного ребра); незаданный параметр
+        заменяется общим bandwidth или queue_limit модели по отдельности. Каналы дуплексные:
+        у каждого направления своя очередь.
+        """
+        link = self.links.get((u, v))
+        if link is None:
+            links = self.model.links
+            bandwidth, queue_limit = links.get((u, v)) or (self.undirected and links.get((v, u))) or (None, None)
+            if bandwidth is None:
+                bandwidth = self.bandwidth
+            if queue_limit is None:
+                queue_limit = self.queue_limit
+            link = self.links[(u, v)] = _Link(bandwidth, queue_limit)
+        return link
+
+    def transmit(self, packet, u, v):
+        """
+        Передаёт пакет по каналу u -> v. Канал без пропускной способности передаёт пакет сразу;
+        у остальных пакет ждёт в очереди, пока канал занят, и отбрасывается, если очередь полна.
+        """
+        link = self.links.get((u, v)) or self.link(u, v)
+        if link.bandwidth is None:
+            self._start(link, packet, u, v)
+        elif not link.busy:
+            self._serialize(link, packet, u, v)
+        elif link.queue_limit is not None and len(link.queue) >= link.queue_limit:
+            link.drops += 1
+            self._finish_copy(packet, "queue")
+        else:
+            link.queue.append((packet, v, self.now))
+            link.queued += 1
+            link.max_queue = max(link.max_queue, len(link.queue))
+
+    def _start(self, link, packet, u, v, duration=0.0):
+        """
+        Начинает передачу пакета: пакет выходит в канал через duration (время сериализации),
+        прибудет в v ещё через задержку распространения или потеряется с вероятностью loss.
+        """
+        self.stats.transmissions += 1
+        packet.hops += 1
+        link.packets += 1
+        link.bytes += packet.size
+        if self.loss and self.rng.random() < self.loss:
+            self._finish_copy(packet, "loss")
+            return
+        self.schedule(self.now + duration + self.delays[u][v], self._arrive, packet, v, u)
+
+    def _serialize(self, link, packet, u, v):
+        """
+        Занимает канал на время передачи пакета и планирует освобождение канала.
+        """
+        duration = packet.size / link.bandwidth
+        link.busy = True
+        link.busy_time += duration
+        self._start(link, packet, u, v, duration)
+        self.schedule(self.now + duration, self._release, link, u)
+
+    def _release(self, link, u):
+        """
+        Освобождает канал после передачи пакета и начинает передачу следующего из очереди.
+        """
+        if not link.queue:
+            link.busy = False
+            return
+        packet, v, enqueued = link.queue.popleft()
+        link.wait += self.now - enqueued
+        self._serialize(link, packet, u, v)
+
+    def link_summary(self, top=None):
+        """
+        Итоги по каналам, от самых загруженных: загрузка (доля времени моделирования, когда канал
+        передавал), число пакетов и байт, потери на переполнении очереди, средняя задержка
+        в очереди и наибольшая длина очереди.
+
+        Args:
+            top: Сколько каналов вернуть (по умолчанию - все, через которые шли пакеты).
+
+        Returns:
+            Список словарей с ключами link (пара индексов узлов), bandwidth, queue_limit,
+            utilization, packets, bytes, drops, queue_delay, max_queue.
+        """
+        rows = [
+            {
+                "link": key,
+                "bandwidth": link.bandwidth,
+                "queue_limit": link.queue_limit,
+                "utilization": min(1.0, link.busy_time / self.now) if self.now > 0 else 0.0,
+                "packets": link.packets,
+                "bytes": link.bytes,
+                "drops": link.drops,
+                "queue_delay": link.wait / link.packets if link.packets else 0.0,
+                "max_queue": link.max_queue,
+            }
+            for key, link in self.links.items()
+        ]
+        rows.sort(key=lambda row: (row["utilization"], row["packets"], row["drops"]), reverse=True)
+        return rows[:top] if top is not None else rows
+
+    def _arrive(self, packet, node, previous):
+        """
+        Обрабатывает приход пакета в узел: доставка, отбрасывание или пересылка дальше.
+        Пакет к недостижимому назначению отбрасывается в источнике до выбора маршрута.
+        """
+        if packet.path is not None:
+            packet.path.append(node)
+            packet.times.append(self.now)
+
+        if previous == -1 and not self.reachability.can_reach(node, packet.destination):
+            self._finish_copy(packet, "unreachable")
+            return
+
+        flood = packet.flood
+        if flood is not None:
+            if node in flood.seen or flood.delivered:
+                self.stats.duplicates += 1
+                self._finish_copy(packet, None)
+                return
+            flood.seen.add(node)
+
+        if previous != -1 and self.strategy.learns:
+            self.strategy.learn(packet, node, previous)
+
+        if node == packet.destination:
+            self._deliver(packet)
+            return
+
+        if packet.hops >= packet.hop_limit:
+            self._finish_copy(packet, "ttl")
+            return
+
+        next_hops = self.strategy.route(packet, node, previous)
+        if not next_hops:
+            self._finish_copy(packet, "no_route")
+            return
+
+        if flood is not None:
+            flood.copies += len(next_hops) - 1
+        for v in next_hops[1:]:
+            self.transmit(packet.copy(), node, v)
+        self.transmit(packet, node, next_hops[0])
+
+    def _deliver(self, packet):
+        stats = self.stats
+        stats.delivered += 1
+        stats.latency.append(self.now - packet.created)
+        stats.hops.append(packet.hops)
+
+        if packet.flood is not None:
+            packet.flood.delivered = True
+            packet.flood.copies -= 1
+        if packet.path is not None:
+            self._record(packet, "delivered")
+        if self.log is not None:
+            self._log(packet, "delivered")
+        if packet.segment is not None:
+            flow, kind, seq, echo = packet.segment
+            flow.receive(packet, kind, seq, echo)
+
+    def _finish_copy(self, packet, reason):
+        """
+        Завершает путь копии пакета. Пакет считается потерянным, когда исчезла последняя его копия,
+        а доставки так и не было.
+        """
+        flood = packet.flood
+        if flood is not None:
+            flood.copies -= 1
+            if flood.delivered or flood.copies > 0:
+                return
+            # Все копии отброшены как дубликаты - рассылка исчерпана, не дойдя до назначения
+            reason = reason or "no_route"
+
+        self.stats.drop(reason)
+        if packet.path is not None:
+            self._record(packet, reason)
+        if self.log is not None:
+            self._log(packet, reason)
+
+    def _log(self, packet, status):
+        self.log.append(packet.source, packet.destination, packet.path, packet.size, packet.hop_limit,
+                        self.strategy.name, packet.created, self.now, status, self.run_number, self.model.names)
+
+    def _record(self, packet, status):
+        self.trace.append({
+            "id": packet.id,
+            "source": packet.source,
+            "destination": packet.destination,
+            "size": packet.size,
+            "hop_limit": packet.hop_limit,
+            "path": packet.path,
+            "times": packet.times,
+            "kind": packet.segment[1] if packet.segment is not None else "data",
+            "status": status,
+        })
+
+
+def poisson_traffic(count, sources, destinations, rate=1.0, size=DEFAULT_PACKET_SIZE, hop_limit=DEFAULT_HOP_LIMIT,
+                    seed=None):
+    """
+    Генерирует поток пакетов с экспоненциальными интервалами между отправками (пуассоновский поток).
+
+    Args:
+        count: Количество пакетов.
+        sources: Индекс узла-источника или список индексов (выбирается случайно).
+        destinations: Индекс узла назначения или список индексов.
+        rate: Средняя интенсивность (пакетов в единицу времени).
+        size: Размер пакета или диапазон (min, max) в байтах.
+        hop_limit: Ограничение числа пересылок.
+        seed: Зерно генератора случайных чисел.
+
+    Yields:
+        Кортежи (время, источник, назначение, размер, hop limit).
+    """
+    rng = random.Random(seed)
+    sources = [sources] if isinstance(sources, int) else list(sources)
+    destinations = [destinations] if isinstance(destinations, int) else list(destinations)
+    time = 0.0
+
+    for _ in range(count):
+        source = rng.choice(sources)
+        destination = rng.choice(destinations)
+        if len(destinations) > 1:
+            while destination == source:
+                destination = rng.choice(destinations)
+        packet_size = rng.randint(*size) if isinstance(size, tuple) else size
+        yield time, source, destination, packet_size, hop_limit
+        time += rng.expovariate(rate)
+
+
+def simulate(model, strategy, count, source, destination, rate=1.0, size=DEFAULT_PACKET_SIZE,
+             hop_limit=DEFAULT_HOP_LIMIT, seed=None, undirected=False, trace_limit=0, log=None, run=0, progress=None,
+             protocol=None, loss=0.0, window=DEFAULT_WINDOW, bandwidth=None, queue_limit=None):
+    """
+    Моделирует отправку count пакетов из source в destination.
+
+    Функция progress(done, total) получает число отправленных пакетов из count
+    (исключение из неё прерывает моделирование). Если задан protocol ("UDP" или "TCP"),
+    пакеты - это сегменты данных транспорта, а итоги потоков - в simulator.transport.
+    bandwidth и queue_limit задают параметры каналов, для которых они не заданы в модели
+    (итоги по каналам - simulator.link_summary()).
+
+    Returns:
+        Simulator после завершения моделирования (итоги - в simulator.stats, маршруты - в simulator.trace).
+    """
+    simulator = Simulator(model, strategy, seed, undirected, trace_limit, log, run, loss, bandwidth, queue_limit)
+    simulator.transport = Transport(simulator, protocol, window) if protocol else None
+    submit = simulator.transport.submit if simulator.transport else None
+    simulator.add_traffic(poisson_traffic(count, source, destination, rate, size, hop_limit, seed), submit)
+    simulator.run(progress=None if progress is None else lambda generated: progress(generated, count))
+    return simulator
+
+
+def compare_transport(model, count, source, destination, strategies=None, protocols=TRANSPORTS, **kwargs):
+    """
+    Моделирует один и тот же трафик для каждой пары (стратегия, протокол), чтобы сравнить,
+    как стратегии маршрутизации справляются с каждым транспортом.
+
+    Args:
+        model: Модель графа.
+        count: Количество сегментов данных.
+        source: Индекс узла-источника.
+        destination: Индекс узла назначения.
+        strategies: Ключи STRATEGIES (по умолчанию - все).
+        protocols: Протоколы транспорта.
+        **kwargs: Остальные аргументы simulate (rate, loss, window, seed, undirected, ...).
+
+    Returns:
+        Список словарей: итоги потока (Flow.summary) с ключами strategy и transmissions.
+    """
+    rows = []
+    for strategy in strategies or STRATEGIES:
+        for protocol in protocols:
+            simulator = simulate(model, strategy, count, source, destination, protocol=protocol, **kwargs)
+            for flow in simulator.transport.summary()["flows"]:
+                flow.update(strategy=strategy, transmissions=simulator.stats.transmissions)
+                rows.append(flow)
+    return rows
+
+
+def compare_congestion(model, count, source, destination, strategies=None, top=3, **kwargs):
+    """
+    Моделирует один и тот же трафик для каждой стратегии маршрутизации, чтобы сравнить,
+    как они распределяют нагрузку по каналам при насыщении.
+
+    Args:
+        model: Модель графа с параметрами каналов (или общими bandwidth и queue_limit в kwargs).
+        count: Количество пакетов.
+        source: Индекс узла-источника или список индексов.
+        destination: Индекс узла назначения или список индексов.
+        strategies: Ключи STRATEGIES (по умолчанию - все).
+        top: Сколько самых загруженных каналов включить в итоги.
+        **kwargs: Остальные аргументы simulate (rate, size, bandwidth, queue_limit, seed, undirected, ...).
+
+    Returns:
+        Список словарей по стратегиям: доля доставленных, средняя задержка, потери на очередях,
+        число задействованных каналов, наибольшая и средняя загрузка канала и top самых загруженных каналов.
+    """
+    rows = []
+    for strategy in strategies or STRATEGIES:
+        simulator = simulate(model, strategy, count, source, destination, **kwargs)
+        summary = simulator.stats.summary()
+        links = simulator.link_summary()
+        utilization = [link["utilization"] for link in links]
+        rows.append({
+            "strategy": strategy,
+            "delivery_ratio": summary["delivery_ratio"],
+            "latency_mean": summary.get("latency_mean", math.inf),
+            "queue_drops": summary["dropped"].get("queue", 0),
+            "links_used": len(links),
+            "utilization_max": max(utilization, default=0.0),
+            "utilization_mean": statistics.fmean(utilization) if utilization else 0.0,
+            "hot_links": links[:top],
+        })
+    return rows
@@ -0,0 +1,426 @@
+"""
+Транспортный уровень поверх дискретно-событийной модели сети (Simulator).
+
+Сегменты идут по сети как обычные пакеты модели и маршрутизируются выбранной стратегией;
+транспорт решает только, что и когда отправлять:
+    - UDP: сегмент отправляется сразу и не подтверждается, потерянный сегмент пропадает;
+    - TCP: тройное рукопожатие (SYN, SYN-ACK, ACK), скользящее окно из window сегментов,
+      накопительные подтверждения, повтор по таймауту с экспоненциальной отсрочкой
+      (RTO по RFC 6298 из отметок времени в подтверждениях) и быстрый повтор после трёх
+      повторных подтверждений. Получатель хранит сегменты, пришедшие не по порядку.
+Итоги считаются по потокам (источник, назначение): пропускная способность (все принятые
+байты), полезная пропускная способность (уникальные данные) и перцентили задержки
+от передачи данных транспорту до их выдачи получателю по порядку.
+"""
+import math
+import statistics
+from array import array
+
+from .algorithms import _dijkstra_heap
+
+TRANSPORTS = ("UDP", "TCP")
+
+# Заголовки IP + UDP и IP + TCP в байтах
+UDP_HEADER = 28
+TCP_HEADER = 40
+
+DEFAULT_WINDOW = 8
+MAX_RETRIES = 15
+
+# RTO по умолчанию - столько кратчайших круговых задержек, но не меньше MIN_RTO;
+# отсрочка удваивает RTO не выше MAX_RTO_FACTOR начальных значений
+INITIAL_RTO_FACTOR = 3
+MIN_RTO = 1.0
+MAX_RTO_FACTOR = 64
+
+# Наименьший запас RTO над SRTT (гранулярность часов G в RFC 6298): при постоянной задержке
+# RTTVAR стремится к нулю, и без запаса таймер срабатывал бы одновременно с подтверждением
+RTO_GRANULARITY = 1.0
+
+# Сколько повторных подтверждений запускают быстрый повтор
+DUPLICATE_ACKS = 3
+
+
+def percentile(values, fraction):
+    """
+    Перцентиль упорядоченной последовательности (метод ближайшего ранга).
+    """
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+class Flow:
+    """
+    Поток данных между двумя узлами и его итоги. Объект моделирует обе стороны соединения.
+    """
+    protocol = ""
+    header = 0
+
+    def __init__(self, transport, source, destination, hop_limit):
+        self.simulator = transport.simulator
+        self.source = source
+        self.destination = destination
+        self.hop_limit = hop_limit
+        self.state = "open"
+
+        self.submitted = 0
+        self.sent = 0
+        self.retransmissions = 0
+        self.control = 0
+        self.delivered = 0
+        self.duplicates = 0
+        self.bytes_received = 0
+        self.payload_delivered = 0
+        self.latency = array("d")
+        self.started = None
+        self.finished = None
+
+    def _send(self, source, destination, size, kind, seq=0, echo=0.0):
+        """
+        Отправляет сегмент по сети. echo - отметка времени, которую получатель вернёт в ответе.
+        """
+        self.simulator.send(source, destination, size, self.hop_limit, segment=(self, kind, seq, echo))
+
+    def _accept(self, payload, submitted_at):
+        """
+        Выдаёт получателю очередной уникальный сегмент.
+        """
+        self.delivered += 1
+        self.payload_delivered += payload
+        self.latency.append(self.simulator.now - submitted_at)
+        self.finished = self.simulator.now
+
+    def submit(self, size):
+        raise NotImplementedError
+
+    def receive(self, packet, kind, seq, echo):
+        raise NotImplementedError
+
+    def summary(self):
+        """
+        Возвращает итоги потока: доставка, передачи, пропускная способность и задержка
+        (среднее, медиана, 95-й и 99-й перцентили, максимум).
+        """
+        duration = self.finished - self.started if self.finished is not None else 0.0
+        result = {
+            "protocol": self.protocol,
+            "source": self.source,
+            "destination": self.destination,
+            "state": self.state,
+            "submitted": self.submitted,
+            "delivered": self.delivered,
+            "delivery_ratio": self.delivered / self.submitted if self.submitted else 0.0,
+            "sent": self.sent,
+            "retransmissions": self.retransmissions,
+            "control": self.control,
+            "duplicates": self.duplicates,
+            "duration": duration,
+            "throughput": self.bytes_received / duration if duration > 0 else 0.0,
+            "goodput": self.payload_delivered / duration if duration > 0 else 0.0,
+        }
+
+        latency = sorted(self.latency)
+        if latency:
+            result.update(
+                latency_mean=statistics.fmean(latency),
+                latency_p50=percentile(latency, 0.5),
+                latency_p95=percentile(latency, 0.95),
+                latency_p99=percentile(latency, 0.99),
+                latency_max=latency[-1],
+            )
+
+        return result
+
+
+class UdpFlow(Flow):
+    """
+    UDP: сегменты отправляются без соединения и подтверждений.
+    """
+    protocol = "UDP"
+    header = UDP_HEADER
+
+    def submit(self, size):
+        now = self.simulator.now
+        if self.started is None:
+            self.started = now
+        self.submitted += 1
+        self.sent += 1
+        self._send(self.source, self.destination, size + self.header, "data", self.submitted - 1, now)
+
+    def receive(self, packet, kind, seq, echo):
+        self.bytes_received += packet.size
+        self._accept(packet.size - self.header, echo)
+
+
+class TcpFlow(Flow):
+    """
+    TCP: соединение, скользящее окно, накопительные подтверждения и повтор сегментов.
+
+    Номера сегментов считаются в сегментах, а не в байтах. Подтверждение несёт номер
+    следующего ожидаемого сегмента и возвращает отметку времени сегмента, который его вызвал,
+    поэтому оценка RTT верна и для повторно переданных сегментов.
+    """
+    protocol = "TCP"
+    header = TCP_HEADER
+
+    def __init__(self, transport, source, destination, hop_limit, window=DEFAULT_WINDOW, max_retries=MAX_RETRIES,
+                 initial_rto=MIN_RTO):
+        super().__init__(transport, source, destination, hop_limit)
+        self.state = "closed"
+        self.window = window
+        self.max_retries = max_retries
+
+        # Данные, переданные транспорту: размер и момент передачи каждого сегмента
+        self.sizes = array("i")
+        self.times = array("d")
+
+        # Отправитель
+        self.snd_una = 0
+        self.snd_next = 0
+        self.retries = 0
+        self.dupacks = 0
+        self.timeouts = 0
+        self.fast_retransmits = 0
+        self.handshake_time = None
+        self.srtt = None
+        self.rttvar = 0.0
+        self.rto = initial_rto
+        self.max_rto = initial_rto * MAX_RTO_FACTOR
+        self._timer = 0
+        self._timer_running = False
+
+        # Получатель
+        self.rcv_next = 0
+        self.rcv_buffer = set()
+        self.acks = 0
+
+    def submit(self, size):
+        now = self.simulator.now
+        if self.started is None:
+            self.started = now
+        self.sizes.append(size)
+        self.times.append(now)
+        self.submitted += 1
+
+        if self.state == "closed":
+            self.state = "syn_sent"
+            self._send_syn()
+        elif self.state == "established":
+            self._fill_window()
+
+    def _send_syn(self):
+        self.control += 1
+        self._send(self.source, self.destination, self.header, "syn", 0, self.simulator.now)
+        self._start_timer()
+
+    def _send_data(self, seq):
+        self.sent += 1
+        self._send(self.source, self.destination, self.sizes[seq] + self.header, "data", seq, self.simulator.now)
+
+    def _fill_window(self):
+        """
+        Отправляет сегменты, пока их число в пути меньше окна.
+        """
+        limit = min(self.submitted, self.snd_una + self.window)
+        while self.snd_next < limit:
+            self._send_data(self.snd_next)
+            self.snd_next += 1
+        if self.snd_una < self.snd_next and not self._timer_running:
+            self._start_timer()
+
+    def _start_timer(self):
+        # Прежний таймер не снимается с очереди событий, а становится недействительным
+        self._timer += 1
+        self._timer_running = True
+        self.simulator.schedule(self.simulator.now + self.rto, self._timeout, self._timer)
+
+    def _stop_timer(self):
+        self._timer += 1
+        self._timer_running = False
+
+    def _timeout(self, timer):
+        if timer != self._timer or self.state == "reset":
+            return
+
+        self.timeouts += 1
+        self.retries += 1
+        if self.retries > self.max_retries:
+            # Соединение разрывается: неподтверждённые сегменты так и не будут доставлены
+            self.state = "reset"
+            self._stop_timer()
+            return
+
+        self.rto = min(self.rto * 2, self.max_rto)
+        if self.state == "syn_sent":
+            self._send_syn()
+        else:
+            self.retransmissions += 1
+            self._send_data(self.snd_una)
+            self._start_timer()
+
+    def _sample_rtt(self, rtt):
+        """
+        Обновляет сглаженную оценку RTT и RTO (RFC 6298).
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.rto = min(max(MIN_RTO, self.srtt + max(RTO_GRANULARITY, 4 * self.rttvar)), self.max_rto)
+
+    def receive(self, packet, kind, seq, echo):
+        if self.state == "reset":
+            return
+
+        if packet.destination == self.destination:
+            self._receive_at_destination(packet, kind, seq, echo)
+        else:
+            self._receive_at_source(kind, seq, echo)
+
+    def _receive_at_destination(self, packet, kind, seq, echo):
+        if kind == "syn":
+            # Повторный SYN (потерялся SYN-ACK) получает ответ ещё раз
+            self.control += 1
+            self._send(self.destination, self.source, self.header, "syn_ack", 0, echo)
+            return
+        if kind != "data":
+            # Последний сегмент рукопожатия только подтверждает соединение
+            return
+
+        self.bytes_received += packet.size
+        if seq == self.rcv_next:
+            self._accept(self.sizes[seq], self.times[seq])
+            self.rcv_next += 1
+            while self.rcv_next in self.rcv_buffer:
+                self.rcv_buffer.remove(self.rcv_next)
+                self._accept(self.sizes[self.rcv_next], self.times[self.rcv_next])
+                self.rcv_next += 1
+        elif seq > self.rcv_next and seq not in self.rcv_buffer:
+            self.rcv_buffer.add(seq)
+        else:
+            self.duplicates += 1
+
+        self.acks += 1
+        self._send(self.destination, self.source, self.header, "ack", self.rcv_next, echo)
+
+    def _receive_at_source(self, kind, seq, echo):
+        now = self.simulator.now
+
+        if kind == "syn_ack":
+            if self.state != "syn_sent":
+                return
+            self._sample_rtt(now - echo)
+            self.state = "established"
+            self.handshake_time = now - self.started
+            self.retries = 0
+            self._stop_timer()
+            self.control += 1
+            self._send(self.source, self.destination, self.header, "ack", 0, now)
+            self._fill_window()
+            return
+
+        self._sample_rtt(now - echo)
+        if seq > self.snd_una:
+            self.snd_una = seq
+            self.retries = 0
+            self.dupacks = 0
+            if self.snd_una < self.snd_next:
+                self._start_timer()
+            else:
+                self._stop_timer()
+            self._fill_window()
+        elif seq == self.snd_una < self.snd_next:
+            self.dupacks += 1
+            if self.dupacks == DUPLICATE_ACKS:
+                self.fast_retransmits += 1
+                self.retransmissions += 1
+                self._send_data(self.snd_una)
+
+    def summary(self):
+        result = super().summary()
+        result.update(
+            acks=self.acks,
+            timeouts=self.timeouts,
+            fast_retransmits=self.fast_retransmits,
+            handshake_time=self.handshake_time,
+            srtt=self.srtt,
+            rto=self.rto,
+        )
+        return result
+
+
+class Transport:
+    """
+    Транспортный уровень модели: потоки по парам (источник, назначение) одного протокола.
+
+    Пример:
+        simulator = Simulator(model, "random", seed=1, undirected=True, loss=0.01)
+        transport = Transport(simulator, "TCP", window=16)
+        simulator.add_traffic(poisson_traffic(10000, 0, 5, seed=1), transport.submit)
+        simulator.run()
+        print(transport.summary())
+    """
+
+    def __init__(self, simulator, protocol="TCP", window=DEFAULT_WINDOW, max_retries=MAX_RETRIES, initial_rto=None):
+        """
+        Args:
+            simulator: Модель сети (Simulator).
+            protocol: "UDP" или "TCP".
+            window: Окно TCP в сегментах.
+            max_retries: Сколько таймаутов подряд TCP переживает до разрыва соединения.
+            initial_rto: Начальный RTO; по умолчанию - INITIAL_RTO_FACTOR кратчайших круговых задержек.
+
+        Raises:
+            ValueError: Если указан неизвестный протокол.
+        """
+        if protocol not in TRANSPORTS:
+            raise ValueError(f"Неизвестный протокол: {protocol}")
+
+        self.simulator = simulator
+        self.protocol = protocol
+        self.window = window
+        self.max_retries = max_retries
+        self.initial_rto = initial_rto
+        self.flows = {}
+
+    def _initial_rto(self, source, destination):
+        if self.initial_rto is not None:
+            return self.initial_rto
+
+        adjacency = self.simulator.adjacency
+        forward = _dijkstra_heap(adjacency, source, destination)[0][destination]
+        backward = _dijkstra_heap(adjacency, destination, source)[0][source]
+        round_trip = forward + backward
+        return max(MIN_RTO, INITIAL_RTO_FACTOR * round_trip) if round_trip != math.inf else MIN_RTO
+
+    def submit(self, source, destination, size, hop_limit):
+        """
+        Передаёт транспорту сегмент данных size байт (без заголовка) в текущий момент модели.
+        Поток создаётся при первом сегменте для пары узлов.
+        """
+        flow = self.flows.get((source, destination))
+        if flow is None:
+            if self.protocol == "UDP":
+                flow = UdpFlow(self, source, destination, hop_limit)
+            else:
+                flow = TcpFlow(self, source, destination, hop_limit, self.window, self.max_retries,
+                               self._initial_rto(source, destination))
+            self.flows[(source, destination)] = flow
+        flow.submit(size)
+
+    def summary(self):
+        """
+        Возвращает итоги по потокам и по всему транспорту.
+        """
+        flows = [flow.summary() for flow in self.flows.values()]
+        submitted = sum(flow["submitted"] for flow in flows)
+        delivered = sum(flow["delivered"] for flow in flows)
+        return {
+            "protocol": self.protocol,
+            "flows": flows,
+            "submitted": submitted,
+            "delivered": delivered,
+            "delivery_ratio": delivered / submitted if submitted else 0.0,
+            "retransmissions": sum(flow["retransmissions"] for flow in flows),
+        }
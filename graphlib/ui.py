@@ -1,9 +1,19 @@
 import random
+import time
 import tkinter
 
+from .animation import hop_time
 from .io import save_graph, load_graph
 from .utils import get_vertex_at, add_vertex, update_edge, display_incidence_matrix, set_end_vertex, set_start_vertex, \
-    delete_edge, delete_vertex, add_edge, change_edge_direction, change_edge_weight, on_routing_table_window_close
+    delete_edge, delete_vertex, add_edge, change_edge_direction, change_edge_weight, change_edge_capacity, \
+    on_routing_table_window_close, on_packet_info_window_close
+
+# Цвет пакета на холсте по алгоритму маршрутизации
+PACKET_COLOURS = {
+    "Случайная маршрутизация": "#6e14e3",
+    "Лавинная маршрутизация": "#14e359",
+}
+DEFAULT_PACKET_COLOUR = "#e314a8"
 
 
 def on_left_click(graph, event):
@@ -53,6 +63,7 @@ def on_mouse_drag(graph, event):
     x, y = event.x, event.y
     graph.canvas.coords(vertex["id"], x - 15, y - 15, x + 15, y + 15)
     graph.canvas.coords(vertex["text"], x, y)
+    graph.model.move_vertex(graph.vertices.index(vertex), x, y)
 
     for edge_id in vertex["edges"]:
         update_edge(graph, edge_id)
@@ -116,6 +127,8 @@ def show_vertex_menu(graph, vertex, x, y, task):
         menu.add_command(label="Добавить дугу", command=lambda: add_edge(graph, vertex))
         menu.add_command(label="Сменить направление дуги", command=lambda: change_edge_direction(graph, vertex))
     menu.add_command(label="Изменить вес дуги", command=lambda: change_edge_weight(graph, vertex))
+    if task == "3":
+        menu.add_command(label="Параметры канала", command=lambda: change_edge_capacity(graph, vertex))
     menu.add_command(label="Удалить дугу", command=lambda: delete_edge(graph, vertex))
     graph.current_menu = menu
     menu.post(x + graph.root.winfo_rootx(), y + graph.root.winfo_rooty())
@@ -150,61 +163,85 @@ def show_routing_tables(graph):
             next_hop = info["next_hop"]
             edge_weight = info["edge_weight"]
             total_weight += edge_weight
-            graph.routing_table_text.insert(
-                tkinter.END,
-                f"  -> К {destination}: через узел {next_hop}, вес узла - {edge_weight}, конечный вес - {total_weight}\n"
-            )
+            line = (f"  -> К {destination}: через узел {next_hop}, вес узла - {edge_weight}, "
+                    f"конечный вес - {total_weight}")
+            # Таблицы обратного обучения хранят ещё длину маршрута и возраст записи
+            if "hops" in info:
+                line += f", пересылок - {info['hops']}, возраст - {info['age']}"
+            # Таблицы протоколов маршрутизации хранят длину всего маршрута
+            if "distance" in info:
+                line += f", длина маршрута - {info['distance']:g}"
+            graph.routing_table_text.insert(tkinter.END, line + "\n")
 
         graph.routing_table_text.insert(tkinter.END, "\n")
 
 
-def display_packet_path(graph, path, algorithm_name, total_packets=None):
+def display_packet_path(graph, path, algorithm_name, total_packets=None, packet_size=None, hop_limit=None, log=True):
     """
     Отображение пути передачи пакетов и логирование.
 
-    Генерирует данные о передаче пакетов, добавляет их в окно информации и выделяет путь на графе.
+    Записывает пакет в журнал graph.packet_log (текст записи формируется только при показе
+    журнала) и выделяет путь на графе.
 
     Args:
         graph: Объект графа.
-        path: Маршрут передачи пакета.
+        path: Маршрут передачи пакета (вершины представления или их индексы).
         algorithm_name: Название алгоритма маршрутизации.
         total_packets: Общее количество пакетов (для дейтаграммного метода).
+        packet_size: Размер пакета в байтах (по умолчанию - случайный).
+        hop_limit: Ограничение числа пересылок (по умолчанию - длина маршрута).
+        log: Если False, пакет уже записан в журнал (например, моделью) и только отображается.
     """
-    if algorithm_name != "Маршрутизация по предыдущему опыту":
-        sender = path[0]
-        receiver = path[-1]
-    else:
-        sender = graph.vertices[path[0]]
-        receiver = graph.vertices[path[-1]]
+    if not isinstance(path[0], dict):
         path = [graph.vertices[elem] for elem in path]
 
-    packet_number = len(graph.packet_log) + 1
-    packet_size = random.randint(100, 1000)
-    hop_limit = len(path) - 1
-
-    marsh_info = f"Маршрутизация №{graph.counter_of_tries}\n" if algorithm_name != "Случайная маршрутизация" else \
-        f"Маршрутизация №{graph.counter_of_tries} для пакетов: {total_packets}\n"
-
-    packet_info = (
-        f"{marsh_info}"
-        f"Алгоритм: {algorithm_name}\n"
-        f"Адрес отправителя: Вершина {sender['name']}\n"
-        f"Адрес назначения: Вершина {receiver['name']}\n"
-        f"Назначенный маршрут: {' -> '.join(map(str, [v['name'] for v in path]))}\n"
-        f"Номер пакета: {packet_number}\n"
-        f"Размер пакета: {packet_size} байт\n"
-        f"Время жизни (hop limit): {hop_limit} пересылок\n"
-    )
+    if packet_size is None:
+        packet_size = random.randint(100, 1000)
+    if hop_limit is None:
+        hop_limit = len(path) - 1
+
+    if log:
+        names = [vertex["name"] for vertex in path]
+        now = time.time()
+        graph.packet_log.append(names[0], names[-1], names, packet_size, hop_limit, algorithm_name,
+                                now, now, "delivered", graph.counter_of_tries)
 
-    graph.packet_log.append(packet_info)
     highlight_path(graph, path, packet_size, algorithm_name)
 
 
+def show_packet_log(graph, limit=200):
+    """
+    Открывает окно журнала пакетов с последними limit записями.
+
+    Args:
+        graph: Объект графа.
+        limit: Сколько последних записей показать (текст формируется только для них).
+    """
+    if not graph.packet_info_window or not graph.packet_info_window.winfo_exists():
+        graph.packet_info_window = tkinter.Toplevel(graph.root)
+        graph.packet_info_window.title("Журнал пакетов")
+        graph.packet_info_window.protocol("WM_DELETE_WINDOW", lambda: on_packet_info_window_close(graph))
+
+        graph.packet_info_text = tkinter.Text(graph.packet_info_window, wrap="word", width=60, height=30)
+        graph.packet_info_text.pack(fill=tkinter.BOTH, expand=True)
+
+    log = graph.packet_log
+    graph.packet_info_text.delete(1.0, tkinter.END)
+    graph.packet_info_text.insert(
+        tkinter.END,
+        f"Пакетов в журнале: {len(log)} из {log.total} (ёмкость {log.capacity})\n\n"
+    )
+
+    for index in range(max(0, len(log) - limit), len(log)):
+        graph.packet_info_text.insert(tkinter.END, log.format(index) + "\n")
+
+
 def highlight_path(graph, path, packet_size, algorithm_name):
     """
     Выделение пути на графе с анимацией перемещения одного пакета.
 
-    Сбрасывает выделение всех рёбер, выделяет рёбра пути и запускает анимацию пакета.
+    Рёбра пути передаются планировщику анимации вместе с пакетом: он перекрашивает только
+    те рёбра, выделение которых изменилось.
 
     Args:
         graph: Объект графа.
@@ -212,96 +249,47 @@ def highlight_path(graph, path, packet_size, algorithm_name):
         packet_size: Размер пакета (для определения задержки анимации).
         algorithm_name: Название алгоритма маршрутизации.
     """
-    for edge_id in graph.edges:
-        graph.canvas.itemconfig(edge_id, fill="black")
+    # Если path задан списком dict-вершин, приводим к списку индексов
+    if isinstance(path[0], dict):
+        index = {id(vertex): i for i, vertex in enumerate(graph.vertices)}
+        path = [index[id(v)] for v in path]
+
+    animate_packet(graph, path, packet_size, algorithm_name, _route_edges(graph, path))
 
-    # Строим отображение для обоих направлений ребра
+
+def _route_edges(graph, path):
+    """
+    Возвращает элементы холста рёбер маршрута (ребро ищется в обоих направлениях).
+    """
+    index = {id(vertex): i for i, vertex in enumerate(graph.vertices)}
     edge_map = {}
     for edge_id, (start_vertex, end_vertex, _, _) in graph.edges.items():
-        si = graph.vertices.index(start_vertex)
-        ei = graph.vertices.index(end_vertex)
+        si = index[id(start_vertex)]
+        ei = index[id(end_vertex)]
         edge_map[(si, ei)] = edge_id
         edge_map[(ei, si)] = edge_id
 
-    # Если path задан списком dict-вершин, приводим к списку индексов
-    if isinstance(path[0], dict):
-        path = [graph.vertices.index(v) for v in path]
-
-    # Подсвечиваем каждый сегмент пути
-    for i in range(len(path) - 1):
-        si = path[i]
-        ei = path[i + 1]
-        edge_id = edge_map.get((si, ei))
-        if edge_id:
-            graph.canvas.itemconfig(edge_id, fill="blue")
-
-    animate_packet(graph, path, packet_size, algorithm_name)
+    return [edge_map[hop] for hop in zip(path, path[1:]) if hop in edge_map]
 
 
-def animate_packet(graph, path, packet_size, algorithm_name):
+def animate_packet(graph, path, packet_size, algorithm_name, edges=()):
     """
     Анимация перемещения одного пакета по указанному пути.
 
+    Пакет передаётся общему планировщику graph.animator, который двигает все пакеты
+    от одного таймера кадров.
+
     Args:
         graph: Объект графа.
-        path: Список вершин, представляющий маршрут.
+        path: Список индексов вершин, представляющий маршрут.
         packet_size: Размер пакета (для определения задержки анимации).
         algorithm_name: Название алгоритма маршрутизации.
+        edges: Элементы холста рёбер маршрута, которые нужно выделить.
     """
-    packet_radius = 10
-    delay = min(200, packet_size // 10)
-
-    start_vertex = graph.vertices[path[0]]
-    start_coords = graph.canvas.coords(start_vertex["id"])
-    start_x = (start_coords[0] + start_coords[2]) / 2
-    start_y = (start_coords[1] + start_coords[3]) / 2
-
-    packet_id = graph.canvas.create_oval(
-        start_x - packet_radius, start_y - packet_radius,
-        start_x + packet_radius, start_y + packet_radius,
-        fill="#6e14e3" if algorithm_name == "Случайная маршрутизация" else
-        "#14e359" if algorithm_name == "Лавинная маршрутизация" else
-        "#e314a8",
-        outline="black", width=2
-    )
+    points = []
+    for vertex in path:
+        coords = graph.canvas.coords(graph.vertices[vertex]["id"])
+        points.append(((coords[0] + coords[2]) / 2, (coords[1] + coords[3]) / 2))
 
-    def move_packet(index=0):
-        """
-        Рекурсивное перемещение пакета по маршруту.
-
-        Перемещает пакет от текущей вершины к следующей по маршруту, используя шаги для плавной анимации.
-        После завершения перемещения к конечной вершине удаляет пакет с холста.
-
-        Args:
-            index: Индекс текущей вершины в маршруте.
-        """
-        if index >= len(path) - 1:
-            graph.canvas.delete(packet_id)
-            return
-
-        current_coords = graph.canvas.coords(graph.vertices[path[index]]["id"])
-        next_coords = graph.canvas.coords(graph.vertices[path[index + 1]]["id"])
-        current_x = (current_coords[0] + current_coords[2]) / 2
-        current_y = (current_coords[1] + current_coords[3]) / 2
-        next_x = (next_coords[0] + next_coords[2]) / 2
-        next_y = (next_coords[1] + next_coords[3]) / 2
-        steps = 50
-        dx = (next_x - current_x) / steps
-        dy = (next_y - current_y) / steps
-
-        def step_animation(step=0):
-            """
-            Рекурсивное перемещение пакета на один шаг.
-
-            Args:
-                step: Текущий шаг перемещения.
-            """
-            if step <= steps:
-                graph.canvas.move(packet_id, dx, dy)
-                graph.canvas.after(delay, lambda: step_animation(step + 1))
-            else:
-                move_packet(index + 1)
-
-        step_animation()
-
-    move_packet()
+    colour = PACKET_COLOURS.get(algorithm_name, DEFAULT_PACKET_COLOUR)
+    graph.animator.add(points, hop_time(packet_size), colour, edges)
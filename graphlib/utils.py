@@ -1,7 +1,11 @@
+from itertools import count
 from tkinter import simpledialog, Entry, END, messagebox, Label, LAST, Toplevel, Text, WORD, BOTH, DISABLED
 
 from .tooltip import ToolTip
 
+# Для графов больше этого размера матрица смежности не выводится полями ввода (их было бы V^2)
+MATRIX_DISPLAY_LIMIT = 30
+
 
 def get_vertex_at(graph, x, y):
     """
@@ -16,18 +20,14 @@ def get_vertex_at(graph, x, y):
     Returns:
         Словарь с данными вершины или None.
     """
-    for vertex in graph.vertices:
-        coords = graph.canvas.coords(vertex["id"])
-        vx = (coords[0] + coords[2]) / 2
-        vy = (coords[1] + coords[3]) / 2
-
+    for vertex, (vx, vy) in zip(graph.vertices, graph.model.coords):
         if abs(x - vx) < 15 and abs(y - vy) < 15:
             return vertex
 
     return None
 
 
-def add_vertex(graph, x, y):
+def add_vertex(graph, x, y, update=True):
     """
     Добавляет новую вершину на граф в заданных координатах.
 
@@ -35,13 +35,16 @@ def add_vertex(graph, x, y):
         graph: Объект графа.
         x: Координата x.
         y: Координата y.
-    """
-    if len(graph.vertices) < 10:
-        used_indices = {int(graph.canvas.itemcget(v["text"], "text")) for v in graph.vertices}
-        new_index = next(i for i in range(10) if i not in used_indices)
-        vertex_id = graph.canvas.create_oval(x - 15, y - 15, x + 15, y + 15, fill="lightblue")
-        vertex_text = graph.canvas.create_text(x, y, text=str(new_index))
-        graph.vertices.append({"id": vertex_id, "name": new_index, "text": vertex_text, "edges": []})
+        update: Если False, матрица смежности не обновляется (при загрузке графа
+            она обновляется один раз после добавления всех вершин и рёбер).
+    """
+    used_indices = {int(graph.canvas.itemcget(v["text"], "text")) for v in graph.vertices}
+    new_index = next(i for i in count() if i not in used_indices)
+    vertex_id = graph.canvas.create_oval(x - 15, y - 15, x + 15, y + 15, fill="lightblue")
+    vertex_text = graph.canvas.create_text(x, y, text=str(new_index))
+    graph.vertices.append({"id": vertex_id, "name": new_index, "text": vertex_text, "edges": []})
+    graph.model.add_vertex(x, y, new_index)
+    if update:
         update_graph_matrix(graph)
         update_matrix_display(graph)
 
@@ -57,21 +60,16 @@ def delete_vertex(graph, vertex):
     graph.canvas.delete(vertex["id"])
     graph.canvas.delete(vertex["text"])
 
-    edges_to_delete = []
-
     for edge_id, (start_vertex, end_vertex, _, label_id) in list(graph.edges.items()):
         if start_vertex == vertex or end_vertex == vertex:
-            edges_to_delete.append(edge_id)
+            remove_edge_items(graph, edge_id)
 
-    for edge_id in edges_to_delete:
-        start_vertex, end_vertex, _, label_id = graph.edges[edge_id]
-        graph.canvas.delete(edge_id)  # Удаляем линию ребра
-        graph.canvas.delete(label_id)  # Удаляем метку веса
-        del graph.edges[edge_id]
-
-        if edge_id in start_vertex["edges"]:
-            start_vertex["edges"].remove(edge_id)
+    if graph.start_vertex == vertex:
+        graph.start_vertex = None
+    if graph.end_vertex == vertex:
+        graph.end_vertex = None
 
+    graph.model.remove_vertex(graph.vertices.index(vertex))
     graph.vertices.remove(vertex)
     update_graph_matrix(graph)
     update_matrix_display(graph)
@@ -97,7 +95,7 @@ def get_edge_coords(start_vertex, end_vertex, canvas):
     return sx, sy, ex, ey, mx, my
 
 
-def create_edge(graph, start_vertex, end_vertex, weight, direction=True):
+def create_edge(graph, start_vertex, end_vertex, weight, direction=True, update=True):
     """
     Создаёт ребро между двумя вершинами с заданным весом.
 
@@ -108,7 +106,16 @@ def create_edge(graph, start_vertex, end_vertex, weight, direction=True):
         weight: Вес ребра.
         direction: Если True (по умолчанию) — рисуется со стрелкой (ориентированный граф).
                   Если False — рисуется просто линия (неориентированный граф).
+        update: Если False, матрица смежности графа не пересчитывается (см. add_vertex).
     """
+    start_idx = graph.vertices.index(start_vertex)
+    end_idx = graph.vertices.index(end_vertex)
+
+    # В модели между парой вершин хранится одно ребро, поэтому заменяем уже нарисованное
+    for edge_id, (start_v, end_v, _, label_id) in list(graph.edges.items()):
+        if start_v == start_vertex and end_v == end_vertex:
+            remove_edge_items(graph, edge_id)
+
     sx, sy, ex, ey, mx, my = get_edge_coords(start_vertex, end_vertex, graph.canvas)
 
     if direction:
@@ -119,7 +126,25 @@ def create_edge(graph, start_vertex, end_vertex, weight, direction=True):
     label_id = graph.canvas.create_text(mx, my - 10, text=str(weight), fill="red")
     graph.edges[line_id] = (start_vertex, end_vertex, weight, label_id)
     start_vertex["edges"].append(line_id)
-    update_graph_matrix(graph)
+    graph.model.set_edge(start_idx, end_idx, weight)
+    if update:
+        update_graph_matrix(graph)
+
+
+def remove_edge_items(graph, edge_id):
+    """
+    Удаляет ребро с холста и из словаря рёбер представления (модель не изменяется).
+
+    Args:
+        graph: Объект графа.
+        edge_id: Идентификатор ребра.
+    """
+    start_vertex, _, _, label_id = graph.edges.pop(edge_id)
+    graph.canvas.delete(edge_id)
+    graph.canvas.delete(label_id)
+
+    if edge_id in start_vertex["edges"]:
+        start_vertex["edges"].remove(edge_id)
 
 
 def add_edge(graph, start_vertex, direction=True):
@@ -177,13 +202,9 @@ def delete_edge(graph, start_vertex):
 
         for edge_id, (start_v, end_v, _, label_id) in list(graph.edges.items()):
             if start_v == start_vertex and end_v == end_vertex:
-                graph.canvas.delete(edge_id)
-                graph.canvas.delete(label_id)
-                del graph.edges[edge_id]
-
-                if edge_id in start_vertex["edges"]:
-                    start_vertex["edges"].remove(edge_id)
-
+                remove_edge_items(graph, edge_id)
+                graph.model.remove_edge(graph.vertices.index(start_v), end_vertex_index)
+                update_graph_matrix(graph)
                 update_matrix_display(graph)
                 return
 
@@ -213,6 +234,8 @@ def change_edge_weight(graph, start_vertex):
                 if new_weight is not None:
                     graph.edges[edge_id] = (start_v, end_v, new_weight, label_id)
                     graph.canvas.itemconfig(label_id, text=str(new_weight))
+                    graph.model.set_edge(graph.vertices.index(start_v), end_vertex_index, new_weight)
+                    update_graph_matrix(graph)
 
                 update_matrix_display(graph)
                 return
@@ -220,6 +243,53 @@ def change_edge_weight(graph, start_vertex):
         messagebox.showwarning("Ошибка", "Дуга между этими вершинами не найдена.")
 
 
+def change_edge_capacity(graph, start_vertex):
+    """
+    Изменяет параметры канала (пропускную способность и ёмкость очереди), запрашивая конечную вершину.
+
+    Args:
+        graph: Объект графа.
+        start_vertex: Начальная вершина ребра.
+    """
+    end_vertex_index = simpledialog.askinteger(
+        "Параметры канала",
+        f"Введите индекс конечной вершины (0-{len(graph.vertices) - 1})"
+    )
+
+    if end_vertex_index is not None and 0 <= end_vertex_index < len(graph.vertices):
+        end_vertex = graph.vertices[end_vertex_index]
+
+        for start_v, end_v, _, _ in graph.edges.values():
+            if start_v == start_vertex and end_v == end_vertex:
+                start_idx = graph.vertices.index(start_v)
+                bandwidth, queue = graph.model.link(start_idx, end_vertex_index)
+
+                bandwidth = simpledialog.askfloat(
+                    "Пропускная способность",
+                    "Введите пропускную способность канала, байт в единицу времени (0 - не задана)",
+                    initialvalue=bandwidth or 0, minvalue=0
+                )
+                if bandwidth is None:
+                    return
+                # Как и в настройках моделирования: пустое поле - очередь не задана, 0 - канал без буфера
+                queue = simpledialog.askstring(
+                    "Очередь канала",
+                    "Введите ёмкость очереди канала в пакетах (пусто - не задана, 0 - без буфера)",
+                    initialvalue="" if queue is None else str(queue)
+                )
+                if queue is None:
+                    return
+                if queue.strip() and not queue.strip().isdigit():
+                    messagebox.showwarning("Ошибка", "Ёмкость очереди должна быть неотрицательным целым числом.")
+                    return
+
+                graph.model.set_link(start_idx, end_vertex_index, bandwidth or None,
+                                     int(queue) if queue.strip() else None)
+                return
+
+        messagebox.showwarning("Ошибка", "Дуга между этими вершинами не найдена.")
+
+
 def change_edge_direction(graph, start_vertex):
     """
     Меняет направление ребра, запрашивая конечную вершину.
@@ -239,7 +309,9 @@ def change_edge_direction(graph, start_vertex):
         for edge_id, (start_v, end_v, weight, label_id) in graph.edges.items():
             if start_v == start_vertex and end_v == end_vertex:
                 graph.edges[edge_id] = (end_vertex, start_vertex, weight, label_id)
+                graph.model.reverse_edge(graph.vertices.index(start_v), end_vertex_index)
                 update_edge(graph, edge_id)
+                update_graph_matrix(graph)
                 update_matrix_display(graph)
                 return
 
@@ -250,16 +322,7 @@ def get_adjacency_matrix(graph):
     """
     Возвращает текущую матрицу смежности графа.
     """
-    n = len(graph.vertices)
-    matrix = [[0 for _ in range(n)] for _ in range(n)]
-
-    for edge in graph.edges.values():
-        start_vertex, end_vertex, weight, _ = edge
-        start_idx = graph.vertices.index(start_vertex)
-        end_idx = graph.vertices.index(end_vertex)
-        matrix[start_idx][end_idx] = weight
-
-    return matrix
+    return graph.model.matrix()
 
 
 def on_matrix_change(graph, event, x, y):
@@ -288,16 +351,14 @@ def on_matrix_change(graph, event, x, y):
         for edge_id, (start_v, end_v, weight, label_id) in list(graph.edges.items()):
             if graph.vertices.index(start_v) == x and graph.vertices.index(end_v) == y:
                 if new_weight == 0:
-                    graph.canvas.delete(edge_id)
-                    graph.canvas.delete(label_id)
-                    del graph.edges[edge_id]
-
-                    if edge_id in start_v["edges"]:
-                        start_v["edges"].remove(edge_id)
+                    remove_edge_items(graph, edge_id)
+                    graph.model.remove_edge(x, y)
+                    update_graph_matrix(graph)
                     return update_matrix_display(graph)
 
                 graph.edges[edge_id] = (start_v, end_v, new_weight, label_id)
                 graph.canvas.itemconfig(label_id, text=str(new_weight))
+                graph.model.set_edge(x, y, new_weight)
                 graph.graph[x][y] = new_weight
                 edge_found = True
                 break
@@ -306,7 +367,6 @@ def on_matrix_change(graph, event, x, y):
             start_vertex = graph.vertices[x]
             end_vertex = graph.vertices[y]
             create_edge(graph, start_vertex, end_vertex, new_weight)
-            graph.graph[x][y] = new_weight
 
         update_matrix_display(graph)
 
@@ -323,13 +383,16 @@ def update_matrix_display(graph):
             entry.destroy()
     graph.matrix_entries = []
 
-    adjacency_matrix = get_adjacency_matrix(graph)
-
     # Отображение размера матрицы над ней
     n = len(graph.vertices)
-    graph.matrix_title.config(
-        text=f"Матрица смежности | Размер матрицы: {n}x{n}"
-    )
+    title = f"Матрица смежности | Размер матрицы: {n}x{n}"
+    if n > MATRIX_DISPLAY_LIMIT:
+        graph.matrix_title.config(text=f"{title} (не выводится: больше {MATRIX_DISPLAY_LIMIT} вершин)")
+        graph.on_graph_changed()
+        return
+    graph.matrix_title.config(text=title)
+
+    adjacency_matrix = get_adjacency_matrix(graph)
 
     # Создание заголовка матрицы (номера столбцов)
     header_row = []
@@ -389,22 +452,17 @@ def update_matrix_display(graph):
 
         graph.matrix_entries.append(row_entries)
 
+    graph.on_graph_changed()
+
 
 def update_graph_matrix(graph):
     """
-    Обновляет матрицу смежности графа на основе текущих рёбер.
+    Обновляет матрицу смежности графа на основе модели.
 
     Args:
         graph: Объект графа.
     """
-    n = len(graph.vertices)
-    graph.graph = [[0] * n for _ in range(n)]
-
-    for edge_id, (start_vertex, end_vertex, weight, _) in list(graph.edges.items()):
-        if start_vertex in graph.vertices and end_vertex in graph.vertices:
-            start_idx = graph.vertices.index(start_vertex)
-            end_idx = graph.vertices.index(end_vertex)
-            graph.graph[start_idx][end_idx] = weight
+    graph.graph = graph.model.matrix()
 
 
 def set_start_vertex(graph, vertex):
@@ -419,6 +477,7 @@ def set_start_vertex(graph, vertex):
         graph.canvas.itemconfig(graph.start_vertex["id"], fill="lightblue")
 
     graph.start_vertex = vertex
+    graph.model.start_vertex = graph.vertices.index(vertex)
     graph.canvas.itemconfig(vertex["id"], fill="green")
 
 
@@ -434,6 +493,7 @@ def set_end_vertex(graph, vertex):
         graph.canvas.itemconfig(graph.end_vertex["id"], fill="lightblue")
 
     graph.end_vertex = vertex
+    graph.model.end_vertex = graph.vertices.index(vertex)
     graph.canvas.itemconfig(vertex["id"], fill="red")
 
 
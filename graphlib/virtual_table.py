@@ -0,0 +1,265 @@
+"""
+Виртуализированная таблица для больших объёмов данных.
+
+Данные хранятся в модели TableModel по столбцам (массивы array для числовых столбцов, списки
+для остальных), а ttk.Treeview держит ровно столько строк, сколько видно на экране: при прокрутке
+у этих строк меняются только значения. Сортировка и фильтрация строят массив индексов строк
+модели и не трогают сами данные; очистка заменяет столбцы пустыми за O(1).
+"""
+import tkinter
+from array import array
+from tkinter import ttk
+
+# Высота строки ttk.Treeview по умолчанию (в пикселях)
+ROW_HEIGHT = 20
+
+
+class TableModel:
+    """
+    Данные таблицы по столбцам без обращения к интерфейсу.
+
+    Видимые строки - это view: массив индексов строк, прошедших фильтры, в порядке сортировки
+    (None - все строки в порядке добавления). Он пересчитывается лениво, при первом обращении
+    после изменения данных, фильтров или сортировки.
+    """
+
+    def __init__(self, columns):
+        """
+        Args:
+            columns: Список пар (имя столбца, тип элементов array или None для произвольных значений).
+        """
+        self.names = [name for name, _ in columns]
+        self.typecodes = dict(columns)
+        self.sort_column = None
+        self.descending = False
+        self.filters = {}
+        self.clear()
+
+    def clear(self):
+        """
+        Удаляет все строки за O(1): столбцы заменяются пустыми, фильтры и сортировка сохраняются.
+        """
+        self.data = {
+            name: array(typecode) if typecode else []
+            for name, typecode in self.typecodes.items()
+        }
+        self.size = 0
+        self.view = None
+        self._dirty = False
+
+    def __len__(self):
+        """
+        Количество видимых строк (прошедших фильтры).
+        """
+        self._refresh()
+        return self.size if self.view is None else len(self.view)
+
+    def append(self, values):
+        """
+        Добавляет строку (значения в порядке столбцов).
+        """
+        for name, value in zip(self.names, values):
+            self.data[name].append(value)
+        self.size += 1
+        self._dirty = self._dirty or bool(self.filters) or self.sort_column is not None
+
+    def extend(self, rows):
+        """
+        Добавляет строки одной пакетной операцией.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+
+        for name, column in zip(self.names, zip(*rows)):
+            self.data[name].extend(column)
+        self.size += len(rows)
+        self._dirty = self._dirty or bool(self.filters) or self.sort_column is not None
+
+    def row(self, index):
+        """
+        Возвращает значения видимой строки index.
+        """
+        self._refresh()
+        if self.view is not None:
+            index = self.view[index]
+        return tuple(self.data[name][index] for name in self.names)
+
+    def rows(self, start, stop):
+        """
+        Возвращает значения видимых строк с start по stop (не включая stop).
+        """
+        self._refresh()
+        stop = min(stop, len(self))
+        return [self.row(index) for index in range(max(0, start), stop)]
+
+    def sort(self, column, descending=None):
+        """
+        Сортирует видимые строки по столбцу. Повторный вызов для того же столбца без descending
+        меняет направление сортировки; column=None возвращает порядок добавления.
+        """
+        if descending is None:
+            descending = not self.descending if column == self.sort_column else False
+        self.sort_column = column
+        self.descending = descending
+        self._dirty = True
+
+    def filter(self, column, text):
+        """
+        Оставляет строки, в значении столбца которых есть подстрока text (без учёта регистра).
+        Пустой text снимает фильтр со столбца.
+        """
+        if text:
+            self.filters[column] = str(text).lower()
+        else:
+            self.filters.pop(column, None)
+        self._dirty = True
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        if not self.filters and self.sort_column is None:
+            self.view = None
+            return
+
+        indices = range(self.size)
+        for column, text in self.filters.items():
+            values = self.data[column]
+            indices = [index for index in indices if text in str(values[index]).lower()]
+
+        if self.sort_column is not None:
+            indices = sorted(indices, key=self.data[self.sort_column].__getitem__, reverse=self.descending)
+
+        self.view = array("i", indices)
+
+
+class VirtualTable:
+    """
+    Таблица на ttk.Treeview, которая отображает только видимое окно строк модели.
+
+    Клик по заголовку столбца сортирует таблицу, строка фильтра над таблицей оставляет строки,
+    содержащие введённый текст в выбранном столбце. Добавление строк не перерисовывает таблицу
+    сразу: перерисовка откладывается до простоя цикла событий и выполняется один раз.
+    """
+
+    def __init__(self, parent, columns, height=10, filterable=True):
+        """
+        Args:
+            parent: Родительский виджет.
+            columns: Список троек (имя столбца, тип элементов array или None, заголовок).
+            height: Число видимых строк до первого изменения размера виджета.
+            filterable: Если True, над таблицей показывается строка фильтра.
+        """
+        self.model = TableModel([(name, typecode) for name, typecode, _ in columns])
+        self.headings = {name: heading for name, _, heading in columns}
+        self.offset = 0
+        self.visible = height
+        self._render_pending = False
+
+        self.frame = tkinter.Frame(parent)
+
+        if filterable:
+            filter_frame = tkinter.Frame(self.frame)
+            filter_frame.pack(side='top', fill='x')
+            self.filter_column = ttk.Combobox(filter_frame, values=list(self.headings.values()), state='readonly',
+                                              width=15)
+            self.filter_column.current(0)
+            self.filter_column.pack(side='left')
+            self.filter_text = tkinter.StringVar()
+            entry = tkinter.Entry(filter_frame, textvariable=self.filter_text)
+            entry.pack(side='left', fill='x', expand=True)
+            entry.bind("<KeyRelease>", lambda event: self.apply_filter())
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree = ttk.Treeview(self.frame, columns=self.model.names, show='headings', height=height)
+        for name in self.model.names:
+            self.tree.heading(name, text=self.headings[name], command=lambda column=name: self.sort(column))
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-1))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(1))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def column(self, name, **kwargs):
+        self.tree.column(name, **kwargs)
+
+    def append(self, values):
+        self.model.append(values)
+        self.schedule_render()
+
+    def extend(self, rows):
+        self.model.extend(rows)
+        self.schedule_render()
+
+    def clear(self):
+        self.model.clear()
+        self.offset = 0
+        self.schedule_render()
+
+    def sort(self, column):
+        self.model.sort(column)
+        self.render()
+
+    def apply_filter(self):
+        column = self.model.names[self.filter_column.current()]
+        self.model.filter(column, self.filter_text.get())
+        self.offset = 0
+        self.render()
+
+    def schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.tree.after_idle(self.render)
+
+    def on_resize(self, event):
+        visible = max(1, (event.height - ROW_HEIGHT) // ROW_HEIGHT)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        """
+        Обработчик полосы прокрутки (протокол команды ttk.Scrollbar).
+        """
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.model))
+        elif unit == "pages":
+            self.offset += int(amount) * self.visible
+        else:
+            self.offset += int(amount)
+        self.render()
+
+    def scroll_by(self, rows):
+        self.offset += rows
+        self.render()
+
+    def render(self):
+        """
+        Перерисовывает видимое окно: строки Treeview переиспользуются, меняются только их значения.
+        """
+        self._render_pending = False
+        total = len(self.model)
+        self.offset = max(0, min(self.offset, total - self.visible))
+
+        rows = self.model.rows(self.offset, self.offset + self.visible)
+        items = self.tree.get_children()
+
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.tree.insert("", 'end', values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(rows)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -1,4 +1,4 @@
-from tkinter import Canvas, Button, Frame, BOTH, OptionMenu, StringVar, Y, LEFT, Label
+from tkinter import Canvas, Button, Frame, BOTH, OptionMenu, StringVar, Y, LEFT, Label, messagebox, ttk
 
 import graphlib
 
@@ -68,6 +68,7 @@ class BaseGraphApp:
         self.menus = []
 
         # Инициализация графа
+        self.model = graphlib.GraphModel()
         self.graph = []
         self.vertices = []
         self.edges = {}
@@ -75,11 +76,16 @@ class BaseGraphApp:
         self.start_vertex = None
         self.end_vertex = None
 
+        # Текущий фоновый расчёт и его панель (создаётся при первом запуске)
+        self.job = None
+        self.job_frame = None
+
         # Добавляем необходимое для 3 таски
         if task == "3":
             self.packet_info_window = None
             self.routing_table_window = None
-            self.packet_log = []
+            self.packet_log = graphlib.PacketLog()
+            self.animator = graphlib.PacketAnimator(self.canvas)
             self.routing_tables = {}
             self.counter_of_tries = 0
 
@@ -92,6 +98,85 @@ class BaseGraphApp:
             # Инициализация матрицы смежности
             graphlib.update_matrix_display(self)
 
+    def on_graph_changed(self):
+        """
+        Вызывается после каждого изменения графа через функции редактирования.
+        """
+
+    def on_graph_loaded(self, file_path):
+        """
+        Вызывается после загрузки графа из файла file_path.
+        """
+
+    def run_job(self, description, function, *args, on_done=None, on_partial=None):
+        """
+        Запускает расчёт function(job, *args) в фоновом потоке (см. graphlib.BackgroundJob)
+        и показывает панель с ходом расчёта и кнопкой отмены. Одновременно выполняется
+        только один расчёт.
+
+        Args:
+            description: Что считается (текст панели).
+            function: Функция расчёта. Не должна обращаться к виджетам.
+            *args: Аргументы function - копии данных графа, которые окно может менять.
+            on_done: Обработчик результата (в главном потоке).
+            on_partial: Обработчик промежуточных результатов (в главном потоке).
+
+        Returns:
+            BackgroundJob или None, если уже идёт другой расчёт.
+        """
+        if self.job is not None and self.job.running:
+            messagebox.showwarning("Ошибка", "Дождитесь окончания текущего расчёта или отмените его.")
+            return None
+
+        if self.job_frame is None:
+            self.job_frame = Frame(self.root, pady=5)
+            self.job_var = StringVar()
+            Label(self.job_frame, textvariable=self.job_var).pack(side=LEFT, padx=10)
+            self.job_progress = ttk.Progressbar(self.job_frame, length=300, maximum=1.0)
+            self.job_progress.pack(side=LEFT, padx=10)
+            Button(self.job_frame, text="Отмена", command=lambda: self.job and self.job.cancel()).pack(side=LEFT)
+
+        self.job_description = description
+        self.job_var.set(description)
+        self.job_progress["value"] = 0
+        self.job_frame.pack(side='bottom', fill='x')
+
+        def finish(handler):
+            def handle(*values):
+                self.job_frame.pack_forget()
+                if handler is not None:
+                    handler(*values)
+            return handle
+
+        self.job = graphlib.BackgroundJob(
+            self.root, function, *args,
+            on_done=finish(on_done),
+            on_error=finish(self.on_job_error),
+            on_cancelled=finish(None),
+            on_progress=self.on_job_progress,
+            on_partial=on_partial,
+        )
+        return self.job.start()
+
+    def on_job_progress(self, done, total, stage):
+        """
+        Обновляет панель фонового расчёта.
+        """
+        text = f"{self.job_description}: {stage}" if stage else self.job_description
+        if total:
+            text += f" ({done} из {total})"
+            self.job_progress["value"] = done / total
+        self.job_var.set(text)
+
+    def on_job_error(self, error):
+        """
+        Показывает ошибку фонового расчёта.
+        """
+        if isinstance(error, graphlib.NegativeCycleError):
+            messagebox.showwarning("Ошибка", str(error))
+        else:
+            messagebox.showerror("Ошибка", f"Расчёт завершился с ошибкой: {error}")
+
     def add_button(self, text, command):
         button = Button(self.button_frame, text=text, command=command)
         button.pack(pady=15, anchor="center")
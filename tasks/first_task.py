@@ -1,8 +1,12 @@
+import copy
 from tkinter import messagebox
 
 import graphlib
 from tasks.base_graph import BaseGraphApp
 
+# Начиная с этого размера для загруженного графа строится иерархия сжатия, и пути ищутся по ней
+HIERARCHY_MIN_VERTICES = 500
+
 
 class GraphApp(BaseGraphApp):
     def __init__(self, root):
@@ -11,6 +15,18 @@ class GraphApp(BaseGraphApp):
         self.add_button("Сохранить граф", lambda: graphlib.save_graph(self))
         self.add_button("Загрузить граф", lambda: graphlib.load_graph(self))
 
+    def on_graph_loaded(self, file_path):
+        if len(self.model) >= HIERARCHY_MIN_VERTICES:
+            # Иерархия загружается из файла рядом с графом или строится в фоне и сохраняется туда же
+            self.run_job("Иерархия сжатия", self.build_hierarchy, copy.deepcopy(self.model), file_path)
+
+    @staticmethod
+    def build_hierarchy(job, model, file_path):
+        """
+        Фоновое построение иерархии сжатия для версии графа model (см. graphlib.contraction_hierarchy).
+        """
+        graphlib.contraction_hierarchy(model, file_path)
+
     def find_shortest_path(self):
         if not (self.start_vertex and self.end_vertex):
             messagebox.showwarning("Ошибка", "Необходимо выбрать начальную и конечную вершины.")
@@ -18,12 +34,19 @@ class GraphApp(BaseGraphApp):
 
         start_idx = self.vertices.index(self.start_vertex)
         end_idx = self.vertices.index(self.end_vertex)
-        distance, path = graphlib.dijkstra(self.graph, start_idx, end_idx, True)
+
+        # Иерархия сжатия, если она готова для текущего графа, иначе A* по координатам вершин;
+        # результат кэшируется по паре вершин, пока граф не изменится
+        method = "ch" if graphlib.fresh_hierarchy(self.model) is not None else "astar"
+        distance, path, settled = graphlib.cached_shortest_path(self.model, start_idx, end_idx, method)
 
         if path:
             self.highlight_path(path)
             path_str = ' -> '.join(map(str, path))
-            messagebox.showinfo("Кратчайший путь", f"Длина пути: {distance}\nПуть: {path_str}")
+            messagebox.showinfo(
+                "Кратчайший путь",
+                f"Длина пути: {distance:g}\nПуть: {path_str}\nОбработано вершин: {settled}"
+            )
         else:
             messagebox.showwarning("Нет пути", "Путь между выбранными вершинами не существует.")
 
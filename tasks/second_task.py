@@ -1,12 +1,21 @@
 import time
+from itertools import islice
 from tkinter import Toplevel, Text, messagebox, BOTH, END, ttk
 
 import graphlib
 from tasks.base_graph import BaseGraphApp
 
+# Сколько путей выводится в окне результата (для больших графов, загруженных из файла)
+SHOWN_PATHS_LIMIT = 100
+
 
 class FloydApp(BaseGraphApp):
     def __init__(self, root):
+        # Кратчайшие пути, поддерживаемые после каждого редактирования графа
+        self.apsp = None
+        self.apsp_update_time = 0.0
+        # Граф менялся, пока шёл другой расчёт: пути нужно обновить перед показом
+        self.apsp_pending = False
         super().__init__(root, "Алгоритмы Дейкстры и Флойда", "2")
         self.add_button("Запустить Дейкстру", lambda: self.run_algorithm("dijkstra"))
         self.add_button("Запустить Флойда", lambda: self.run_algorithm("floyd"))
@@ -20,19 +29,48 @@ class FloydApp(BaseGraphApp):
             messagebox.showwarning("Ошибка", "Граф пуст. Добавьте вершины и дуги.")
             return
 
-        # Запуск алгоритма Дейкстры
-        start_time_dijkstra = time.time()
-        dist_matrix_dijkstra, path_matrix_dijkstra = graphlib.dijkstra_all_pairs(self.graph)
-        elapsed_time_dijkstra = time.time() - start_time_dijkstra
-
-        # Запуск алгоритма Флойда-Уоршелла
-        start_time_floyd = time.time()
-        dist_matrix_floyd, next_vertex_floyd = graphlib.floyd_warshall(self.graph)
-        elapsed_time_floyd = time.time() - start_time_floyd
-
-        # Подготовка результатов
-        result_dijkstra = self.prepare_results(dist_matrix_dijkstra, path_matrix_dijkstra, "dijkstra")
-        result_floyd = self.prepare_results(dist_matrix_floyd, next_vertex_floyd, "floyd")
+        # Оба алгоритма и подготовка таблиц выполняются в фоновом потоке
+        self.run_job("Сравнение алгоритмов", self.time_algorithms, [row[:] for row in self.graph], True,
+                     on_done=self.show_comparison, on_partial=self.show_partial_time)
+
+    def time_algorithms(self, job, graph, prepare=False):
+        """
+        Фоновый расчёт: запускает алгоритмы Дейкстры и Флойда-Уоршелла и замеряет время каждого.
+
+        Args:
+            job: Фоновый расчёт (BackgroundJob).
+            graph: Копия матрицы смежности.
+            prepare: Если True, вместо результатов возвращаются готовые строки таблиц.
+
+        Returns:
+            Пары (результат, время выполнения) для Дейкстры и Флойда-Уоршелла.
+        """
+        timings = []
+        for name, algorithm in (("Дейкстра", self.dijkstra_all_pairs), ("Флойд-Уоршелл", self.floyd_warshall)):
+            job.set_stage(name)
+            start_time = time.perf_counter()
+            paths = algorithm(graph, job.progress)
+            elapsed_time = time.perf_counter() - start_time
+            job.partial((name, elapsed_time))
+            timings.append((self.prepare_results(paths) if prepare else paths, elapsed_time))
+
+        return timings
+
+    def show_partial_time(self, value):
+        """
+        Добавляет к панели расчёта время уже завершённого алгоритма.
+        """
+        name, elapsed_time = value
+        self.job_description += f"; {name}: {elapsed_time:.6f} с"
+
+    def show_comparison(self, timings):
+        """
+        Показывает окно с результатами обоих алгоритмов и сравнением времени выполнения.
+
+        Args:
+            timings: Результат time_algorithms с prepare=True.
+        """
+        (result_dijkstra, elapsed_time_dijkstra), (result_floyd, elapsed_time_floyd) = timings
 
         # Создание окна для отображения результатов
         result_window = Toplevel(self.root)
@@ -109,24 +147,61 @@ class FloydApp(BaseGraphApp):
         comparison_label = ttk.Label(comparison_frame, text=f"Сравнение:\n{comparison}", font=("Arial", 14))
         comparison_label.pack(pady=20)
 
-    def prepare_results(self, dist_matrix, path_data, algorithm):
-        n = len(self.vertices)
+    @staticmethod
+    def dijkstra_all_pairs(graph, progress=None):
+        """
+        Запускает алгоритм Дейкстры для всех пар вершин; на больших графах - в пуле процессов.
+        При отрицательных весах используется алгоритм Джонсона.
+
+        Args:
+            graph: Матрица смежности.
+            progress: Функция progress(done, total) (см. graphlib.all_pairs).
+
+        Returns:
+            AllPairsResult.
+        """
+        parallel = len(graph) >= graphlib.algorithms.PARALLEL_MIN_VERTICES
+        algorithm = "johnson" if graphlib.has_negative_weights(graph) else "dijkstra"
+        return graphlib.all_pairs(graph, algorithm, parallel=parallel, progress=progress)
+
+    @staticmethod
+    def floyd_warshall(graph, progress=None):
+        """
+        Запускает алгоритм Флойда-Уоршелла: векторизованную версию, если доступен NumPy,
+        иначе списочную.
+
+        Args:
+            graph: Матрица смежности.
+            progress: Функция progress(done, total) (см. graphlib.all_pairs).
+
+        Returns:
+            AllPairsResult.
+        """
+        paths = graphlib.all_pairs(graph, "floyd", progress=progress)
+        graphlib.check_negative_cycle(paths)
+        return paths
+
+    @staticmethod
+    def timed(job, compute, graph):
+        """
+        Фоновый расчёт compute(graph, progress) с замером времени.
+
+        Returns:
+            Пара (результат, время выполнения).
+        """
+        start_time = time.perf_counter()
+        result = compute(graph, job.progress)
+        return result, time.perf_counter() - start_time
+
+    def prepare_results(self, paths):
         result = []
 
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    if dist_matrix[i][j] != float('inf'):
-                        if algorithm == "dijkstra":
-                            path = graphlib.reconstruct_path(path_data[i], i, j)
-                        else:
-                            path = graphlib.construct_floyd_path(path_data, i, j)
-
-                        path_str = " -> ".join(map(str, path))
-                        dist = dist_matrix[i][j]
-                        result.append((i, j, path_str, dist))
-                    else:
-                        result.append((i, j, "Не существует", "∞"))
+        for i, j, dist, path in paths.pairs():
+            if path:
+                path_str = " -> ".join(map(str, path))
+                result.append((i, j, path_str, f"{dist:g}"))
+            else:
+                result.append((i, j, "Не существует", "∞"))
 
         return result
 
@@ -135,36 +210,100 @@ class FloydApp(BaseGraphApp):
             messagebox.showwarning("Ошибка", "Граф пуст. Добавьте вершины и дуги.")
             return
 
-        start_time = time.time()
+        graph = [row[:] for row in self.graph]
 
         if algorithm == "dijkstra":
-            dist_matrix, path_matrix = graphlib.dijkstra_all_pairs(self.graph)
-            elapsed_time = time.time() - start_time
-            self.show_paths(dist_matrix, path_matrix, elapsed_time, algorithm)
+            self.run_job("Алгоритм Дейкстры", self.timed, self.dijkstra_all_pairs, graph,
+                         on_done=lambda result: self.show_paths(*result, algorithm))
 
         elif algorithm == "floyd":
-            dist_matrix, next_vertex = graphlib.floyd_warshall(self.graph)
-            elapsed_time = time.time() - start_time
-            self.show_paths(dist_matrix, next_vertex, elapsed_time, algorithm)
+            if self.apsp is None:
+                if self.run_job("Алгоритм Флойда", self.timed, graphlib.IncrementalAPSP, graph,
+                                on_done=self.on_apsp_built) is not None:
+                    # Расчёт идёт по текущей копии графа, и прежние правки в нём уже учтены
+                    self.apsp_pending = False
+            elif self.apsp_pending:
+                self.sync_apsp(lambda: self.show_floyd_paths(self.apsp_update_time))
+            else:
+                self.show_floyd_paths(self.apsp_update_time)
+
+    def on_apsp_built(self, result):
+        """
+        Сохраняет кратчайшие пути, построенные в фоне, и показывает их.
+        """
+        self.apsp, elapsed_time = result
+        if self.apsp_pending:
+            # Правки графа, сделанные во время расчёта
+            self.sync_apsp(lambda: self.show_floyd_paths(elapsed_time))
+        else:
+            self.show_floyd_paths(elapsed_time)
+
+    def show_floyd_paths(self, elapsed_time):
+        try:
+            graphlib.check_negative_cycle(self.apsp.dist)
+        except graphlib.NegativeCycleError as e:
+            messagebox.showwarning("Ошибка", str(e))
+            return
 
-    def show_paths(self, dist_matrix, path_data, elapsed_time, algorithm):
-        n = len(self.vertices)
+        paths = graphlib.AllPairsResult.from_matrices(self.apsp.dist, self.apsp.next_vertex, "next")
+        self.show_paths(paths, elapsed_time, "floyd")
+
+    def on_graph_changed(self):
+        """
+        Обновляет поддерживаемые кратчайшие пути после редактирования графа без полного пересчёта.
+        """
+        if self.job is not None and self.job.running:
+            # Пути строятся или обновляются (или идёт другой расчёт): обновим их по окончании
+            self.apsp_pending = True
+        elif self.apsp is not None:
+            self.sync_apsp()
+
+    def sync_apsp(self, then=None):
+        """
+        Обновляет кратчайшие пути в фоне. Пока идёт обновление, self.apsp равно None,
+        чтобы главный поток не читал матрицы, которые меняет рабочий поток.
+
+        Args:
+            then: Функция без аргументов, вызываемая после обновления.
+        """
+        apsp, self.apsp = self.apsp, None
+        self.apsp_pending = False
+        self.run_job("Обновление кратчайших путей", self.timed_sync, apsp, [row[:] for row in self.graph],
+                     on_done=lambda result: self.on_apsp_synced(result, then))
+
+    @staticmethod
+    def timed_sync(job, apsp, graph):
+        """
+        Фоновое обновление apsp по матрице graph с замером времени.
+
+        Returns:
+            Пара (apsp, время обновления).
+        """
+        start_time = time.perf_counter()
+        apsp.sync(graph)
+        return apsp, time.perf_counter() - start_time
+
+    def on_apsp_synced(self, result, then):
+        self.apsp, self.apsp_update_time = result
+        if self.apsp_pending:
+            # Правки графа, сделанные во время обновления
+            self.sync_apsp(then)
+        elif then is not None:
+            then()
+
+    def show_paths(self, paths, elapsed_time, algorithm):
         result = ""
 
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    if dist_matrix[i][j] != float('inf'):
-                        if algorithm == "dijkstra":
-                            path = graphlib.reconstruct_path(path_data[i], i, j)
-                        else:
-                            path = graphlib.construct_floyd_path(path_data, i, j)
-
-                        path_str = " -> ".join(map(str, path))
-                        dist = dist_matrix[i][j]
-                        result += f"Путь из {i} в {j}: {path_str}, длина: {dist}\n"
-                    else:
-                        result += f"Путь из {i} в {j}: не существует\n"
+        for i, j, dist, path in islice(paths.pairs(), SHOWN_PATHS_LIMIT):
+            if path:
+                path_str = " -> ".join(map(str, path))
+                result += f"Путь из {i} в {j}: {path_str}, длина: {dist:g}\n"
+            else:
+                result += f"Путь из {i} в {j}: не существует\n"
+
+        hidden = paths.n * (paths.n - 1) - SHOWN_PATHS_LIMIT
+        if hidden > 0:
+            result += f"... и ещё {hidden} пар вершин\n"
 
         messagebox.showinfo(
             f"Алгоритм {algorithm.capitalize()}",
@@ -176,15 +315,11 @@ class FloydApp(BaseGraphApp):
             messagebox.showwarning("Ошибка", "Граф пуст. Добавьте вершины и дуги.")
             return
 
-        # Время выполнения Дейкстры
-        start_time = time.time()
-        graphlib.dijkstra_all_pairs(self.graph)
-        time_dijkstra = time.time() - start_time
+        self.run_job("Сравнение времени выполнения", self.time_algorithms, [row[:] for row in self.graph],
+                     on_done=self.show_times, on_partial=self.show_partial_time)
 
-        # Время выполнения Флойда
-        start_time = time.time()
-        graphlib.floyd_warshall(self.graph)
-        time_floyd = time.time() - start_time
+    def show_times(self, timings):
+        (_, time_dijkstra), (_, time_floyd) = timings
 
         # Вывод результатов
         messagebox.showinfo(
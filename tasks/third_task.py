@@ -1,10 +1,31 @@
-import random
-from tkinter import messagebox, Frame, Label, Entry, Button, StringVar, IntVar, ttk, LabelFrame
+import copy
+from tkinter import messagebox, Frame, Label, Entry, Button, StringVar, IntVar, DoubleVar, BooleanVar, Checkbutton, \
+    ttk, LabelFrame, TclError
 
 import graphlib
 from tasks.base_graph import BaseGraphApp
 
 
+# Сколько пакетов моделирования воспроизводится анимацией на холсте
+REPLAY_LIMIT = 20
+
+# Множители скорости анимации пакетов
+ANIMATION_SPEEDS = ["0.5", "1", "2", "5", "10"]
+
+# Итоги передачи пакетов для таблицы пакетов
+STATUS_NAMES = {
+    "delivered": "доставлен",
+    "ttl": "истёк hop limit",
+    "no_route": "нет маршрута",
+    "unreachable": "назначение недостижимо",
+    "loss": "потерян в канале",
+    "queue": "очередь канала переполнена",
+}
+
+# Сколько самых загруженных каналов показывается в итогах моделирования
+HOT_LINKS = 3
+
+
 class PacketRoutingApp(BaseGraphApp):
     def __init__(self, root):
         super().__init__(root, "Симуляция передачи пакетов", "3")
@@ -24,12 +45,47 @@ class PacketRoutingApp(BaseGraphApp):
         self.protocol_menu.grid(row=0, column=3, padx=5, pady=5, sticky='w')
         self.protocol_menu.current(0)
 
+        # Вероятность потери пакета при каждой передаче по каналу
+        Label(settings_frame, text="Потери в канале, %:").grid(row=1, column=0, padx=5, pady=5, sticky='e')
+        self.loss_var = DoubleVar(value=0.0)
+        Entry(settings_frame, textvariable=self.loss_var, width=5).grid(row=1, column=1, padx=5, pady=5, sticky='w')
+
+        # Параметры каналов, для которых они не заданы в меню дуги (пустое поле - без ограничения,
+        # очередь 0 - канал без буфера)
+        Label(settings_frame, text="Пропускная способность:").grid(row=1, column=2, padx=5, pady=5, sticky='e')
+        self.bandwidth_var = StringVar(value="")
+        Entry(settings_frame, textvariable=self.bandwidth_var, width=7).grid(row=1, column=3, padx=5, pady=5,
+                                                                             sticky='w')
+        Label(settings_frame, text="Очередь канала:").grid(row=1, column=4, padx=5, pady=5, sticky='e')
+        self.queue_var = StringVar(value="")
+        Entry(settings_frame, textvariable=self.queue_var, width=5).grid(row=1, column=5, padx=5, pady=5, sticky='w')
+
+        Label(settings_frame, text="Скорость анимации:").grid(row=0, column=4, padx=5, pady=5, sticky='e')
+        self.speed_var = StringVar(value="1")
+        speed_menu = ttk.Combobox(settings_frame, textvariable=self.speed_var, values=ANIMATION_SPEEDS,
+                                  state='readonly', width=5)
+        speed_menu.grid(row=0, column=5, padx=5, pady=5, sticky='w')
+        speed_menu.bind("<<ComboboxSelected>>", lambda event: self.update_animation())
+
+        # В режиме пропуска летит лишь несколько пакетов, остальные сразу считаются доставленными
+        self.skip_animation_var = BooleanVar(value=False)
+        Checkbutton(settings_frame, text="Без анимации", variable=self.skip_animation_var,
+                    command=self.update_animation).grid(row=0, column=6, padx=5, pady=5, sticky='w')
+
         routing_frame = Frame(root, pady=10)
         routing_frame.pack(side='top', fill='x')
 
+        # Итоги последнего моделирования
+        self.stats_var = StringVar(value="")
+        Label(routing_frame, textvariable=self.stats_var, justify='left').pack(side='left', padx=10)
+
         self.add_button("Случайная маршрутизация", lambda: self.start_routing("random"))
         self.add_button("Лавинная маршрутизация", lambda: self.start_routing("flooding"))
         self.add_button("Маршрутизация по предыдущему опыту", lambda: self.start_routing("historical"))
+        self.add_button("Вектор расстояний", lambda: self.run_protocol("distance_vector"))
+        self.add_button("Состояние каналов", lambda: self.run_protocol("link_state"))
+        self.add_button("Журнал пакетов", lambda: graphlib.show_packet_log(self))
+        self.add_button("Выгрузить журнал", lambda: graphlib.export_packet_log(self))
         self.add_button("Сохранить граф", lambda: graphlib.save_graph(self))
         self.add_button("Загрузить граф", lambda: graphlib.load_graph(self, False))
 
@@ -39,34 +95,38 @@ class PacketRoutingApp(BaseGraphApp):
         routing_table_frame = LabelFrame(results_frame, text="Таблица маршрутизации", padx=10, pady=10)
         routing_table_frame.pack(side='left', fill='both', padx=5, pady=5)
 
-        # self.routing_tree = ttk.Treeview(routing_table_frame, columns=("Destination", "Next Hop", "Hops"), show='headings')
-        self.routing_tree = ttk.Treeview(routing_table_frame, columns=("Destination", "Hops"), show='headings')
-        self.routing_tree.heading("Destination", text="Пункт назначения")
-        # self.routing_tree.heading("Next Hop", text="Следующий узел")
-        self.routing_tree.heading("Hops", text="Пройденные узлы")
+        self.routing_tree = graphlib.VirtualTable(routing_table_frame, [
+            ("Destination", None, "Пункт назначения"),
+            ("Hops", None, "Пройденные узлы"),
+        ], filterable=False)
         self.routing_tree.pack(fill='both', expand=True)
 
         packet_data_frame = LabelFrame(results_frame, text="Данные о пакетах", padx=10, pady=10)
         packet_data_frame.pack(side='right', fill='both', expand=True, padx=5, pady=5)
 
-        self.packet_tree = ttk.Treeview(packet_data_frame,
-                                        columns=("Packet ID", "Path", "Protocol", "PacketSize", "HopLimit"),
-                                        show='headings')
-        self.packet_tree.heading("Packet ID", text="ID пакета")
-        self.packet_tree.heading("Path", text="Маршрут")
-        self.packet_tree.heading("Protocol", text="Протокол")
-        self.packet_tree.heading("PacketSize", text="Размер пакета")
-        self.packet_tree.heading("HopLimit", text="Время жизни")
+        # Таблица хранит все пакеты запуска в модели и отображает только видимые строки
+        self.packet_tree = graphlib.VirtualTable(packet_data_frame, [
+            ("Packet ID", "q", "ID пакета"),
+            ("Path", None, "Маршрут"),
+            ("Protocol", None, "Протокол"),
+            ("PacketSize", "i", "Размер пакета"),
+            ("HopLimit", "i", "Время жизни"),
+            ("Status", None, "Итог"),
+        ])
         self.packet_tree.column("Packet ID", width=10)
         self.packet_tree.column("Path", width=100)
         self.packet_tree.column("Protocol", width=10)
         self.packet_tree.column("PacketSize", width=10)
         self.packet_tree.column("HopLimit", width=10)
+        self.packet_tree.column("Status", width=10)
         self.packet_tree.pack(fill='both', expand=True)
 
         reset_button = Button(root, text="Сбросить таблицы", command=self.reset_tables)
         reset_button.pack(side='bottom', pady=10)
 
+        # Сошедшиеся протоколы маршрутизации по ключам PROTOCOLS
+        self.protocols = {}
+
     def start_routing(self, algorithm):
         if not (self.start_vertex and self.end_vertex):
             messagebox.showwarning("Ошибка", "Необходимо выбрать начальную и конечную вершины.")
@@ -82,39 +142,179 @@ class PacketRoutingApp(BaseGraphApp):
 
         protocol = self.protocol_var.get()
 
-        self.counter_of_tries += 1
-        self.reset_tables()
-        routing_tables = {}
+        try:
+            loss = self.loss_var.get() / 100
+            if not 0 <= loss < 1:
+                raise ValueError
+        except (TclError, ValueError):
+            messagebox.showwarning("Ошибка", "Потери в канале должны быть числом от 0 до 100 (не включая 100).")
+            return
 
-        if algorithm == "random":
-            all_paths, algorithm_name = graphlib.algorithms.random_routing(self, num_packets, protocol)
-        elif algorithm == "flooding":
-            all_paths, algorithm_name = graphlib.algorithms.flooding_routing(self, num_packets, protocol)
-        elif algorithm == "historical":
-            all_paths, routing_tables, algorithm_name = graphlib.algorithms.historical_routing(self, num_packets, protocol)
-        else:
+        try:
+            bandwidth = float(self.bandwidth_var.get()) if self.bandwidth_var.get().strip() else None
+            queue_limit = int(self.queue_var.get()) if self.queue_var.get().strip() else None
+            if (bandwidth is not None and bandwidth <= 0) or (queue_limit is not None and queue_limit < 0):
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Ошибка", "Пропускная способность должна быть положительным числом, а очередь "
+                                             "канала - неотрицательным целым (пустое поле - без ограничения).")
+            return
+
+        if algorithm not in graphlib.STRATEGIES:
             messagebox.showwarning("Ошибка", "Неизвестный алгоритм маршрутизации.")
             return
 
-        if not all_paths:
+        start_idx = self.vertices.index(self.start_vertex)
+        end_idx = self.vertices.index(self.end_vertex)
+
+        # Моделирование идёт в фоне над копией модели: граф на холсте можно менять во время расчёта
+        model = copy.deepcopy(self.model)
+        job = self.run_job("Моделирование", self.simulate_routing, model, algorithm, num_packets, start_idx,
+                           end_idx, protocol, loss, bandwidth, queue_limit, self.counter_of_tries + 1,
+                           on_done=lambda result: self.show_routing(num_packets, protocol, *result))
+        if job is not None:
+            self.counter_of_tries += 1
+            self.reset_tables()
+
+    def simulate_routing(self, job, model, algorithm, num_packets, start_idx, end_idx, protocol, loss, bandwidth,
+                         queue_limit, run):
+        """
+        Фоновый расчёт: моделирует передачу пакетов поверх транспорта protocol (bandwidth и queue_limit -
+        параметры каналов, для которых они не заданы в модели). Для маршрутизации по предыдущему опыту
+        возвращает и таблицы, которые узлы выучили на этих пакетах.
+
+        Returns:
+            Пара (Simulator, таблицы маршрутизации узлов или None).
+        """
+        # Все пакеты проходят через модель, а на холсте воспроизводятся только первые REPLAY_LIMIT из них.
+        # Модель пишет в собственный журнал: основной журнал читают окна главного потока, и записи
+        # переносятся в него только по окончании расчёта (show_routing)
+        job.set_stage("передача пакетов")
+        log = graphlib.PacketLog(self.packet_log.capacity)
+        simulator = graphlib.simulate(model, algorithm, num_packets, start_idx, end_idx, undirected=True,
+                                      trace_limit=REPLAY_LIMIT, log=log, run=run, progress=job.progress,
+                                      protocol=protocol, loss=loss, bandwidth=bandwidth, queue_limit=queue_limit)
+
+        # Таблицы узлов, которые выучила маршрутизация по предыдущему опыту на этих пакетах
+        routing_tables = None
+        if algorithm == "historical":
+            routing_tables = simulator.strategy.router.tables(model.names)
+
+        return simulator, routing_tables
+
+    def show_routing(self, num_packets, protocol, simulator, node_tables):
+        """
+        Показывает итоги фонового моделирования и воспроизводит первые пакеты на холсте.
+        """
+        algorithm_name = simulator.strategy.name
+        self.packet_log.extend(simulator.log)
+        self.show_stats(simulator.stats, simulator.transport, simulator.link_summary(HOT_LINKS), simulator.model.names)
+        self.packet_tree.extend(self.packet_rows(simulator.stats.generated, protocol))
+        if node_tables is not None:
+            self.routing_tables = node_tables
+
+        replay = [entry for entry in simulator.trace if entry["status"] == "delivered"]
+        if not replay:
+            messagebox.showwarning("Ошибка", "Не удалось доставить ни одного пакета до конечной вершины.")
             return
 
-        if algorithm != "historical":
-            for path in all_paths:
-                destination = path[-1]["name"]
-                hops = len(path) - 1
-                routing_tables[destination] = {"hops": hops}
+        routing_tables = {}
+        for entry in replay:
+            if entry["kind"] != "data":
+                continue
+            destination = simulator.model.names[entry["destination"]]
+            routing_tables[destination] = {"hops": len(entry["path"]) - 1}
 
         self.update_routing_table(routing_tables)
 
-        for packet_index, path in enumerate(all_paths, start=1):
-            packet_size = random.randint(100, 1000)
-            hop_limit = len(path) - 1
-            if algorithm != "historical":
-                self.update_packet_data(packet_index, [vertex["name"] for vertex in path], protocol, packet_size,
-                                        hop_limit)
-            else:
-                self.update_packet_data(packet_index, [vertex for vertex in path], protocol, packet_size, hop_limit)
+        # Граф могли изменить во время расчёта: воспроизводятся только маршруты по существующим вершинам
+        if any(vertex >= len(self.vertices) for entry in replay for vertex in entry["path"]):
+            return
+
+        for entry in replay:
+            graphlib.display_packet_path(self, entry["path"], algorithm_name, num_packets, entry["size"],
+                                         entry["hop_limit"], log=False)
+
+    def update_animation(self):
+        """
+        Применяет к планировщику анимации выбранные скорость и режим пропуска.
+        """
+        self.animator.speed = float(self.speed_var.get())
+        self.animator.skip = self.skip_animation_var.get()
+        if self.animator.skip:
+            self.animator.finish_all()
+
+    def run_protocol(self, kind):
+        """
+        Запускает протокол маршрутизации на текущем графе и показывает таблицы узлов. Повторный
+        запуск после изменения весов рёбер доводит протокол до новой сходимости, и в итогах
+        видна цена этой сходимости.
+
+        Args:
+            kind: Ключ PROTOCOLS ("distance_vector" или "link_state").
+        """
+        if len(self.model) < 2:
+            messagebox.showwarning("Ошибка", "Для работы протокола нужно хотя бы две вершины.")
+            return
+
+        protocol = self.protocols.get(kind)
+        if protocol is None:
+            protocol = self.protocols[kind] = graphlib.PROTOCOLS[kind](self.model)
+            report = protocol.run()
+        else:
+            report = protocol.update(self.model)
+
+        self.stats_var.set(
+            f"{protocol.name}: раундов - {report.rounds}, сообщений - {report.messages}, "
+            f"байт - {report.bytes}, изменено записей - {report.changes}"
+        )
+        self.routing_tables = protocol.tables(self.model.names)
+        graphlib.show_routing_tables(self)
+
+    def show_stats(self, stats, transport=None, links=(), names=None):
+        """
+        Выводит итоги моделирования под настройками.
+
+        Args:
+            stats: Итоги моделирования (SimulationStats), в том числе служебные сегменты транспорта.
+            transport: Транспорт моделирования (Transport) с итогами потока данных.
+            links: Итоги самых загруженных каналов (Simulator.link_summary).
+            names: Имена узлов модели для подписей каналов.
+        """
+        summary = stats.summary()
+        text = (
+            f"Отправлено: {summary['generated']}, доставлено: {summary['delivered']}, "
+            f"потеряно: {stats.dropped_total}, пересылок: {summary['transmissions']}"
+        )
+        if "latency_mean" in summary:
+            text += (
+                f"\nЗадержка: средняя {summary['latency_mean']:.2f}, медиана {summary['latency_median']:g}, "
+                f"95% {summary['latency_p95']:g}; пересылок на пакет: {summary['hops_mean']:.2f}"
+            )
+
+        for flow in transport.summary()["flows"] if transport is not None else []:
+            text += (
+                f"\n{flow['protocol']}: доставлено данных {flow['delivered']} из {flow['submitted']}, "
+                f"повторных передач {flow['retransmissions']}; пропускная способность {flow['throughput']:.1f} Б/ед., "
+                f"полезная {flow['goodput']:.1f} Б/ед."
+            )
+            if "latency_p50" in flow:
+                text += (
+                    f"\nЗадержка данных: медиана {flow['latency_p50']:g}, 95% {flow['latency_p95']:g}, "
+                    f"99% {flow['latency_p99']:g}"
+                )
+            if flow["state"] == "reset":
+                text += "\nСоединение TCP разорвано: превышено число повторов."
+
+        # Загрузка считается только для каналов с ограниченной пропускной способностью
+        hot_links = [link for link in links if link["bandwidth"] is not None]
+        if hot_links:
+            text += "\nЗагруженные каналы: " + "; ".join(
+                f"{names[link['link'][0]]} -> {names[link['link'][1]]}: {link['utilization']:.0%}, "
+                f"потеряно {link['drops']}, очередь до {link['max_queue']}"
+                for link in hot_links
+            )
+        self.stats_var.set(text)
 
     def update_routing_table(self, routing_tables):
         """
@@ -123,28 +323,37 @@ class PacketRoutingApp(BaseGraphApp):
         Args:
             routing_tables: Словарь таблиц маршрутизации.
         """
-        for item in self.routing_tree.get_children():
-            self.routing_tree.delete(item)
-
-        for destination, info in routing_tables.items():
-            # next_hop = info.get("next_hop", "")
-            hops = info.get("hops", "")
-            # self.routing_tree.insert("", 'end', values=(destination, next_hop, hops))
-            self.routing_tree.insert("", 'end', values=(destination, hops))
+        self.routing_tree.clear()
+        self.routing_tree.extend((destination, info.get("hops", "")) for destination, info in routing_tables.items())
 
-    def update_packet_data(self, packet_id, path, protocol, packet_size, hop_limit):
+    def packet_rows(self, count, protocol):
         """
-        Обновляет отображение данных о пакетах в GUI.
+        Формирует строки таблицы пакетов из последних count записей журнала.
+
+        Строки собираются по столбцам журнала; маршрут известен только для пакетов,
+        которые модель трассировала (первые REPLAY_LIMIT). Текст маршрутов строится только
+        для добавляемых записей.
 
         Args:
-            packet_id: Идентификатор пакета.
-            path: Маршрут пакета.
+            count: Число пакетов последнего запуска.
             protocol: Протокол передачи данных.
-            packet_size: Размер пакета.
-            hop_limit: Время жизни пакета.
+
+        Returns:
+            list: Строки в порядке столбцов packet_tree.
         """
-        path_str = " -> ".join(map(str, path))
-        self.packet_tree.insert("", 'end', values=(packet_id, path_str, protocol, packet_size, hop_limit))
+        log = self.packet_log
+        start = len(log) - min(count, len(log))
+        statuses = [STATUS_NAMES.get(status, status) for status in log.statuses]
+        columns = [log.column(name)[start:] for name in ("packet_id", "path", "size", "hop_limit", "status")]
+
+        paths = {-1: ""}
+        for path_id in set(columns[1]) - paths.keys():
+            paths[path_id] = " -> ".join(map(str, log.path(path_id)))
+
+        return [
+            (packet_id, paths[path_id], protocol, size, hop_limit, statuses[status])
+            for packet_id, path_id, size, hop_limit, status in zip(*columns)
+        ]
 
     def get_edge_weight(self, from_node, to_node):
         """
@@ -166,8 +375,5 @@ class PacketRoutingApp(BaseGraphApp):
         """
         Сбрасывает таблицы маршрутизации и данные о пакетах.
         """
-        for item in self.routing_tree.get_children():
-            self.routing_tree.delete(item)
-
-        for item in self.packet_tree.get_children():
-            self.packet_tree.delete(item)
+        self.routing_tree.clear()
+        self.packet_tree.clear()
@@ -0,0 +1,38 @@
+import unittest
+
+from graphlib.benchmark import compare
+
+
+def report(relative, calibration, median=None, peak_memory=1000):
+    entry = dict(family="grid", size=50, seed=0, engine="dijkstra", relative=relative, calibration=calibration,
+                 median=relative * calibration if median is None else median, peak_memory=peak_memory)
+    return {"meta": {}, "results": [entry]}
+
+
+class CompareTest(unittest.TestCase):
+    def test_slower_machine_is_not_regression(self):
+        # Тот же алгоритм на вдвое более медленной машине: секунды выросли, отношение к calibrate - нет
+        self.assertEqual(compare(report(4.0, 0.002), report(4.1, 0.001)), [])
+
+    def test_slower_algorithm_is_regression(self):
+        regressions = compare(report(8.0, 0.001), report(4.0, 0.001))
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("время", regressions[0])
+
+    def test_min_delta_for_fast_timings(self):
+        self.assertEqual(compare(report(2.0, 0.0001), report(1.0, 0.0001)), [])
+
+    def test_baseline_without_relative(self):
+        baseline = report(1.0, 0.001, median=0.010)
+        for entry in baseline["results"]:
+            del entry["relative"]
+        self.assertEqual(len(compare(report(1.0, 0.001, median=0.020), baseline)), 1)
+
+    def test_memory_regression(self):
+        regressions = compare(report(4.0, 0.001, peak_memory=2000), report(4.0, 0.001))
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("память", regressions[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
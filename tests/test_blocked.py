@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from graphlib import blocked
+from graphlib.algorithms import floyd_warshall
+from graphlib.blocked import blocked_floyd_warshall, open_blocked_result
+
+
+def random_graph(n, seed):
+    """
+    Случайная матрица смежности с отрицательными рёбрами, но только с циклами положительного веса
+    (при циклах нулевого веса next_vertex восстанавливается неоднозначно, см. blocked_floyd_warshall).
+    """
+    rng = random.Random(seed)
+    while True:
+        graph = [
+            [rng.choice((-1, *range(1, 10))) if i != j and rng.random() < 0.15 else 0 for j in range(n)]
+            for i in range(n)
+        ]
+        dist, _ = floyd_warshall(graph)
+        if all(graph[i][h] + dist[h][i] > 0 for i in range(n) for h in range(n) if graph[i][h]):
+            return graph
+
+
+class Interrupted(Exception):
+    pass
+
+
+@unittest.skipIf(blocked.np is None, "NumPy не установлен")
+class BlockedFloydWarshallTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = self.directory.name
+
+    def assert_matches_floyd(self, result, graph):
+        dist, _ = floyd_warshall(graph)
+        n = len(graph)
+        for i in range(n):
+            for j in range(n):
+                self.assertEqual(result.distance(i, j), dist[i][j])
+                if i != j and result.has_path(i, j):
+                    path = result.path(i, j)
+                    self.assertEqual((path[0], path[-1]), (i, j))
+                    self.assertEqual(sum(graph[u][v] for u, v in zip(path, path[1:])), dist[i][j])
+
+    def test_matches_floyd_warshall(self):
+        # Размер не кратен ни блоку, ни ширине плитки
+        graph = random_graph(37, 1)
+        result = blocked_floyd_warshall(graph, self.path, block_size=8, tile_columns=5)
+        self.assert_matches_floyd(result, graph)
+
+    def test_float32(self):
+        graph = random_graph(20, 2)
+        result = blocked_floyd_warshall(graph, self.path, block_size=8, dtype="float32", tile_columns=5)
+        self.assert_matches_floyd(result, graph)
+
+    def interrupt_after(self, graph, blocks, **kwargs):
+        process = blocked._process_k_block
+        calls = []
+
+        def process_some(dist, kb, block_size, tile_columns):
+            if len(calls) == blocks:
+                raise Interrupted()
+            calls.append(kb)
+            process(dist, kb, block_size, tile_columns)
+
+        with mock.patch.object(blocked, "_process_k_block", process_some):
+            with self.assertRaises(Interrupted):
+                blocked_floyd_warshall(graph, self.path, block_size=8, tile_columns=5, **kwargs)
+
+    def run_counting(self, graph, **kwargs):
+        with mock.patch.object(blocked, "_process_k_block", wraps=blocked._process_k_block) as process:
+            result = blocked_floyd_warshall(graph, self.path, block_size=8, tile_columns=5, **kwargs)
+        return result, [call.args[1] for call in process.call_args_list]
+
+    def test_resume_from_completed_blocks(self):
+        graph = random_graph(37, 3)
+        self.interrupt_after(graph, 2)
+
+        self.assertEqual(blocked._read_meta(self.path)["completed_blocks"], 2)
+        with self.assertRaises(ValueError):
+            open_blocked_result(self.path)
+
+        result, processed = self.run_counting(graph)
+        self.assertEqual(processed, [2, 3, 4])
+        self.assert_matches_floyd(result, graph)
+
+    def test_fingerprint_mismatch_restarts(self):
+        graph = random_graph(37, 4)
+        self.interrupt_after(graph, 3)
+
+        changed = [row[:] for row in graph]
+        changed[0][36] = 1 if changed[0][36] != 1 else 2
+        result, processed = self.run_counting(changed)
+        self.assertEqual(processed, [0, 1, 2, 3, 4])
+        self.assert_matches_floyd(result, changed)
+
+    def test_resume_disabled_restarts(self):
+        graph = random_graph(37, 5)
+        self.interrupt_after(graph, 2)
+        _, processed = self.run_counting(graph, resume=False)
+        self.assertEqual(processed, [0, 1, 2, 3, 4])
+
+    def test_open_missing_result(self):
+        with self.assertRaises(FileNotFoundError):
+            open_blocked_result(os.path.join(self.path, "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import random
+import unittest
+
+from graphlib import algorithms
+from graphlib.algorithms import build_adjacency, dijkstra, dijkstra_all_pairs, dijkstra_rows_parallel, \
+    floyd_warshall, floyd_warshall_numpy, reconstruct_path, reverse_adjacency, shortest_path
+
+
+def random_matrix(n, seed, p=0.3, low=1):
+    rng = random.Random(seed)
+    return [[rng.randint(low, 9) if i != j and rng.random() < p else 0 for j in range(n)] for i in range(n)]
+
+
+def quadratic_dijkstra(graph, start):
+    """
+    Прежняя реализация алгоритма Дейкстры за O(V^2) по матрице смежности - эталон для сравнения.
+    """
+    n = len(graph)
+    dist = [float('inf')] * n
+    dist[start] = 0
+    visited = [False] * n
+
+    for _ in range(n):
+        u = min((i for i in range(n) if not visited[i]), key=dist.__getitem__, default=-1)
+        if u == -1 or dist[u] == float('inf'):
+            break
+        visited[u] = True
+        for v in range(n):
+            if graph[u][v] > 0 and not visited[v] and dist[u] + graph[u][v] < dist[v]:
+                dist[v] = dist[u] + graph[u][v]
+
+    return dist
+
+
+def path_length(graph, path):
+    return sum(graph[u][v] for u, v in zip(path, path[1:]))
+
+
+class HeapDijkstraTest(unittest.TestCase):
+    def test_matches_quadratic_version(self):
+        for seed in range(20):
+            graph = random_matrix(12, seed)
+            for start in range(len(graph)):
+                dist, parent = dijkstra(graph, start, return_parent=True)
+                self.assertEqual(dist, quadratic_dijkstra(graph, start))
+                for end in range(len(graph)):
+                    if end != start and dist[end] != float('inf'):
+                        self.assertEqual(path_length(graph, reconstruct_path(parent, start, end)), dist[end])
+
+    def test_negative_edges_ignored(self):
+        graph = [[0, -1, 4], [0, 0, 1], [0, 0, 0]]
+        self.assertEqual(dijkstra(graph, 0)[0], quadratic_dijkstra(graph, 0))
+
+
+@unittest.skipIf(algorithms.np is None, "NumPy не установлен")
+class FloydWarshallNumpyTest(unittest.TestCase):
+    def test_matches_floyd_warshall(self):
+        for seed in range(10):
+            # Отрицательные рёбра без циклов отрицательного веса: веса -1 только из меньшей вершины в большую
+            graph = random_matrix(10, seed)
+            for i in range(10):
+                for j in range(i + 1, 10):
+                    if graph[i][j] and (i + j + seed) % 5 == 0:
+                        graph[i][j] = -1
+            dist, next_vertex = floyd_warshall(graph)
+
+            for dtype in algorithms.FLOYD_DTYPES:
+                with self.subTest(seed=seed, dtype=dtype):
+                    numpy_dist, numpy_next = floyd_warshall_numpy(graph, dtype=dtype)
+                    self.assertEqual(numpy_dist.tolist(), dist)
+                    self.assertEqual(numpy_next.tolist(), next_vertex)
+
+    def test_default_dtype(self):
+        graph = random_matrix(8, 0)
+        self.assertEqual(floyd_warshall_numpy(graph)[0].tolist(), floyd_warshall(graph)[0])
+        graph[0][1] = 0.5
+        self.assertEqual(floyd_warshall_numpy(graph)[0].tolist(), floyd_warshall(graph)[0])
+
+
+class ParallelDijkstraTest(unittest.TestCase):
+    def test_matches_serial(self):
+        graph = random_matrix(30, 1, p=0.1)
+        adjacency = build_adjacency(graph)
+        n = len(graph)
+        dist_matrix, _ = dijkstra_all_pairs(graph)
+
+        dist, parent = dijkstra_rows_parallel(adjacency, workers=2, chunk_size=4)
+        self.assertEqual([list(dist[i * n:(i + 1) * n]) for i in range(n)], dist_matrix)
+        for i in range(n):
+            for j in range(n):
+                if i != j and dist[i * n + j] != float('inf'):
+                    self.assertEqual(dist[i * n + parent[i * n + j]] + graph[parent[i * n + j]][j], dist[i * n + j])
+
+        parallel_dist, _ = dijkstra_all_pairs(graph, parallel=True, workers=2, chunk_size=4)
+        self.assertEqual(parallel_dist, dist_matrix)
+
+    def test_sources_subset(self):
+        graph = random_matrix(20, 2, p=0.15)
+        adjacency = build_adjacency(graph)
+        dist_matrix, _ = dijkstra_all_pairs(graph)
+
+        sources = [3, 0, 17]
+        dist, _ = dijkstra_rows_parallel(adjacency, workers=2, sources=sources)
+        for row, source in enumerate(sources):
+            self.assertEqual(list(dist[row * 20:(row + 1) * 20]), dist_matrix[source])
+
+
+class PointToPointTest(unittest.TestCase):
+    def test_matches_dijkstra(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            n = 15
+            coords = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)]
+            graph = random_matrix(n, seed, p=0.2)
+            adjacency = build_adjacency(graph)
+            reverse = reverse_adjacency(adjacency)
+
+            for start in range(n):
+                expected = dijkstra(graph, start)[0]
+                for end in range(n):
+                    for method in ("dijkstra", "bidirectional", "astar"):
+                        with self.subTest(seed=seed, start=start, end=end, method=method):
+                            dist, path, _ = shortest_path(graph, start, end, method, coords=coords,
+                                                          adjacency=adjacency, reverse=reverse)
+                            self.assertEqual(dist, expected[end])
+                            if dist == float('inf'):
+                                self.assertEqual(path, [])
+                            else:
+                                self.assertEqual((path[0], path[-1]), (start, end))
+                                self.assertEqual(path_length(graph, path), dist)
+
+
+if __name__ == "__main__":
+    unittest.main()
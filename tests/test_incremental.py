@@ -0,0 +1,79 @@
+import random
+import unittest
+from unittest import mock
+
+from graphlib.algorithms import floyd_warshall
+from graphlib.incremental import IncrementalAPSP
+
+
+class IncrementalAPSPTest(unittest.TestCase):
+    def assert_matches_rebuild(self, apsp):
+        dist, _ = floyd_warshall(apsp.weights)
+        self.assertEqual(apsp.dist, dist)
+
+    def test_remove_negative_cycle_edge(self):
+        apsp = IncrementalAPSP([[0, 1, 0], [0, 0, 1], [0, 0, 0]])
+        apsp.set_edge(2, 0, -5)
+        self.assertLess(apsp.dist[0][0], 0)
+
+        apsp.set_edge(2, 0, 0)
+        self.assertEqual(apsp.dist, [[0, 1, 2], [float('inf'), 0, 1], [float('inf'), float('inf'), 0]])
+        self.assert_matches_rebuild(apsp)
+
+    def test_raise_negative_edge_to_positive(self):
+        apsp = IncrementalAPSP([[0, 1, 0], [0, 0, 1], [0, 0, 0]])
+        apsp.set_edge(2, 0, -1)
+        apsp.set_edge(2, 0, 4)
+        self.assert_matches_rebuild(apsp)
+
+    def test_positive_updates(self):
+        apsp = IncrementalAPSP([[0, 4, 1], [0, 0, 0], [0, 2, 0]])
+        apsp.set_edge(0, 2, 5)
+        self.assert_matches_rebuild(apsp)
+        apsp.remove_edge(2, 1)
+        self.assert_matches_rebuild(apsp)
+
+    def test_negative_edge_counter(self):
+        apsp = IncrementalAPSP([[0, 1, 0], [0, 0, 1], [-1, 0, 0]])
+        self.assertEqual(apsp.negative, 1)
+        apsp.set_edge(0, 2, -2)
+        self.assertEqual(apsp.negative, 2)
+        apsp.set_edge(2, 0, 3)
+        apsp.remove_edge(0, 2)
+        self.assertEqual(apsp.negative, 0)
+        apsp.sync([[0, -1], [0, 0]])
+        self.assertEqual(apsp.negative, 1)
+
+    def test_negative_edge_does_not_force_rebuild(self):
+        apsp = IncrementalAPSP([[0, 4, 0, 0], [0, 0, -2, 0], [0, 0, 0, 3], [1, 0, 0, 0]])
+        with mock.patch.object(apsp, "rebuild") as rebuild:
+            apsp.set_edge(0, 1, 6)
+            apsp.set_edge(2, 3, 0)
+            apsp.set_edge(0, 3, 2)
+            apsp.set_edge(1, 2, -1)
+        rebuild.assert_not_called()
+        self.assert_matches_rebuild(apsp)
+
+    def test_random_edits_with_negative_edges(self):
+        rng = random.Random(6)
+        for _ in range(20):
+            n = rng.randint(2, 8)
+            graph = [[0] * n for _ in range(n)]
+            apsp = IncrementalAPSP(graph)
+            for _ in range(30):
+                u, v = rng.randrange(n), rng.randrange(n)
+                if u == v:
+                    continue
+                weight = rng.choice([0, 0, rng.randint(-3, 9)])
+                graph[u][v] = weight
+                apsp.sync(graph)
+                dist, _ = floyd_warshall(graph)
+                if any(dist[i][i] < 0 for i in range(n)):
+                    # Расстояния по отрицательному циклу зависят от порядка вычислений
+                    self.assertTrue(any(apsp.dist[i][i] < 0 for i in range(n)))
+                else:
+                    self.assertEqual(apsp.dist, dist)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+from graphlib.packet_log import COLUMNS, PacketLog
+
+
+def fill(log, count, start=0):
+    for i in range(start, start + count):
+        log.append(i % 3, (i + 1) % 3, path=[i % 3, (i + 1) % 3] if i % 2 else None, size=100 + i,
+                   hop_limit=i, algorithm="flood" if i % 2 else "random", created=float(i), finished=i + 0.5,
+                   status="delivered" if i % 4 else "ttl", run=i // 2, names=["A", "B", "C"])
+
+
+class PacketLogTest(unittest.TestCase):
+    def test_ring_wrap_around(self):
+        log = PacketLog(capacity=4)
+        fill(log, 10)
+
+        self.assertEqual(len(log), 4)
+        self.assertEqual(log.total, 10)
+        self.assertEqual(list(log.column("packet_id")), [7, 8, 9, 10])
+        self.assertEqual(list(log.column("size")), [106, 107, 108, 109])
+        self.assertEqual(log.row(0)["packet_id"], 7)
+        self.assertEqual(log.row(-1)["packet_id"], 10)
+        with self.assertRaises(IndexError):
+            log.row(4)
+
+        # Вытесненные маршруты удаляются из справочника
+        self.assertEqual(sorted(map(tuple, filter(None, (row["path"] for row in log.rows())))),
+                         sorted(tuple(log.path(path_id)) for path_id in log.paths))
+
+    def test_names_survive_wrap_around(self):
+        log = PacketLog(capacity=2)
+        fill(log, 5)
+        row = log.row(-1)
+        self.assertEqual((row["source"], row["destination"], row["path"]), ("B", "C", None))
+        self.assertEqual(log.row(0)["path"], ["A", "B"])
+
+    def test_binary_round_trip(self):
+        log = PacketLog(capacity=5)
+        fill(log, 12)
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "log.bin")
+            log.to_binary(file_path)
+            loaded = PacketLog.read_binary(file_path)
+
+        self.assertEqual(len(loaded), len(log))
+        self.assertEqual(loaded.total, log.total)
+        self.assertEqual(list(loaded.rows()), list(log.rows()))
+        for name, _ in COLUMNS:
+            if name not in ("path", "source", "destination", "algorithm", "status"):
+                self.assertEqual(list(loaded.column(name)), list(log.column(name)))
+
+        # Прочитанный журнал продолжает работать как кольцевой буфер
+        loaded.append("C", "A", path=["C", "A"])
+        self.assertEqual(loaded.row(-1)["path"], ["C", "A"])
+        self.assertEqual(loaded.row(-1)["packet_id"], 13)
+
+    def test_read_binary_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "other.bin")
+            with open(file_path, "wb") as file:
+                file.write(b"not a log")
+            with self.assertRaises(ValueError):
+                PacketLog.read_binary(file_path)
+
+    def test_extend(self):
+        source = PacketLog(capacity=3)
+        fill(source, 4)
+        target = PacketLog()
+        target.append("X", "Y")
+        target.extend(source)
+
+        self.assertEqual(len(target), 4)
+        self.assertEqual([row["size"] for row in target.rows()], [0, 101, 102, 103])
+        self.assertEqual(target.row(-1)["packet_id"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
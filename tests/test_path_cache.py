@@ -0,0 +1,66 @@
+import unittest
+
+from graphlib.algorithms import ShortestPathCache, cached_shortest_path, contraction_hierarchy, fresh_hierarchy
+from graphlib.model import GraphModel
+
+
+class CachedShortestPathTest(unittest.TestCase):
+    def setUp(self):
+        self.model = GraphModel()
+        for x, y in [(0, 0), (1, 0), (2, 0), (1, 1)]:
+            self.model.add_vertex(x, y)
+        self.model.set_edge(0, 1, 1)
+        self.model.set_edge(1, 2, 1)
+        self.model.set_edge(0, 3, 1)
+        self.model.set_edge(3, 2, 5)
+
+    def test_repeated_query_hits_cache(self):
+        cache = ShortestPathCache()
+        first = cached_shortest_path(self.model, 0, 2, "astar", cache=cache)
+        second = cached_shortest_path(self.model, 0, 2, "astar", cache=cache)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[:2], (2, [0, 1, 2]))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_graph_change_invalidates_entry(self):
+        cache = ShortestPathCache()
+        cached_shortest_path(self.model, 0, 2, "astar", cache=cache)
+        self.model.remove_edge(1, 2)
+
+        distance, path, _ = cached_shortest_path(self.model, 0, 2, "astar", cache=cache)
+        self.assertEqual((distance, path), (6, [0, 3, 2]))
+        self.assertEqual(cache.misses, 2)
+
+    def test_zero_weight_removes_edge(self):
+        cache = ShortestPathCache()
+        cached_shortest_path(self.model, 0, 2, "astar", cache=cache)
+        self.model.set_edge(1, 2, 0)
+
+        self.assertNotIn((1, 2), self.model.edges)
+        self.assertNotIn([1, 2, 0], self.model.to_dict()["edges"])
+        distance, path, _ = cached_shortest_path(self.model, 0, 2, "astar", cache=cache)
+        self.assertEqual((distance, path), (6, [0, 3, 2]))
+
+    def test_uses_hierarchy_built_for_current_version(self):
+        expected = cached_shortest_path(self.model, 0, 2, "astar", cache=ShortestPathCache())
+        self.assertIsNone(fresh_hierarchy(self.model))
+
+        hierarchy = contraction_hierarchy(self.model)
+        self.assertIs(fresh_hierarchy(self.model), hierarchy)
+        cache = ShortestPathCache()
+        self.assertEqual(cached_shortest_path(self.model, 0, 2, "ch", cache=cache)[:2], expected[:2])
+        self.assertEqual(list(cache.entries)[0][2], "ch")
+
+        # Другие методы иерархию не подменяет
+        cached_shortest_path(self.model, 0, 2, "astar", cache=cache)
+        self.assertEqual(sorted(key[2] for key in cache.entries), ["astar", "ch"])
+
+        self.model.set_edge(1, 2, 10)
+        self.assertIsNone(fresh_hierarchy(self.model))
+        with self.assertRaises(ValueError):
+            cached_shortest_path(self.model, 0, 2, "ch", cache=cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from graphlib.algorithms import NegativeCycleError, bellman_ford, build_adjacency, check_negative_cycle, \
+    floyd_warshall, johnson_all_pairs
+from graphlib.paths import AllPairsResult, floyd_rows
+
+
+class FloydRowsTest(unittest.TestCase):
+    GRAPH = [
+        [0, 4, 0, 1],
+        [0, 0, -2, 0],
+        [3, 0, 0, 0],
+        [0, 2, 7, 0],
+    ]
+
+    def test_matches_floyd_warshall(self):
+        dist, next_vertex = floyd_warshall(self.GRAPH)
+        result = AllPairsResult(4, *floyd_rows(build_adjacency(self.GRAPH, allow_negative=True)), "next")
+
+        expected = AllPairsResult.from_matrices(dist, next_vertex, "next")
+        self.assertEqual(list(result.dist), list(expected.dist))
+        self.assertEqual(list(result.pred), list(expected.pred))
+        self.assertEqual(result.path(0, 2), [0, 3, 1, 2])
+
+    def test_unreachable_pair(self):
+        result = AllPairsResult(2, *floyd_rows([[], []], "f"), "next")
+        self.assertFalse(result.has_path(0, 1))
+        self.assertEqual(result.path(0, 1), [])
+
+
+def random_negative_graph(n, seed):
+    """
+    Случайная матрица смежности с отрицательными рёбрами без циклов отрицательного веса.
+    """
+    rng = random.Random(seed)
+    while True:
+        graph = [[rng.randint(-3, 9) if i != j and rng.random() < 0.4 else 0 for j in range(n)] for i in range(n)]
+        dist, _ = floyd_warshall(graph)
+        if all(dist[i][i] >= 0 for i in range(n)):
+            return graph
+
+
+class NegativeWeightsTest(unittest.TestCase):
+    # 0 -> 1 -> 2 с отрицательным ребром 1 -> 2 и цикл 3 <-> 4 веса -2, недостижимый из 0, 1 и 2
+    UNREACHABLE_CYCLE = [
+        [0, 2, 4, 0, 0],
+        [0, 0, -1, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1],
+        [0, 0, 0, -3, 0],
+    ]
+
+    def test_negative_edges_without_cycles(self):
+        for seed in range(20):
+            graph = random_negative_graph(7, seed)
+            dist, _ = floyd_warshall(graph)
+            check_negative_cycle(dist)
+
+            johnson_dist, _ = johnson_all_pairs(graph)
+            self.assertEqual(johnson_dist, dist)
+            for start in range(len(graph)):
+                self.assertEqual(bellman_ford(graph, start)[0], dist[start])
+
+    def test_reachable_negative_cycle(self):
+        graph = [[0, 1, 0], [0, 0, 1], [-3, 0, 0]]
+        with self.assertRaises(NegativeCycleError):
+            bellman_ford(graph, 0)
+        with self.assertRaises(NegativeCycleError):
+            johnson_all_pairs(graph)
+        with self.assertRaises(NegativeCycleError):
+            check_negative_cycle(floyd_warshall(graph)[0])
+
+    def test_unreachable_negative_cycle(self):
+        graph = self.UNREACHABLE_CYCLE
+
+        # Поиск от одного источника не видит цикла, недостижимого из него
+        dist, parent = bellman_ford(graph, 0)
+        self.assertEqual(dist, [0, 2, 1, float('inf'), float('inf')])
+        self.assertEqual(parent[:3], [-1, 0, 1])
+        with self.assertRaises(NegativeCycleError):
+            bellman_ford(graph, 3)
+
+        # Алгоритмы всех пар проверяют весь граф
+        with self.assertRaises(NegativeCycleError):
+            johnson_all_pairs(graph)
+        with self.assertRaises(NegativeCycleError):
+            check_negative_cycle(floyd_warshall(graph)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
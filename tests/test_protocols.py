@@ -0,0 +1,116 @@
+import random
+import unittest
+
+from graphlib.algorithms import multi_source_dijkstra
+from graphlib.model import GraphModel
+from graphlib.protocols import HORIZONS, MODES, DistanceVector, LinkState
+
+
+def random_model(n, seed, p=0.3):
+    rng = random.Random(seed)
+    model = GraphModel()
+    for i in range(n):
+        model.add_vertex(rng.randint(0, 500), rng.randint(0, 500), str(i))
+    for u in range(n):
+        for v in range(n):
+            if u != v and rng.random() < p:
+                model.set_edge(u, v, rng.randint(1, 9))
+    return model
+
+
+def line_model(n):
+    model = GraphModel()
+    for i in range(n):
+        model.add_vertex(i * 40, 0, str(i))
+    for i in range(n - 1):
+        model.set_edge(i, i + 1, 1)
+    return model
+
+
+def protocols(model, mode):
+    yield from (DistanceVector(model, mode=mode, horizon=horizon) for horizon in HORIZONS)
+    yield LinkState(model, mode=mode)
+
+
+class RoutingProtocolsTest(unittest.TestCase):
+    def assert_matches_dijkstra(self, protocol, model):
+        n = len(model)
+        expected, _ = multi_source_dijkstra(None, range(n), adjacency=model.adjacency(undirected=True))
+        self.assertEqual(list(protocol.distance), list(expected))
+
+        for u in range(n):
+            for d in range(n):
+                route = protocol.route(u, d)
+                if expected[u * n + d] == float('inf'):
+                    self.assertEqual(route, [])
+                else:
+                    self.assertEqual((route[0], route[-1]), (u, d))
+                    length = sum(protocol.links[a][b] for a, b in zip(route, route[1:]))
+                    self.assertEqual(length, expected[u * n + d])
+
+    def test_convergence_matches_dijkstra(self):
+        for seed in range(5):
+            model = random_model(8, seed)
+            tables = {}
+            for mode in MODES:
+                for protocol in protocols(model, mode):
+                    with self.subTest(seed=seed, mode=mode, protocol=protocol.name):
+                        report = protocol.run()
+                        self.assert_matches_dijkstra(protocol, model)
+                        self.assertGreater(report.messages, 0)
+                        self.assertGreater(report.bytes, 0)
+                        self.assertGreater(report.rounds, 0)
+                        tables.setdefault(type(protocol), list(protocol.distance))
+                        self.assertEqual(list(protocol.distance), tables[type(protocol)])
+
+    def test_weight_increase_without_count_to_infinity(self):
+        for mode in MODES:
+            for horizon in HORIZONS:
+                with self.subTest(mode=mode, horizon=horizon):
+                    model = line_model(3)
+                    protocol = DistanceVector(model, mode=mode, horizon=horizon)
+                    protocol.run()
+
+                    # Без обходного пути маршрут 0 -> 2 должен сразу стать длиннее, а не расти по шагу за раунд
+                    model.set_edge(1, 2, 100)
+                    report = protocol.update(model)
+                    self.assert_matches_dijkstra(protocol, model)
+                    self.assertLessEqual(report.rounds, len(model))
+                    self.assertGreater(report.messages, 0)
+
+                    model.remove_edge(1, 2)
+                    report = protocol.update(model)
+                    self.assert_matches_dijkstra(protocol, model)
+                    self.assertLessEqual(report.rounds, len(model))
+
+    def test_update_after_random_changes(self):
+        rng = random.Random(19)
+        for mode in MODES:
+            model = random_model(8, 7)
+            instances = list(protocols(model, mode))
+            for protocol in instances:
+                protocol.run()
+
+            for _ in range(5):
+                u, v = rng.sample(range(8), 2)
+                if model.weight(u, v):
+                    model.set_edge(u, v, model.weight(u, v) + rng.randint(1, 20))
+                else:
+                    model.set_edge(u, v, rng.randint(1, 9))
+                for protocol in instances:
+                    with self.subTest(mode=mode, protocol=protocol.name):
+                        # Каналы двунаправленные: правка не меняет канал, если обратное ребро дешевле
+                        links = [dict(row) for row in protocol.links]
+                        report = protocol.update(model)
+                        self.assert_matches_dijkstra(protocol, model)
+                        if protocol.links != links:
+                            self.assertGreater(report.messages, 0)
+                            self.assertGreater(report.bytes, 0)
+
+    def test_unknown_horizon(self):
+        with self.assertRaises(ValueError):
+            DistanceVector(line_model(2), horizon="hold_down")
+
+
+if __name__ == "__main__":
+    unittest.main()
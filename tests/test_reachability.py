@@ -0,0 +1,104 @@
+import random
+import unittest
+from unittest import mock
+
+from graphlib import incremental
+from graphlib.algorithms import build_adjacency, dijkstra, dijkstra_all_pairs, multi_source_dijkstra
+from graphlib.incremental import IncrementalAPSP
+from graphlib.model import GraphModel
+from graphlib.paths import all_pairs
+from graphlib.reachability import ReachabilityIndex
+from graphlib.routing import BackwardLearningRouter, Flooder, RandomWalker
+from graphlib.simulation import simulate
+
+
+def random_matrix(n, p, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(1, 9) if i != j and rng.random() < p else 0 for j in range(n)] for i in range(n)]
+
+
+def two_islands():
+    """
+    Две компоненты: цикл 0 <-> 1 <-> 2 и цепочка 3 -> 4.
+    """
+    model = GraphModel()
+    for i in range(5):
+        model.add_vertex(i * 40, 0)
+    for u, v in [(0, 1), (1, 0), (1, 2), (2, 1), (3, 4)]:
+        model.set_edge(u, v, 1)
+    return model
+
+
+class ReachableCountsTest(unittest.TestCase):
+    def test_counts_match_reachable_from(self):
+        for seed in range(5):
+            index = ReachabilityIndex(build_adjacency(random_matrix(30, 0.05, seed)))
+            self.assertEqual(index.reachable_counts(), [len(index.reachable_from(u)) for u in range(30)])
+
+    def test_counts_after_incremental_edge(self):
+        index = ReachabilityIndex([[], [], []])
+        index.add_edge(0, 1)
+        index.add_edge(1, 0)
+        index.add_edge(1, 2)
+        self.assertEqual(index.reachable_counts(), [3, 3, 1])
+
+
+class RoutingReachabilityTest(unittest.TestCase):
+    def setUp(self):
+        self.adjacency = two_islands().adjacency()
+
+    def test_random_walk_does_no_steps(self):
+        walker = RandomWalker(self.adjacency, seed=0)
+        result = walker.walk(0, 4, count=10, max_restarts=100)
+        self.assertEqual(list(result.hops), [-1] * 10)
+        self.assertEqual(result.transmissions, 0)
+
+    def test_flooder_sends_nothing(self):
+        flooder = Flooder(self.adjacency)
+        result = flooder.send(0, 4)
+        self.assertEqual((result.path, result.transmissions), ([], 0))
+        self.assertEqual(flooder.packets, 1)
+        self.assertEqual(flooder.send(0, 2).path, [0, 1, 2])
+
+    def test_backward_learning_sends_nothing(self):
+        router = BackwardLearningRouter(self.adjacency)
+        result = router.send(0, 4, reply=True)
+        self.assertEqual((result.path, result.transmissions), ([], 0))
+        self.assertEqual(router.flooded, 0)
+
+    def test_simulator_drops_at_source(self):
+        for strategy in ("random", "flooding", "historical", "shortest_path"):
+            simulator = simulate(two_islands(), strategy, 20, 0, 4, seed=1)
+            summary = simulator.stats.summary()
+            self.assertEqual(summary["dropped"], {"unreachable": 20}, strategy)
+            self.assertEqual(summary["transmissions"], 0, strategy)
+
+
+class AllPairsReachabilityTest(unittest.TestCase):
+    def test_limited_search_matches_full_search(self):
+        for seed in range(5):
+            graph = random_matrix(40, 0.03, seed)
+            adjacency = build_adjacency(graph)
+            expected = [dijkstra(None, s, adjacency=adjacency)[0] for s in range(40)]
+
+            dist, _ = dijkstra_all_pairs(graph)
+            self.assertEqual(dist, expected)
+            result = all_pairs(graph)
+            self.assertEqual([list(result[s]) for s in range(40)], expected)
+
+            sources = [0, 7, 39]
+            block, _ = multi_source_dijkstra(None, sources, adjacency=adjacency,
+                                             reachability=ReachabilityIndex(adjacency))
+            self.assertEqual([list(block[r * 40:(r + 1) * 40]) for r in range(3)], [expected[s] for s in sources])
+
+    def test_incremental_skips_unreachable_sources(self):
+        apsp = IncrementalAPSP(two_islands().matrix())
+        # Ребро 3 -> 4 не лежит ни на одном пути из компоненты {0, 1, 2}: пересчитывается только строка 3
+        with mock.patch.object(incremental, "multi_source_dijkstra", wraps=incremental.multi_source_dijkstra) as search:
+            apsp.set_edge(3, 4, 5)
+        self.assertEqual(search.call_args.args[1], [3])
+        self.assertEqual(apsp.dist[3][4], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
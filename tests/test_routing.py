@@ -0,0 +1,72 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from graphlib import algorithms
+from graphlib.model import GraphModel
+
+
+def line_graph(n=4):
+    """
+    Цепочка 0 -> 1 -> ... -> n-1 с объектом окна графа без холста.
+    """
+    model = GraphModel()
+    for i in range(n):
+        model.add_vertex(i * 40, 0, str(i))
+    for i in range(n - 1):
+        model.set_edge(i, i + 1, 1)
+
+    vertices = [{"id": i, "name": str(i)} for i in range(n)]
+    return SimpleNamespace(model=model, vertices=vertices, start_vertex=vertices[0], end_vertex=vertices[-1],
+                           routing_tables={})
+
+
+class RoutingWrappersTest(unittest.TestCase):
+    def setUp(self):
+        display = mock.patch.object(algorithms, "display_packet_path")
+        warning = mock.patch.object(algorithms.messagebox, "showwarning")
+        self.display = display.start()
+        self.warning = warning.start()
+        self.addCleanup(display.stop)
+        self.addCleanup(warning.stop)
+
+    def assert_line_paths(self, graph, paths, count):
+        self.assertEqual(len(paths), count)
+        for path in paths:
+            self.assertEqual([vertex["id"] for vertex in path], [0, 1, 2, 3])
+        self.assertEqual(self.display.call_count, count)
+
+    def test_flooding_routing(self):
+        graph = line_graph()
+        paths, name = algorithms.flooding_routing(graph, 3)
+        self.assertEqual(name, "Лавинная маршрутизация")
+        self.assert_line_paths(graph, paths, 3)
+
+    def test_random_routing(self):
+        graph = line_graph()
+        paths, name = algorithms.random_routing(graph, 2, seed=1)
+        self.assertEqual(name, "Случайная маршрутизация")
+        self.assert_line_paths(graph, paths, 2)
+
+    def test_historical_routing_fills_tables(self):
+        graph = line_graph()
+        paths, tables, name = algorithms.historical_routing(graph, 2, undirected=True)
+        self.assertEqual(name, "Маршрутизация по предыдущему опыту")
+        self.assert_line_paths(graph, paths, 2)
+        self.assertEqual(tables, {"3": {"hops": 3}})
+
+        # По TCP узлы узнали маршруты в обе стороны
+        self.assertEqual(graph.routing_tables["0"]["3"]["next_hop"], "1")
+        self.assertEqual(graph.routing_tables["0"]["3"]["edge_weight"], 1)
+        self.assertEqual(graph.routing_tables["3"]["0"]["next_hop"], "2")
+
+    def test_unreachable_destination(self):
+        graph = line_graph()
+        graph.start_vertex, graph.end_vertex = graph.vertices[3], graph.vertices[0]
+        paths, _ = algorithms.flooding_routing(graph, 3)
+        self.assertEqual(paths, [])
+        self.warning.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from graphlib.model import GraphModel
+from graphlib.simulation import Simulator
+
+
+class SimulatorLinkTest(unittest.TestCase):
+    def setUp(self):
+        self.model = GraphModel()
+        for x in range(3):
+            self.model.add_vertex(x, 0)
+        self.model.set_edge(0, 1, 1)
+        self.model.set_edge(1, 2, 1)
+
+    def test_missing_fields_fall_back_to_defaults(self):
+        self.model.set_link(0, 1, queue=3)
+        self.model.set_link(1, 2, bandwidth=50)
+        simulator = Simulator(self.model, "shortest_path", seed=0, bandwidth=100, queue_limit=10)
+
+        link = simulator.link(0, 1)
+        self.assertEqual((link.bandwidth, link.queue_limit), (100, 3))
+        link = simulator.link(1, 2)
+        self.assertEqual((link.bandwidth, link.queue_limit), (50, 10))
+
+    def test_zero_queue_means_no_buffer(self):
+        self.model.set_link(0, 1, queue=0)
+        simulator = Simulator(self.model, "shortest_path", seed=0, bandwidth=1)
+
+        self.assertEqual(simulator.link(0, 1).queue_limit, 0)
+        self.assertIsNone(simulator.link(1, 2).queue_limit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from graphlib.model import GraphModel
+from graphlib.simulation import Simulator, simulate
+from graphlib.transport import Transport
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        self.model = GraphModel()
+        for i in range(4):
+            self.model.add_vertex(i * 40, 0, str(i))
+        for i in range(3):
+            self.model.set_edge(i, i + 1, 1)
+
+    def flow(self, protocol, loss, count=200):
+        simulator = simulate(self.model, "shortest_path", count, 0, 3, seed=3, undirected=True, protocol=protocol,
+                             loss=loss)
+        flows = simulator.transport.summary()["flows"]
+        self.assertEqual(len(flows), 1)
+        return flows[0]
+
+    def test_tcp_without_loss(self):
+        flow = self.flow("TCP", 0.0)
+        self.assertEqual(flow["state"], "established")
+        self.assertEqual(flow["delivered"], 200)
+        self.assertEqual(flow["sent"], 200)
+        self.assertEqual(flow["retransmissions"], 0)
+
+    def test_tcp_retransmits_lost_segments(self):
+        flow = self.flow("TCP", 0.1)
+        self.assertEqual(flow["state"], "established")
+        self.assertEqual(flow["delivered"], flow["submitted"])
+        self.assertGreater(flow["retransmissions"], 0)
+        self.assertEqual(flow["sent"], flow["submitted"] + flow["retransmissions"])
+        self.assertGreater(flow["timeouts"] + flow["fast_retransmits"], 0)
+
+    def test_udp_does_not_retransmit(self):
+        flow = self.flow("UDP", 0.1)
+        self.assertLess(flow["delivered"], flow["submitted"])
+        self.assertEqual(flow["retransmissions"], 0)
+        self.assertEqual(flow["sent"], flow["submitted"])
+
+    def test_unknown_protocol(self):
+        with self.assertRaises(ValueError):
+            Transport(Simulator(self.model, "shortest_path", seed=0), "SCTP")
+
+
+if __name__ == "__main__":
+    unittest.main()